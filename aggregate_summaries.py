@@ -0,0 +1,142 @@
+"""
+Pre-Aggregated Summaries
+Plans whether a summary can come from NCEI's Global Summary of the Month /
+Year (GSOM/GSOY) datasets instead of daily records, and reduces those
+monthly or annual records into NOAADataFetcher summary fields
+"""
+
+import calendar
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+MONTHLY_DATASET = 'global-summary-of-the-month'
+YEARLY_DATASET = 'global-summary-of-the-year'
+
+# GSOM/GSOY elements (standard units): mean daily max/min/avg temperature,
+# extreme max/min temperature, precipitation total, days with >= 0.01 in,
+# extreme daily precipitation, snowfall total, extreme daily snowfall
+AGGREGATE_ELEMENTS = ['TMAX', 'TMIN', 'TAVG', 'EMXT', 'EMNT', 'PRCP', 'DP01', 'EMXP', 'SNOW', 'EMSN']
+
+# Summary field -> (element, reduction over periods, decimals). Fields not
+# listed here (days_with_data, avg_daily, days_with_snow) need daily records.
+AGGREGATE_FIELDS = {
+    'temperature.avg_high': ('TMAX', 'mean', 1),
+    'temperature.avg_low': ('TMIN', 'mean', 1),
+    'temperature.max': ('EMXT', 'max', None),
+    'temperature.min': ('EMNT', 'min', None),
+    'precipitation.total': ('PRCP', 'sum', 2),
+    'precipitation.days_with_precip': ('DP01', 'sum', 0),
+    'snowfall.total': ('SNOW', 'sum', 1),
+    'snowfall.max_daily': ('EMSN', 'max', None)
+}
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def plan_summary(start_date: str, end_date: str, fields: Optional[Iterable[str]] = None,
+                 local: bool = False) -> str:
+    """
+    Pick the cheapest source for a summary over start_date..end_date (inclusive)
+
+    Args:
+        start_date: First day (YYYY-MM-DD)
+        end_date: Last day (YYYY-MM-DD)
+        fields: Summary fields needed, as 'section.key' (None = the full summary)
+        local: A local daily backend is in use, where daily data is already cheap
+
+    Returns:
+        'yearly' (GSOY) for whole calendar years, 'monthly' (GSOM) for whole
+        months, otherwise 'daily'
+    """
+    if local or fields is None or not set(fields) <= set(AGGREGATE_FIELDS):
+        return 'daily'
+
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if start.day != 1 or end != _month_end(end) or end < start:
+        return 'daily'
+    if start.month == 1 and end.month == 12:
+        return 'yearly'
+    return 'monthly'
+
+
+def year_complete(dataset: str, records: List[Dict]) -> bool:
+    """A year's GSOM records cover all twelve months, or its GSOY record is present"""
+    if dataset == YEARLY_DATASET:
+        return bool(records)
+    return len({record['DATE'][:7] for record in records}) == 12
+
+
+def _period_days(period: str) -> int:
+    """Calendar days in a GSOM ('YYYY-MM') or GSOY ('YYYY') period"""
+    year = int(period[:4])
+    if len(period) >= 7:
+        return calendar.monthrange(year, int(period[5:7]))[1]
+    return 366 if calendar.isleap(year) else 365
+
+
+def _value(record: Dict, element: str) -> Optional[float]:
+    value = record.get(element)
+    if value is None or str(value).strip() == '':
+        return None
+    return float(value)
+
+
+def summarize_aggregates(records: List[Dict], start_date: str, end_date: str,
+                         fields: Iterable[str]) -> Dict:
+    """
+    Reduce GSOM/GSOY records covering start_date..end_date into summary fields
+
+    Means are weighted by the days in each month or year, so they match a
+    mean over daily values when the record is complete.
+
+    Returns:
+        Summary shaped like NOAADataFetcher._calculate_summary, holding only
+        the requested fields, with 'source' and 'periods' (records used)
+    """
+    # GSOM periods are 'YYYY-MM', GSOY 'YYYY'; compare at the period's precision
+    in_range = [r for r in records
+                if start_date[:len(r['DATE'])] <= r['DATE'] <= end_date[:len(r['DATE'])]]
+
+    summary = {'source': 'gsoy' if in_range and len(in_range[0]['DATE']) == 4 else 'gsom',
+               'periods': len(in_range)}
+    for field in fields:
+        element, reduction, decimals = AGGREGATE_FIELDS[field]
+        pairs = [(v, _period_days(r['DATE'])) for r in in_range for v in [_value(r, element)] if v is not None]
+
+        if not pairs:
+            result = None
+        elif reduction == 'mean':
+            result = sum(v * d for v, d in pairs) / sum(d for _, d in pairs)
+        elif reduction == 'sum':
+            result = sum(v for v, _ in pairs)
+        else:
+            result = (max if reduction == 'max' else min)(v for v, _ in pairs)
+
+        if result is not None and decimals is not None:
+            result = int(round(result)) if decimals == 0 else round(result, decimals)
+        section, key = field.split('.')
+        summary.setdefault(section, {})[key] = result
+
+    return summary
+
+
+def monthly_normals(records: List[Dict]) -> List[Dict]:
+    """
+    Calendar-month means over GSOM records (e.g. 30 years of 360 months)
+
+    Returns:
+        Twelve dicts with 'month', 'avg_high', 'avg_low' (°F), 'precipitation'
+        and 'snowfall' (mean monthly totals, inches) and 'years' with data
+    """
+    normals = []
+    for month in range(1, 13):
+        rows = [r for r in records if int(r['DATE'][5:7]) == month]
+        entry = {'month': month, 'years': len(rows)}
+        for key, element, decimals in (('avg_high', 'TMAX', 1), ('avg_low', 'TMIN', 1),
+                                       ('precipitation', 'PRCP', 2), ('snowfall', 'SNOW', 1)):
+            values = [v for v in (_value(r, element) for r in rows) if v is not None]
+            entry[key] = round(sum(values) / len(values), decimals) if values else None
+        normals.append(entry)
+    return normals
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark Daily Series Encodings
+Compares storage size and decode time of a station's daily history as JSON
+records (what fetch_daily_data returns), compressed .npz, raw int16 and the
+series_codec delta / run-length / sparse encodings
+
+Reads the first stations of ghcnd_all.tar.gz (or a ghcnd_all/ directory of
+.dly files) when present; otherwise uses synthetic histories with a seasonal
+temperature cycle, intermittent precipitation and winter snow. Synthetic
+numbers are only a sanity check - quote sizes from real .dly data:
+
+    python bench_series_codec.py [ghcnd_all.tar.gz | ghcnd_all/] [stations]
+
+The report names the source it measured.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from daily_series import DEFAULT_ELEMENTS, series_to_records
+from dly_ingest import DEFAULT_SOURCE, iter_dly_sources, station_arrays, to_standard
+from ghcn_parser import DLY_MISSING, parse_dly
+from series_codec import decode_series, encode_series
+
+BENCH_STATIONS = 50
+REPEATS = 3
+
+
+def find_source() -> Optional[str]:
+    """The local .dly source (tarball or directory), if any"""
+    return next((s for s in (DEFAULT_SOURCE, 'ghcnd_all') if os.path.exists(s)), None)
+
+
+def load_histories(source: str, limit: int = BENCH_STATIONS) -> List[Dict]:
+    """Station columns ({'id', 'start', 'values'}) from a .dly source"""
+
+    histories = []
+    for station_id, data in iter_dly_sources(source):
+        arrays = station_arrays(parse_dly(data, DEFAULT_ELEMENTS))
+        if arrays is not None and arrays['values']:
+            histories.append({'id': station_id, **arrays})
+        if len(histories) == limit:
+            break
+    return histories
+
+
+def synthetic_history(rng: np.random.Generator, station_id: str, years: int = 35) -> Dict:
+    """A plausible mid-latitude station in GHCN units"""
+    start = np.datetime64('1990-01-01')
+    days = int((np.datetime64(f'{1990 + years}-01-01') - start).astype(np.int64))
+    doy = np.arange(days) % 365.25
+
+    noise = np.zeros(days)
+    shocks = rng.normal(0, 25, days)
+    for i in range(1, days):
+        noise[i] = 0.7 * noise[i - 1] + shocks[i]
+    tmax = np.round(150 + 130 * np.sin(2 * np.pi * (doy - 105) / 365.25) + noise)
+    tmin = np.round(tmax - 100 - np.abs(rng.normal(0, 20, days)))
+
+    wet = rng.random(days) < 0.3
+    prcp = np.where(wet, np.round(rng.gamma(0.8, 60, days)), 0)
+    snow = np.where(wet & (tmax < 20), prcp, 0)             # ~10:1 snow ratio, mm
+    snwd = np.zeros(days)
+    for i in range(1, days):
+        snwd[i] = max(0.0, snwd[i - 1] + snow[i] - max(tmax[i], 0) / 5)
+    snwd = np.round(snwd)
+
+    columns = {}
+    for element, values in zip(DEFAULT_ELEMENTS, (tmax, tmin, prcp, snow, snwd)):
+        column = values.astype(np.int16)
+        column[rng.random(days) < 0.02] = DLY_MISSING
+        outage = int(rng.integers(0, days - 120))
+        column[outage:outage + 90] = DLY_MISSING
+        columns[element] = column
+    return {'id': station_id, 'start': start, 'values': columns}
+
+
+def _json_blob(history: Dict) -> bytes:
+    start = history['start']
+    days = max(len(c) for c in history['values'].values())
+    series = {
+        'station_id': history['id'],
+        'dates': np.arange(start, start + days, dtype='datetime64[D]'),
+        'values': {e: to_standard(e, c) for e, c in history['values'].items()}
+    }
+    return json.dumps(series_to_records(series)).encode('utf-8')
+
+
+def _npz_blob(history: Dict) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, start=np.array([history['start']]), **history['values'])
+    return buffer.getvalue()
+
+
+def _npz_decode(blob: bytes) -> Dict:
+    with np.load(io.BytesIO(blob)) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _raw_blob(history: Dict) -> bytes:
+    return b''.join(column.tobytes() for column in history['values'].values())
+
+
+FORMATS = {
+    'json records': (_json_blob, json.loads),
+    'npz (deflate)': (_npz_blob, _npz_decode),
+    'raw int16': (_raw_blob, lambda blob: np.frombuffer(blob, dtype=np.int16)),
+    'xds delta': (lambda h: encode_series(h['start'], h['values'], 'delta'), decode_series),
+    'xds rle': (lambda h: encode_series(h['start'], h['values'], 'rle'), decode_series),
+    'xds sparse': (lambda h: encode_series(h['start'], h['values'], 'sparse'), decode_series),
+    'xds auto': (lambda h: encode_series(h['start'], h['values']), decode_series),
+}
+
+
+def _best_time(func: Callable, items: List) -> float:
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(histories: List[Dict]) -> List[Dict]:
+    """
+    Size and timing per format over the given histories
+
+    Returns:
+        One row per format: 'format', 'bytes' (total), 'encode_ms' and
+        'decode_ms' (per station, best of REPEATS)
+    """
+    rows = []
+    for name, (encode, decode) in FORMATS.items():
+        blobs = [encode(h) for h in histories]
+        rows.append({
+            'format': name,
+            'bytes': sum(len(b) for b in blobs),
+            'encode_ms': _best_time(encode, histories) / len(histories) * 1000,
+            'decode_ms': _best_time(decode, blobs) / len(blobs) * 1000
+        })
+    return rows
+
+
+def main():
+    print("=" * 60)
+    print("DAILY SERIES ENCODING BENCHMARK")
+    print("=" * 60)
+
+    source = sys.argv[1] if len(sys.argv) > 1 else find_source()
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else BENCH_STATIONS
+    if source is not None and not os.path.exists(source):
+        raise FileNotFoundError(f"No .dly source at {source}")
+
+    histories = load_histories(source, limit) if source is not None else []
+    if histories:
+        print(f"\n[*] Source: {source} (real GHCN-Daily data, first {len(histories)} stations)")
+    else:
+        print("\n[WARN] Source: synthetic 35-year histories - no ghcnd_all data found")
+        print("       Not representative; pass a ghcnd_all.tar.gz or .dly directory to measure real data")
+        rng = np.random.default_rng(2024)
+        histories = [synthetic_history(rng, f"SYN{i:08d}") for i in range(limit)]
+
+    days = sum(max(len(c) for c in h['values'].values()) for h in histories)
+    print(f"    {days:,} station-days, {len(DEFAULT_ELEMENTS)} elements")
+
+    rows = run_benchmark(histories)
+    json_bytes = rows[0]['bytes']
+    print(f"\n    {'format':15s} {'KB/station':>11s} {'vs JSON':>8s} {'encode ms':>10s} {'decode ms':>10s}")
+    for row in rows:
+        print(f"    {row['format']:15s} {row['bytes'] / len(histories) / 1024:11.1f} "
+              f"{row['bytes'] / json_bytes:8.1%} {row['encode_ms']:10.2f} {row['decode_ms']:10.2f}")
+    print("\n[INFO] JSON decode is json.loads alone; building arrays from the records costs more")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Build Artifacts
+Publishes station databases under content-hashed filenames with gzip and
+brotli precompressed variants and a manifest of hashes and sizes
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_ARTIFACTS = [
+    'noaa_stations_frontend.json',
+    'noaa_stations_frontend.bin',
+    'xyloclime_noaa_package.json',
+    'noaa_network_stats.json'
+]
+
+DEFAULT_OUTPUT_DIR = 'dist'
+MANIFEST_FILE = 'artifact_manifest.json'
+MANIFEST_VERSION = 1
+
+# Characters of the SHA-256 hex digest used in filenames
+HASH_LENGTH = 12
+
+# Per-build JSON fields left out of published copies, so a rebuild of
+# unchanged data keeps its hashed filename (the manifest records the build time)
+BUILD_TIME_FIELDS = {
+    'noaa_network_stats.json': ('last_updated',),
+    'xyloclime_noaa_package.json': ('generated',)
+}
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    """noaa_stations_frontend.json -> noaa_stations_frontend.<hash>.json"""
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def _write_once(path: str, data: bytes) -> None:
+    """Content-addressed files never change, so an existing file is left alone"""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def published_bytes(source: str) -> bytes:
+    """Contents to publish for a file: as is, or without its BUILD_TIME_FIELDS"""
+    with open(source, 'rb') as f:
+        data = f.read()
+
+    fields = BUILD_TIME_FIELDS.get(os.path.basename(source))
+    if not fields:
+        return data
+    payload = json.loads(data)
+    for field in fields:
+        payload.pop(field, None)
+    return json.dumps(payload, indent=2).encode('utf-8')
+
+
+def publish_artifact(source: str, output_dir: str = DEFAULT_OUTPUT_DIR) -> Dict:
+    """
+    Write one file and its compressed variants under a content hash
+
+    Args:
+        source: File to publish
+        output_dir: Directory for the hashed files
+
+    Returns:
+        Manifest entry with file name, sha256, byte size and variants
+    """
+    data = published_bytes(source)
+    digest = hashlib.sha256(data).hexdigest()
+    name = hashed_name(source, digest)
+    _write_once(os.path.join(output_dir, name), data)
+
+    entry = {'file': name, 'sha256': digest, 'bytes': len(data), 'encodings': {}}
+
+    # mtime=0 keeps gzip output identical for identical input
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    _write_once(os.path.join(output_dir, f"{name}.gz"), gz)
+    entry['encodings']['gzip'] = {'file': f"{name}.gz", 'bytes': len(gz)}
+
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        _write_once(os.path.join(output_dir, f"{name}.br"), br)
+        entry['encodings']['br'] = {'file': f"{name}.br", 'bytes': len(br)}
+
+    return entry
+
+
+def publish_artifacts(sources: Optional[List[str]] = None, output_dir: str = DEFAULT_OUTPUT_DIR) -> Dict:
+    """
+    Publish build outputs and write the artifact manifest
+
+    Args:
+        sources: Files to publish (defaults to DEFAULT_ARTIFACTS that exist)
+        output_dir: Directory for hashed files and the manifest
+
+    Returns:
+        The manifest, keyed by original filename
+    """
+    if sources is None:
+        sources = [s for s in DEFAULT_ARTIFACTS if os.path.exists(s)]
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'artifacts': {os.path.basename(s): publish_artifact(s, output_dir) for s in sources}
+    }
+
+    # The manifest itself is the one mutable file; clients revalidate it
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    print("=" * 60)
+    print("PUBLISHING BUILD ARTIFACTS")
+    print("=" * 60)
+
+    if brotli is None:
+        print("[WARN] brotli not installed - writing gzip variants only")
+
+    manifest = publish_artifacts()
+    for source, entry in manifest['artifacts'].items():
+        sizes = ', '.join(f"{enc} {v['bytes']:,}" for enc, v in entry['encodings'].items())
+        print(f"  {source:32s} -> {entry['file']} ({entry['bytes']:,} bytes; {sizes})")
+
+    print(f"\n[SAVED] {os.path.join(DEFAULT_OUTPUT_DIR, MANIFEST_FILE)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,9 @@ import json
 import re
 from collections import defaultdict
 
+import station_columns
+from ghcn_parser import PERIOD_COLUMNS, decode, parse_inventory as parse_ghcn_inventory
+
 def parse_stations(filename):
     """Parse ghcnd-stations.txt for ALL stations globally"""
     stations = {}
@@ -45,38 +48,32 @@ def parse_stations(filename):
 
     return stations
 
-def parse_inventory(filename, stations):
-    """Parse ghcnd-inventory.txt to add data type info"""
-
-    with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            station_id = line[0:11].strip()
-
-            # Only process US stations we've already loaded
-            if station_id not in stations:
-                continue
-
-            try:
-                data_type = line[31:35].strip()
-                start_year = int(line[36:40].strip())
-                end_year = int(line[41:45].strip())
-
-                # Track data types
-                stations[station_id]['data_types'][data_type] = {
-                    'start': start_year,
-                    'end': end_year
-                }
-
-                # Mark capabilities
-                if data_type == 'SNOW' and end_year >= 2020:
-                    stations[station_id]['has_snow'] = True
-                if data_type in ['TMAX', 'TMIN'] and end_year >= 2020:
-                    stations[station_id]['has_temp'] = True
-                if data_type == 'PRCP' and end_year >= 2020:
-                    stations[station_id]['has_precip'] = True
-
-            except (ValueError, IndexError):
-                continue
+def parse_inventory(filename, stations, min_year=station_columns.CAPABILITY_MIN_YEAR):
+    """Parse ghcnd-inventory.txt to add data type info (elements count through min_year)"""
+    # Columns are decoded in bulk from a memory-mapped file (ghcn_parser)
+    inventory = parse_ghcn_inventory(filename, columns=PERIOD_COLUMNS)
+
+    for station_id, data_type, start_year, end_year in zip(
+            decode(inventory['id']), decode(inventory['element']),
+            inventory['first_year'].tolist(), inventory['last_year'].tolist()):
+
+        # Only process stations we've already loaded
+        if station_id not in stations:
+            continue
+
+        # Track data types
+        stations[station_id]['data_types'][data_type] = {
+            'start': start_year,
+            'end': end_year
+        }
+
+        # Mark capabilities
+        if data_type == 'SNOW' and end_year >= min_year:
+            stations[station_id]['has_snow'] = True
+        if data_type in ['TMAX', 'TMIN'] and end_year >= min_year:
+            stations[station_id]['has_temp'] = True
+        if data_type == 'PRCP' and end_year >= min_year:
+            stations[station_id]['has_precip'] = True
 
     return stations
 
@@ -134,26 +131,24 @@ def main():
     print(">>> Building NOAA GHCN Station Network...")
     print("=" * 60)
 
-    # Step 1: Parse stations
+    # Steps 1-2: Parse stations and inventory into columns (element bitmasks + year arrays),
+    # splitting each file into line-aligned byte ranges across all cores
     print("\n[*] Step 1: Parsing GLOBAL stations from ghcnd-stations.txt...")
-    stations = parse_stations('ghcnd-stations.txt')
-    print(f"    [OK] Found {len(stations)} stations worldwide")
-
-    # Step 2: Parse inventory
     print("\n[*] Step 2: Analyzing data capabilities from ghcnd-inventory.txt...")
-    stations = parse_inventory('ghcnd-inventory.txt', stations)
+    columns = station_columns.build_columns('ghcnd-stations.txt', 'ghcnd-inventory.txt', processes=None)
+    print(f"    [OK] Found {len(columns['id'])} stations worldwide")
 
     # Step 3: Filter for snow-capable stations
     print("\n[*] Step 3: Filtering for snowfall-capable stations...")
-    snow_stations = {
-        sid: sdata for sid, sdata in stations.items()
-        if sdata['has_snow']
-    }
-    print(f"    [OK] Found {len(snow_stations)} snow-capable stations globally")
+    snow = station_columns.snow_mask(columns)
+    print(f"    [OK] Found {int(snow.sum())} snow-capable stations globally")
 
     # Step 4: Generate statistics
     print("\n[*] Step 4: Generating coverage statistics...")
-    stats = generate_statistics(snow_stations)
+    stats = station_columns.generate_statistics(columns, snow)
+
+    # Only the snow-capable subset is materialized as dicts for the JSON files
+    snow_stations = {s['id']: s for s in station_columns.station_dicts(columns, snow)}
 
     # Display statistics
     print("\n" + "=" * 60)
@@ -0,0 +1,198 @@
+"""
+Station-Network Build Pipeline
+Runs the unified GHCN station ingest as a DAG of stages whose outputs are
+cached by the hashes of their inputs, config and the country rules
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import ghcn_ingest
+from incremental_rebuild import rules_fingerprint
+
+DEFAULT_CACHE_DIR = '.build_cache'
+
+DEFAULT_CONFIG = {
+    'stations_file': 'ghcnd-stations.txt',
+    'inventory_file': 'ghcnd-inventory.txt',
+    'output_dir': '.',
+    'country_config': None,   # rules keyed by GHCN prefix (None = ghcn_ingest.COUNTRY_CONFIG)
+    'processes': None         # parser worker processes (None = CPU count)
+}
+
+
+class Stage:
+    """One pipeline step: func(inputs, config) -> output"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any], Dict], Any],
+                 deps: Sequence[str] = (), config_keys: Sequence[str] = (),
+                 file_keys: Sequence[str] = (), key_func: Optional[Callable[[Dict], str]] = None,
+                 cache: bool = True, version: int = 1):
+        """
+        Args:
+            name: Stage name (also the key of its output)
+            func: Called with {dep name: dep output} and the full config
+            deps: Upstream stage names
+            config_keys: Config entries the stage reads (part of its cache key)
+            file_keys: Config entries naming input files whose contents are hashed
+            key_func: Extra cache-key material from the config, for inputs that
+                      live in code (e.g. a digest of the country rules)
+            cache: False for stages with side effects (always run)
+            version: Bump to invalidate cached outputs after changing func
+        """
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.config_keys = tuple(config_keys)
+        self.file_keys = tuple(file_keys)
+        self.key_func = key_func
+        self.cache = cache
+        self.version = version
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class Pipeline:
+    """Runs stages in dependency order, reusing cached outputs where keys match"""
+
+    def __init__(self, stages: List[Stage], config: Dict = None, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.config = dict(DEFAULT_CONFIG if config is None else config)
+        self.cache_dir = cache_dir
+        self._file_hashes = {}
+
+    def _order(self, targets: Optional[Sequence[str]]) -> List[str]:
+        """Topological order of the targets and everything upstream of them"""
+        order, state = [], {}
+
+        def visit(name):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Pipeline cycle at stage '{name}'")
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage '{name}'")
+            state[name] = 'visiting'
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in (targets or self.stages):
+            visit(name)
+        return order
+
+    def _file_hash(self, path: str) -> str:
+        """Content hash of an input file, memoized on (path, size, mtime)"""
+        stat = os.stat(path)
+        marker = (path, stat.st_size, stat.st_mtime_ns)
+        if marker not in self._file_hashes:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    h.update(block)
+            self._file_hashes[marker] = h.hexdigest()
+        return self._file_hashes[marker]
+
+    def _key(self, stage: Stage, output_hashes: Dict[str, str]) -> str:
+        """Cache key: stage identity, its config slice, input files and upstream outputs"""
+        material = {
+            'stage': stage.name,
+            'version': stage.version,
+            'config': {k: self.config.get(k) for k in stage.config_keys},
+            'files': {k: self._file_hash(self.config[k]) for k in stage.file_keys},
+            'deps': {dep: output_hashes[dep] for dep in stage.deps},
+            'extra': stage.key_func(self.config) if stage.key_func else None
+        }
+        return _digest(json.dumps(material, sort_keys=True, default=str).encode('utf-8'))
+
+    def run(self, targets: Optional[Sequence[str]] = None, verbose: bool = True) -> Dict:
+        """
+        Run the pipeline (or the part needed for targets)
+
+        Returns:
+            Dictionary with 'outputs' by stage name and 'timings', a list of
+            {'stage', 'status' ('ran', 'cached' or 'always'), 'seconds'}
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        outputs, output_hashes, timings = {}, {}, []
+
+        for name in self._order(targets):
+            stage = self.stages[name]
+            start = time.perf_counter()
+            key = self._key(stage, output_hashes)
+            cache_path = os.path.join(self.cache_dir, f"{name}-{key[:16]}.pkl")
+
+            if stage.cache and os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    blob = f.read()
+                output = pickle.loads(blob)
+                status = 'cached'
+            else:
+                output = stage.func({dep: outputs[dep] for dep in stage.deps}, self.config)
+                blob = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+                if stage.cache:
+                    with open(cache_path, 'wb') as f:
+                        f.write(blob)
+                status = 'ran' if stage.cache else 'always'
+
+            outputs[name] = output
+            output_hashes[name] = _digest(blob)
+            seconds = time.perf_counter() - start
+            timings.append({'stage': name, 'status': status, 'seconds': round(seconds, 3)})
+            if verbose:
+                print(f"    [{status.upper():6s}] {name:16s} {seconds:8.3f}s")
+
+        return {'outputs': outputs, 'timings': timings}
+
+
+# -- Station-network stages ---------------------------------------------------
+
+def _ingest(inputs, config):
+    return ghcn_ingest.ingest(config['stations_file'], config['inventory_file'],
+                              config['country_config'], processes=config['processes'])
+
+
+def _rules(config):
+    return rules_fingerprint(config['country_config'])
+
+
+def _write(inputs, config):
+    # A cached ingest keeps the date it ran; the stats record when they were written
+    result = dict(inputs['ingest'])
+    result['stats'] = dict(result['stats'], last_updated=date.today().isoformat())
+    return ghcn_ingest.write_outputs(result, config['output_dir'])
+
+
+def network_stages() -> List[Stage]:
+    """The station-network build (ghcn_ingest) as pipeline stages"""
+    return [
+        Stage('ingest', _ingest, file_keys=('stations_file', 'inventory_file'), key_func=_rules),
+        Stage('write', _write, deps=('ingest',), config_keys=('output_dir',), cache=False)
+    ]
+
+
+def main():
+    print("=" * 60)
+    print("STATION NETWORK BUILD PIPELINE")
+    print("=" * 60)
+
+    result = Pipeline(network_stages()).run()
+    total = sum(t['seconds'] for t in result['timings'])
+    cached = sum(1 for t in result['timings'] if t['status'] == 'cached')
+
+    print("-" * 60)
+    print(f"    {len(result['timings'])} stages, {cached} from cache, {total:.3f}s total")
+    print(f"    Frontend stations: {len(result['outputs']['ingest']['frontend']):,}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
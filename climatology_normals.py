@@ -0,0 +1,280 @@
+"""
+Day-of-Year Climatology Normals
+Precomputes per-station daily normals so predictions are slice lookups
+instead of multi-year fetches
+"""
+
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from daily_series import DAYS_PER_CLIMATE_YEAR, day_of_year_index
+
+NORMALS_VERSION = 1
+
+NORMAL_FIELDS = [
+    'TMAX_MEAN', 'TMAX_P10', 'TMAX_P50', 'TMAX_P90',
+    'TMIN_MEAN', 'TMIN_P10', 'TMIN_P50', 'TMIN_P90',
+    'PRCP_MEAN', 'PRCP_PROB',
+    'SNOW_MEAN', 'SNOW_PROB'
+]
+
+# Measurable thresholds in standard units (inches), as reported by NCEI
+MEASURABLE_PRCP = 0.01
+MEASURABLE_SNOW = 0.1
+
+# Days pooled on each side of a slot; 7 gives a 15-day smoothing window
+DEFAULT_HALF_WINDOW = 7
+
+
+def _pool_by_slot(doy: np.ndarray, values: np.ndarray, half_window: int):
+    """Expand each valid observation into every slot within +/- half_window days"""
+    valid = ~np.isnan(values)
+    doy = doy[valid]
+    values = values[valid]
+
+    shifts = np.arange(-half_window, half_window + 1)
+    slots = ((doy[None, :] + shifts[:, None]) % DAYS_PER_CLIMATE_YEAR).ravel()
+    pooled = np.broadcast_to(values, (len(shifts), len(values))).ravel()
+    return slots, pooled
+
+
+def _slot_means(slots: np.ndarray, values: np.ndarray) -> np.ndarray:
+    counts = np.bincount(slots, minlength=DAYS_PER_CLIMATE_YEAR)
+    sums = np.bincount(slots, weights=values, minlength=DAYS_PER_CLIMATE_YEAR)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _slot_percentiles(slots: np.ndarray, values: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """Linear-interpolated percentiles per slot from one grouped sort"""
+    result = np.full((len(quantiles), DAYS_PER_CLIMATE_YEAR), np.nan)
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, slots))
+    sorted_values = values[order]
+    counts = np.bincount(slots, minlength=DAYS_PER_CLIMATE_YEAR)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    has_data = counts > 0
+
+    for i, q in enumerate(quantiles):
+        position = q * (counts[has_data] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        base = starts[has_data]
+        low_values = sorted_values[base + lower]
+        high_values = sorted_values[base + upper]
+        result[i, has_data] = low_values + (high_values - low_values) * (position - lower)
+
+    return result
+
+
+def compute_normals(series: Dict, half_window: int = DEFAULT_HALF_WINDOW) -> np.ndarray:
+    """
+    Compute day-of-year normals for one station
+
+    Args:
+        series: Standard-unit daily series from NOAADataFetcher.fetch_daily_series
+        half_window: Days pooled either side of each slot for smoothing
+
+    Returns:
+        float32 array shaped (366, len(NORMAL_FIELDS)), NaN where no data
+    """
+    doy = day_of_year_index(series['dates'])
+    normals = np.full((DAYS_PER_CLIMATE_YEAR, len(NORMAL_FIELDS)), np.nan, dtype=np.float32)
+    column = {name: i for i, name in enumerate(NORMAL_FIELDS)}
+
+    for element in ('TMAX', 'TMIN'):
+        if element not in series['values']:
+            continue
+        slots, pooled = _pool_by_slot(doy, series['values'][element], half_window)
+        normals[:, column[f'{element}_MEAN']] = _slot_means(slots, pooled)
+        p10, p50, p90 = _slot_percentiles(slots, pooled, [0.1, 0.5, 0.9])
+        normals[:, column[f'{element}_P10']] = p10
+        normals[:, column[f'{element}_P50']] = p50
+        normals[:, column[f'{element}_P90']] = p90
+
+    for element, threshold in (('PRCP', MEASURABLE_PRCP), ('SNOW', MEASURABLE_SNOW)):
+        if element not in series['values']:
+            continue
+        slots, pooled = _pool_by_slot(doy, series['values'][element], half_window)
+        normals[:, column[f'{element}_MEAN']] = _slot_means(slots, pooled)
+        normals[:, column[f'{element}_PROB']] = _slot_means(slots, (pooled >= threshold).astype(np.float64))
+
+    return normals
+
+
+class ClimatologyStore:
+    """Memory-mapped per-station day-of-year normals"""
+
+    DATA_FILE = 'normals.npy'
+    INDEX_FILE = 'normals_index.json'
+
+    def __init__(self, directory: str):
+        """Open an existing normals store"""
+        with open(os.path.join(directory, self.INDEX_FILE), 'r') as f:
+            self.index = json.load(f)
+
+        if self.index.get('version') != NORMALS_VERSION:
+            raise ValueError(f"Unsupported normals store version: {self.index.get('version')}")
+
+        self.fields = self.index['fields']
+        self.rows = {sid: i for i, sid in enumerate(self.index['stations'])}
+        self.normals = np.load(os.path.join(directory, self.DATA_FILE), mmap_mode='r')
+
+    @classmethod
+    def write(cls, directory: str, station_ids: List[str], normals: np.ndarray, metadata: Optional[Dict] = None):
+        """
+        Write a normals store
+
+        Args:
+            directory: Output directory (created if missing)
+            station_ids: Station IDs, one per row of normals
+            normals: Array shaped (stations, 366, len(NORMAL_FIELDS))
+            metadata: Extra index fields (years, window, ...)
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, cls.DATA_FILE), np.ascontiguousarray(normals, dtype=np.float32))
+
+        index = {
+            'version': NORMALS_VERSION,
+            'units': 'standard',
+            'fields': NORMAL_FIELDS,
+            'stations': list(station_ids)
+        }
+        index.update(metadata or {})
+        with open(os.path.join(directory, cls.INDEX_FILE), 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+    def station_normals(self, station_id: str) -> np.ndarray:
+        """Return the (366, fields) normals block for a station (zero-copy view)"""
+        return self.normals[self.rows[station_id]]
+
+    def window(self, station_id: str, start_date: str, end_date: str) -> Dict[str, np.ndarray]:
+        """
+        Look up normals for every calendar day of a project window
+
+        Returns:
+            Dictionary of field name -> per-day array, plus 'dates'
+
+        Raises:
+            ValueError: end_date is before start_date
+        """
+        if np.datetime64(end_date, 'D') < np.datetime64(start_date, 'D'):
+            raise ValueError(f"Window ends before it starts: {start_date} to {end_date}")
+
+        dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+        block = self.station_normals(station_id)
+        slots = day_of_year_index(dates)
+
+        first, last = int(slots[0]), int(slots[-1])
+        if len(slots) == last - first + 1:
+            rows = block[first:last + 1]  # Contiguous window: plain slice
+        else:
+            rows = block[slots]  # Wraps the year end or skips Feb 29
+
+        result = {name: rows[:, i] for i, name in enumerate(self.fields)}
+        result['dates'] = dates
+        return result
+
+    def predict(self, station_id: str, start_date: str, end_date: str) -> Dict:
+        """Expected conditions over a window, computed from the normals"""
+        w = self.window(station_id, start_date, end_date)
+
+        def mean(field):
+            values = w[field]
+            return round(float(np.nanmean(values)), 1) if np.any(~np.isnan(values)) else None
+
+        def window_sum(field):
+            values = w[field]
+            return round(float(np.nansum(values)), 1) if np.any(~np.isnan(values)) else None
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'days': len(w['dates']),
+            'temperature': {
+                'avg_high': mean('TMAX_MEAN'),
+                'avg_low': mean('TMIN_MEAN'),
+                'typical_high_range': [mean('TMAX_P10'), mean('TMAX_P90')],
+                'typical_low_range': [mean('TMIN_P10'), mean('TMIN_P90')]
+            },
+            'precipitation': {
+                'expected_total': window_sum('PRCP_MEAN'),
+                'expected_days': window_sum('PRCP_PROB')
+            },
+            'snowfall': {
+                'expected_total': window_sum('SNOW_MEAN'),
+                'expected_days': window_sum('SNOW_PROB')
+            }
+        }
+
+
+def build_climatology(station_ids: List[str], start_year: int, end_year: int,
+                      output_dir: str, fetcher=None, half_window: int = DEFAULT_HALF_WINDOW) -> Dict:
+    """
+    Fetch history for each station and write a normals store
+
+    Args:
+        station_ids: Stations to include
+        start_year: First year of the normals period
+        end_year: Last year of the normals period (inclusive)
+        output_dir: Directory for the normals store
+        fetcher: NOAADataFetcher (or compatible backend) to pull history from
+        half_window: Smoothing half-window in days
+
+    Returns:
+        Build summary with per-station day counts and failures
+    """
+    if fetcher is None:
+        from noaa_data_fetcher import NOAADataFetcher
+        fetcher = NOAADataFetcher()
+
+    built_ids = []
+    blocks = []
+    failed = []
+
+    for station_id in station_ids:
+        series = fetcher.fetch_daily_series(station_id, f"{start_year}-01-01", f"{end_year}-12-31",
+                                            data_types=['TMAX', 'TMIN', 'PRCP', 'SNOW'])
+        if 'error' in series or all(np.isnan(v).all() for v in series['values'].values()):
+            print(f"    [WARN] No usable history for {station_id}")
+            failed.append(station_id)
+            continue
+
+        blocks.append(compute_normals(series, half_window))
+        built_ids.append(station_id)
+
+    if not blocks:
+        raise RuntimeError("No station produced usable normals")
+
+    ClimatologyStore.write(output_dir, built_ids, np.stack(blocks), {
+        'period': [start_year, end_year],
+        'half_window_days': half_window,
+        'generated': date.today().isoformat()
+    })
+    print(f"[OK] Wrote normals for {len(built_ids)} stations to {output_dir}/")
+
+    return {'stations': built_ids, 'failed': failed}
+
+
+def main():
+    print(">>> Building day-of-year climatology normals...")
+    print("=" * 60)
+
+    with open('us_cities_with_stations.json', 'r') as f:
+        cities = json.load(f)
+
+    station_ids = sorted({c['nearest_station']['id'] for c in cities})
+    print(f"[*] {len(station_ids)} stations from us_cities_with_stations.json")
+
+    build_climatology(station_ids, 1995, 2024, 'climatology_normals')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,12 @@ Filters for best stations and creates compact JSON
 """
 
 import json
+from datetime import date
+
+from build_artifacts import publish_artifacts
+from station_columns import columns_from_records, frontend_records, quality_mask
+from station_binary import FORMAT_VERSION as BINARY_FORMAT_VERSION, write_stations_binary
+from station_tiles import write_tiles
 
 print("Creating optimized frontend station database...")
 
@@ -13,26 +19,14 @@ with open('noaa_snow_stations.json', 'r') as f:
 
 print(f"Loaded {len(all_stations)} total stations")
 
-# Filter for high-quality stations
-quality_stations = [
-    s for s in all_stations
-    if s['has_temp'] and s['has_precip'] and s['has_snow']
-    and any(dt.get('end', 0) >= 2024 for dt in s['data_types'].values())
-]
+# Filter for high-quality stations (vectorized over element bitmasks / year columns)
+columns = columns_from_records(all_stations)
+quality = quality_mask(columns, recent_year=2024)
 
-print(f"Found {len(quality_stations)} high-quality stations (2024+ data)")
+print(f"Found {int(quality.sum())} high-quality stations (2024+ data)")
 
 # Create compact format for frontend (reduce file size)
-compact_stations = []
-for station in quality_stations:
-    compact_stations.append({
-        'id': station['id'],
-        'name': station['name'],
-        'lat': round(station['lat'], 4),
-        'lng': round(station['lng'], 4),
-        'elevation': round(station['elevation'], 1),
-        'country': station['country']
-    })
+compact_stations = frontend_records(columns, quality)
 
 # Save compact database
 with open('noaa_stations_frontend.json', 'w') as f:
@@ -43,6 +37,16 @@ print(f"\n[OK] Created noaa_stations_frontend.json")
 print(f"     Stations: {len(compact_stations)}")
 print(f"     File size: {file_size_mb:.2f} MB")
 
+# Binary export: packed records + name table (see station_binary.py)
+binary_size = write_stations_binary(compact_stations, 'noaa_stations_frontend.bin')
+print(f"\n[OK] Created noaa_stations_frontend.bin")
+print(f"     Format version: {BINARY_FORMAT_VERSION}")
+print(f"     File size: {binary_size / (1024 * 1024):.2f} MB")
+
+# Spatial tiles so clients only fetch stations near the project location
+tile_manifest = write_tiles(compact_stations, 'station_tiles')
+print(f"\n[OK] Created station_tiles/ ({len(tile_manifest['tiles'])} tiles of {tile_manifest['tile_degrees']} degrees)")
+
 # Also create city database for selector
 with open('us_cities_with_stations.json', 'r') as f:
     cities = json.load(f)
@@ -52,7 +56,7 @@ print(f"\n[OK] City database ready: {len(cities)} cities")
 # Create combined package
 frontend_package = {
     'version': '2.0',
-    'generated': '2025-11-21',
+    'generated': date.today().isoformat(),
     'station_count': len(compact_stations),
     'cities': cities,
     'stats': {
@@ -67,6 +71,10 @@ with open('xyloclime_noaa_package.json', 'w') as f:
     json.dump(frontend_package, f, indent=2)
 
 print(f"\n[OK] Created xyloclime_noaa_package.json (metadata)")
+
+# Content-hashed, precompressed copies for immutable client caching
+artifact_manifest = publish_artifacts()
+print(f"\n[OK] Published {len(artifact_manifest['artifacts'])} artifacts to dist/ (see artifact_manifest.json)")
 print("\n" + "=" * 60)
 print("[SUCCESS] Frontend database ready for integration!")
 print("=" * 60)
@@ -0,0 +1,173 @@
+"""
+NOAA Daily Series
+Converts NCEI daily records into typed, gap-filled NumPy arrays
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_ELEMENTS = ['TMAX', 'TMIN', 'PRCP', 'SNOW', 'SNWD']
+
+# Wind speed elements (mph in standard units, km/h after to_metric)
+WIND_ELEMENTS = ('AWND', 'WSF2', 'WSF5')
+
+# Cumulative day counts before each month in a leap year. Day-of-year slots
+# use this calendar so Feb 29 has its own slot and Mar 1 is always slot 60.
+LEAP_MONTH_OFFSETS = np.array([0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+DAYS_PER_CLIMATE_YEAR = 366
+
+# Decimals NCEI reports for each element in standard units (others: 1)
+STANDARD_DECIMALS = {'TMAX': 0, 'TMIN': 0, 'TAVG': 0, 'PRCP': 2, 'SNOW': 1, 'SNWD': 1}
+
+
+def records_to_series(records: List[Dict], start_date: str, end_date: str,
+                      data_types: Optional[List[str]] = None,
+                      station_id: Optional[str] = None) -> Dict:
+    """
+    Build a dense daily series from NCEI records
+
+    Every calendar day between start_date and end_date gets a slot, and days
+    or elements missing from the records are NaN.
+
+    Args:
+        records: Daily records as returned by NOAADataFetcher.fetch_daily_data
+        start_date: First day (YYYY-MM-DD)
+        end_date: Last day (YYYY-MM-DD), inclusive
+        data_types: Elements to extract (defaults to DEFAULT_ELEMENTS)
+        station_id: Station ID to record on the series
+
+    Returns:
+        Dictionary with 'dates' (datetime64[D]) and per-element float64 'values'
+    """
+    if data_types is None:
+        data_types = DEFAULT_ELEMENTS
+
+    start = np.datetime64(start_date, 'D')
+    dates = np.arange(start, np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+    values = {element: np.full(len(dates), np.nan) for element in data_types}
+
+    if records:
+        offsets = (np.array([r['DATE'][:10] for r in records], dtype='datetime64[D]') - start).astype(np.int64)
+        in_range = (offsets >= 0) & (offsets < len(dates))
+
+        for element in data_types:
+            raw = [r.get(element) for r in records]
+            present = np.array([v is not None and v != '' for v in raw]) & in_range
+            if present.any():
+                values[element][offsets[present]] = np.array(
+                    [raw[i] for i in np.flatnonzero(present)], dtype=np.float64
+                )
+
+    return {
+        'station_id': station_id or (records[0].get('STATION') if records else None),
+        'start_date': start_date,
+        'end_date': end_date,
+        'units': 'standard',
+        'dates': dates,
+        'values': values
+    }
+
+
+def series_to_records(series: Dict, data_types: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Inverse of records_to_series: NCEI-style records ({'DATE', 'STATION',
+    element: 'value'}) for the days with any data, values formatted with
+    STANDARD_DECIMALS
+    """
+    if data_types is None:
+        data_types = list(series['values'])
+
+    station_id = series.get('station_id')
+    columns = [(element, series['values'][element].tolist(), STANDARD_DECIMALS.get(element, 1))
+               for element in data_types]
+
+    records = []
+    for i, day in enumerate(series['dates'].astype(str).tolist()):
+        record = {'DATE': day, 'STATION': station_id}
+        for element, values, decimals in columns:
+            if values[i] == values[i]:  # not NaN
+                record[element] = f"{values[i]:.{decimals}f}"
+        if len(record) > 2:
+            records.append(record)
+    return records
+
+
+def to_metric(series: Dict) -> Dict:
+    """
+    Convert a standard-unit series to the metric units used by app.js
+
+    Temperatures become °C, precipitation mm, snowfall/snow depth cm and
+    wind km/h, matching the Open-Meteo fields the frontend templates use.
+    """
+    if series.get('units') == 'metric':
+        return series
+
+    converted = {}
+    for element, values in series['values'].items():
+        if element in ('TMAX', 'TMIN', 'TAVG'):
+            converted[element] = (values - 32.0) * 5.0 / 9.0
+        elif element == 'PRCP':
+            converted[element] = values * 25.4
+        elif element in ('SNOW', 'SNWD'):
+            converted[element] = values * 2.54
+        elif element in WIND_ELEMENTS:
+            converted[element] = values * 1.609344
+        else:
+            converted[element] = values
+
+    metric = dict(series)
+    metric['units'] = 'metric'
+    metric['values'] = converted
+    return metric
+
+
+def stack_series(series_list: List[Dict]) -> Dict:
+    """
+    Align several station series onto one shared date axis
+
+    Returns:
+        Dictionary with 'station_ids', 'dates' and per-element 2-D arrays
+        shaped (stations, days), NaN where a station has no data
+    """
+    if not series_list:
+        raise ValueError("stack_series needs at least one series")
+
+    units = {s.get('units', 'standard') for s in series_list}
+    if len(units) > 1:
+        raise ValueError(f"Cannot stack series with mixed units: {sorted(units)}")
+
+    start = min(s['dates'][0] for s in series_list)
+    end = max(s['dates'][-1] for s in series_list)
+    dates = np.arange(start, end + 1, dtype='datetime64[D]')
+    elements = sorted({e for s in series_list for e in s['values']})
+
+    values = {e: np.full((len(series_list), len(dates)), np.nan) for e in elements}
+    for row, s in enumerate(series_list):
+        offset = int((s['dates'][0] - start).astype(np.int64))
+        for element, column in s['values'].items():
+            values[element][row, offset:offset + len(column)] = column
+
+    return {
+        'station_ids': [s.get('station_id') for s in series_list],
+        'units': units.pop(),
+        'dates': dates,
+        'values': values
+    }
+
+
+def day_of_year_index(dates: np.ndarray) -> np.ndarray:
+    """Map datetime64[D] dates to 0-365 slots on a leap-year calendar"""
+    months = dates.astype('datetime64[M]')
+    month_index = months.astype(np.int64) % 12
+    day_of_month = (dates - months.astype('datetime64[D]')).astype(np.int64)
+    return LEAP_MONTH_OFFSETS[month_index] + day_of_month
+
+
+def calendar_fields(dates: np.ndarray) -> Dict[str, np.ndarray]:
+    """Return year, month (1-12) and leap-calendar day-of-year arrays for dates"""
+    return {
+        'year': dates.astype('datetime64[Y]').astype(np.int64) + 1970,
+        'month': dates.astype('datetime64[M]').astype(np.int64) % 12 + 1,
+        'doy': day_of_year_index(dates)
+    }
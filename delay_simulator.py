@@ -0,0 +1,209 @@
+"""
+Monte Carlo Schedule-Delay Simulator
+Replays a project schedule against bootstrapped NOAA weather history to get
+completion-date and delay-cost distributions (P50/P80/P95)
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from daily_series import day_of_year_index
+from start_date_optimizer import DAYS_PER_YEAR, FEB_29_SLOT
+from workable_days import evaluate_masks, prepare_series
+
+PERCENTILES = (50, 80, 95)
+
+# A year needs this share of days with TMAX and PRCP to be resampled
+MIN_YEAR_COVERAGE = 0.9
+
+# Simulations replayed per NumPy batch (bounds the sims x horizon arrays)
+SIM_BATCH = 2000
+
+# Schedules are never replayed past this many calendar days
+MAX_HORIZON_DAYS = 3650
+
+
+def yearly_workable_matrix(series: Union[Dict, List[Dict]], criteria: Dict) -> Dict:
+    """
+    Lay one station's workable days out as a (years, 365) matrix
+
+    Feb 29 is dropped so every year shares the same day axis. Years with
+    less than MIN_YEAR_COVERAGE data are left out of the matrix.
+
+    Args:
+        series: Daily series for a single station (or a one-station stack)
+        criteria: Template threshold dict (see workable_days.evaluate_masks)
+
+    Returns:
+        Dictionary with 'years' and boolean 'workable' shaped (years, 365)
+    """
+    stacked = prepare_series(series)
+    if len(stacked['station_ids']) != 1:
+        raise ValueError("yearly_workable_matrix expects a single station")
+
+    values = {element: column[:1] for element, column in stacked['values'].items()}
+    workable = evaluate_masks(values, [criteria])[0, 0]
+    has_data = ~np.isnan(values['TMAX'][0]) & ~np.isnan(values['PRCP'][0])
+
+    doy = day_of_year_index(stacked['dates'])
+    keep = doy != FEB_29_SLOT
+    slot = np.where(doy > FEB_29_SLOT, doy - 1, doy)[keep]
+    year = (stacked['dates'].astype('datetime64[Y]').astype(np.int64) + 1970)[keep]
+    years = np.unique(year)
+
+    matrix = np.zeros((len(years), DAYS_PER_YEAR), dtype=bool)
+    coverage = np.zeros((len(years), DAYS_PER_YEAR), dtype=bool)
+    row = np.searchsorted(years, year)
+    matrix[row, slot] = workable[keep]
+    coverage[row, slot] = has_data[keep]
+
+    complete = coverage.mean(axis=1) >= MIN_YEAR_COVERAGE
+    return {'years': years[complete], 'workable': matrix[complete]}
+
+
+def _horizon(workable: np.ndarray, work_days: int) -> int:
+    """Calendar days to replay: generous multiple of the expected duration"""
+    rate = max(float(workable.mean()), 0.02)
+    return int(min(MAX_HORIZON_DAYS, max(2 * DAYS_PER_YEAR, math.ceil(3 * work_days / rate))))
+
+
+def simulate_schedule(workable: np.ndarray, start_day: int, work_days: int, planned_days: int,
+                      daily_delay_cost: float = 0.0, simulations: int = 5000,
+                      block: str = 'year', seed: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo completion and delay distribution for one site
+
+    Each simulation stitches a weather sequence from historical years drawn
+    with replacement: one draw per calendar year of the schedule
+    (block='year') or one draw per 7-day block (block='week', a seasonal
+    block bootstrap). The project finishes on the day its work_days-th
+    workable day is reached.
+
+    Args:
+        workable: Boolean (years, 365) matrix from yearly_workable_matrix
+        start_day: Start as 0-based day of the 365-day year
+        work_days: Workable days of work the project needs (0 completes on day 0)
+        planned_days: Scheduled calendar duration; later finishes are delay
+        daily_delay_cost: Cost per day of delay (overhead, penalties, ...)
+        simulations: Number of replays
+        block: 'year' or 'week'
+        seed: Random seed for reproducible runs
+
+    Returns:
+        Dictionary with completion/delay/cost percentiles, means and the
+        number of simulations that never finished inside the horizon
+
+    Raises:
+        ValueError: Unknown block, negative work_days or no years to resample
+    """
+    if block not in ('year', 'week'):
+        raise ValueError(f"Unknown bootstrap block: {block}")
+    if work_days < 0:
+        raise ValueError(f"work_days must be non-negative, got {work_days}")
+    if len(workable) == 0:
+        raise ValueError("No complete historical years to resample")
+
+    rng = np.random.default_rng(seed)
+    horizon = _horizon(workable, work_days)
+    day = start_day + np.arange(horizon)
+    slot = day % DAYS_PER_YEAR
+    block_id = day // DAYS_PER_YEAR if block == 'year' else (day - start_day) // 7
+    n_blocks = int(block_id[-1]) + 1
+
+    completion = np.empty(simulations, dtype=np.int32)
+    censored = 0
+    for lo in range(0, simulations, SIM_BATCH):
+        n = min(SIM_BATCH, simulations - lo)
+        draws = rng.integers(0, len(workable), size=(n, n_blocks))
+        weather = workable[draws[:, block_id], slot]
+
+        done = np.cumsum(weather, axis=1, dtype=np.int32) >= work_days
+        finished = done[:, -1]
+        # Nothing to do finishes on day 0, before the first replayed day
+        completion[lo:lo + n] = np.where(finished, done.argmax(axis=1) + 1, horizon) if work_days else 0
+        censored += int((~finished).sum())
+
+    delay = np.maximum(completion - planned_days, 0)
+    cost = delay * daily_delay_cost
+
+    def pct(values):
+        return {f'p{p}': float(np.percentile(values, p)) for p in PERCENTILES}
+
+    return {
+        'simulations': simulations,
+        'block': block,
+        'years_sampled': len(workable),
+        'horizon_days': horizon,
+        'censored': censored,
+        'completion_days': pct(completion),
+        'delay_days': pct(delay),
+        'delay_cost': pct(cost),
+        'mean_completion_days': float(completion.mean()),
+        'mean_delay_days': float(delay.mean()),
+        'mean_delay_cost': float(cost.mean()),
+        'probability_late': float((delay > 0).mean())
+    }
+
+
+def completion_dates(result: Dict, start: str) -> Dict[str, str]:
+    """Turn completion-day percentiles into calendar dates from a start date"""
+    first = date.fromisoformat(start)
+    return {
+        key: (first + timedelta(days=math.ceil(days) - 1)).isoformat()
+        for key, days in result['completion_days'].items()
+    }
+
+
+def _simulate_project(job: Dict) -> Dict:
+    """Process-pool entry point: one project, one seed"""
+    project = job['project']
+    result = simulate_schedule(
+        job['workable'],
+        start_day=project['start_day'],
+        work_days=project.get('work_days', project['planned_days']),
+        planned_days=project['planned_days'],
+        daily_delay_cost=project.get('daily_delay_cost', 0.0),
+        simulations=job['simulations'],
+        block=job['block'],
+        seed=job['seed']
+    )
+    result['project_id'] = project.get('id')
+    return result
+
+
+def simulate_portfolio(projects: List[Dict], simulations: int = 5000, block: str = 'year',
+                       processes: Optional[int] = None, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Run simulate_schedule for many projects across a process pool
+
+    Args:
+        projects: Dicts with 'workable' (years x 365 matrix), 'start_day',
+                  'planned_days' and optional 'work_days', 'daily_delay_cost', 'id'
+        simulations: Replays per project
+        block: 'year' or 'week' bootstrap
+        processes: Worker processes (defaults to CPU count; 1 runs inline)
+        seed: Base seed; each project gets an independent child stream
+
+    Returns:
+        One result dict per project, in input order
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(projects))
+    jobs = [{
+        'project': {k: v for k, v in p.items() if k != 'workable'},
+        'workable': p['workable'],
+        'simulations': simulations,
+        'block': block,
+        'seed': s
+    } for p, s in zip(projects, seeds)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) < 2:
+        return [_simulate_project(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+        return list(pool.map(_simulate_project, jobs, chunksize=max(1, len(jobs) // (4 * processes))))
@@ -0,0 +1,267 @@
+"""
+GHCN-Daily Bulk Ingest
+Streams ghcnd_all.tar.gz (or a directory of .dly files) into a per-station
+columnar store that NOAADataFetcher can use instead of the NCEI web service
+"""
+
+import json
+import os
+import tarfile
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from daily_series import DEFAULT_ELEMENTS, STANDARD_DECIMALS, series_to_records
+from ghcn_parser import DLY_DAYS, DLY_MISSING, decode, parse_dly
+from series_codec import read_series, write_series
+
+DEFAULT_SOURCE = 'ghcnd_all.tar.gz'
+DEFAULT_STORE_DIR = 'dly_store'
+INDEX_FILE = 'index.json'
+STORE_VERSION = 1
+
+# Station file formats: compressed NumPy archives, or series_codec blobs
+# (smaller, and faster to decode than either .npz or JSON records)
+ENCODINGS = {'npz': '.npz', 'xds': '.xds'}
+
+# Raw GHCN units -> NCEI 'standard' units
+STANDARD_UNITS = {
+    'TMAX': lambda v: v / 10.0 * 1.8 + 32.0,   # tenths of °C -> °F
+    'TMIN': lambda v: v / 10.0 * 1.8 + 32.0,
+    'TAVG': lambda v: v / 10.0 * 1.8 + 32.0,
+    'PRCP': lambda v: v / 254.0,               # tenths of mm -> inches
+    'SNOW': lambda v: v / 25.4,                # mm -> inches
+    'SNWD': lambda v: v / 25.4
+}
+
+
+def to_standard(element: str, raw: np.ndarray) -> np.ndarray:
+    """Raw GHCN values to standard units, rounded as NCEI reports them (NaN = missing)"""
+    values = np.full(len(raw), np.nan)
+    present = raw != DLY_MISSING
+    convert = STANDARD_UNITS.get(element, lambda v: v)
+    values[present] = np.round(convert(raw[present].astype(np.float64)), STANDARD_DECIMALS.get(element, 1))
+    return values
+
+
+def iter_dly_sources(source: str, stations: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (station_id, .dly contents) without extracting anything to disk
+
+    Args:
+        source: ghcnd_all.tar.gz (read as a stream) or a directory of .dly files
+        stations: Station IDs to keep (None keeps every station)
+    """
+    wanted = None if stations is None else set(stations)
+
+    if os.path.isdir(source):
+        for entry in sorted(os.scandir(source), key=lambda e: e.name):
+            station_id, ext = os.path.splitext(entry.name)
+            if ext == '.dly' and (wanted is None or station_id in wanted):
+                with open(entry.path, 'rb') as f:
+                    yield station_id, f.read()
+        return
+
+    with tarfile.open(source, 'r|*') as archive:
+        for member in archive:
+            station_id, ext = os.path.splitext(os.path.basename(member.name))
+            if not member.isfile() or ext != '.dly':
+                continue
+            if wanted is not None and station_id not in wanted:
+                continue
+            yield station_id, archive.extractfile(member).read()
+
+
+def station_arrays(rows: Dict[str, np.ndarray], elements: Iterable[str] = DEFAULT_ELEMENTS,
+                   drop_flagged: bool = True) -> Optional[Dict]:
+    """
+    Lay one station's monthly rows out as dense daily columns
+
+    Args:
+        rows: ghcn_parser.parse_dly output for a single station
+        elements: Elements to keep
+        drop_flagged: Treat values that failed GHCN quality checks as missing
+
+    Returns:
+        Dictionary with 'start' (datetime64[D]) and per-element int16 arrays
+        in raw GHCN units (DLY_MISSING where absent), or None if no rows
+    """
+    if len(rows['year']) == 0:
+        return None
+
+    months = (rows['year'].astype(np.int64) - 1970) * 12 + rows['month'] - 1
+    month_start = months.astype('datetime64[M]').astype('datetime64[D]')
+    month_days = ((months + 1).astype('datetime64[M]').astype('datetime64[D]') - month_start).astype(np.int64)
+
+    start = month_start.min()
+    end = (months.max() + 1).astype('datetime64[M]').astype('datetime64[D]')
+    offsets = (month_start - start).astype(np.int64)[:, None] + np.arange(DLY_DAYS)
+
+    values = rows['values']
+    present = (np.arange(DLY_DAYS) < month_days[:, None]) & (values != DLY_MISSING)
+    if drop_flagged:
+        present &= ~rows['flagged']
+
+    columns = {}
+    element_codes = np.array(decode(rows['element']))
+    for element in elements:
+        column = np.full(int((end - start).astype(np.int64)), DLY_MISSING, dtype=np.int16)
+        mask = present & (element_codes == element)[:, None]
+        column[offsets[mask]] = values[mask]
+        if (column != DLY_MISSING).any():
+            columns[element] = column
+
+    return {'start': start, 'values': columns}
+
+
+def _station_file(directory: str, station_id: str, encoding: str = 'npz') -> str:
+    return os.path.join(directory, f"{station_id}{ENCODINGS[encoding]}")
+
+
+def ingest_dly(source: str = DEFAULT_SOURCE, output_dir: str = DEFAULT_STORE_DIR,
+               stations: Optional[Iterable[str]] = None, elements: Iterable[str] = DEFAULT_ELEMENTS,
+               drop_flagged: bool = True, encoding: str = 'npz') -> Dict:
+    """
+    Build the per-station store from a .dly archive or directory
+
+    Each station becomes one file of int16 daily columns, one per element,
+    starting at the station's first month. index.json lists the stations
+    with their date range and elements.
+
+    Args:
+        source: ghcnd_all.tar.gz or a directory of .dly files
+        output_dir: Store directory
+        stations: Station IDs to ingest (None ingests all)
+        elements: Elements to keep
+        drop_flagged: Treat values that failed GHCN quality checks as missing
+        encoding: 'npz' (compressed NumPy archive) or 'xds' (series_codec)
+
+    Returns:
+        The store index
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown daily store encoding: {encoding}")
+    elements = list(elements)
+    os.makedirs(output_dir, exist_ok=True)
+    index = {
+        'version': STORE_VERSION,
+        'generated': date.today().isoformat(),
+        'source': os.path.basename(source.rstrip('/')),
+        'units': 'ghcn',
+        'encoding': encoding,
+        'stations': {}
+    }
+
+    for station_id, data in iter_dly_sources(source, stations):
+        arrays = station_arrays(parse_dly(data, elements), elements, drop_flagged)
+        if arrays is None or not arrays['values']:
+            continue
+
+        path = _station_file(output_dir, station_id, encoding)
+        if encoding == 'xds':
+            write_series(path, arrays['start'], arrays['values'])
+        else:
+            np.savez_compressed(path, start=np.array([arrays['start']]), **arrays['values'])
+        days = len(next(iter(arrays['values'].values())))
+        index['stations'][station_id] = {
+            'start': str(arrays['start']),
+            'end': str(arrays['start'] + days - 1),
+            'elements': sorted(arrays['values'])
+        }
+
+    with open(os.path.join(output_dir, INDEX_FILE), 'w') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+class DlyStore:
+    """
+    Local backend for NOAADataFetcher over a store written by ingest_dly
+
+    Returns the same record dicts and series as the NCEI daily-summaries
+    service in standard units, so fetcher callers need no changes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE), 'r') as f:
+            self.index = json.load(f)
+
+        if self.index.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported daily store version: {self.index.get('version')}")
+
+    def __contains__(self, station_id: str) -> bool:
+        return station_id in self.index['stations']
+
+    def load(self, station_id: str) -> Dict:
+        """Raw columns for one station: 'start' and per-element int16 arrays"""
+        if station_id not in self:
+            raise KeyError(f"Station {station_id} is not in the daily store")
+        # Stores written before the encoding option are all .npz
+        encoding = self.index.get('encoding', 'npz')
+        if encoding == 'xds':
+            return read_series(_station_file(self.directory, station_id, encoding))
+        with np.load(_station_file(self.directory, station_id)) as data:
+            return {
+                'start': data['start'][0],
+                'values': {name: data[name] for name in data.files if name != 'start'}
+            }
+
+    def daily_series(self, station_id: str, start_date: str, end_date: str,
+                     data_types: Optional[List[str]] = None) -> Dict:
+        """
+        Dense standard-unit series, shaped like daily_series.records_to_series
+
+        Values are rounded to the decimals NCEI reports, so they agree with
+        daily_records and with the web service.
+        """
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+
+        start = np.datetime64(start_date, 'D')
+        dates = np.arange(start, np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+        values = {element: np.full(len(dates), np.nan) for element in data_types}
+
+        stored = self.load(station_id)
+        shift = int((start - stored['start']).astype(np.int64))
+        for element in data_types:
+            column = stored['values'].get(element)
+            if column is None:
+                continue
+            lo, hi = max(shift, 0), min(shift + len(dates), len(column))
+            if lo >= hi:
+                continue
+            values[element][lo - shift:hi - shift] = to_standard(element, column[lo:hi])
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'units': 'standard',
+            'dates': dates,
+            'values': values
+        }
+
+    def daily_records(self, station_id: str, start_date: str, end_date: str,
+                      data_types: Optional[List[str]] = None) -> List[Dict]:
+        """NCEI-style records ({'DATE', 'STATION', element: 'value'}) for days with any data"""
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+        return series_to_records(self.daily_series(station_id, start_date, end_date, data_types), data_types)
+
+
+def main():
+    print("=" * 60)
+    print("GHCN-DAILY BULK INGEST")
+    print("=" * 60)
+
+    source = DEFAULT_SOURCE if os.path.exists(DEFAULT_SOURCE) else 'ghcnd_all'
+    print(f"\n[*] Streaming {source} into {DEFAULT_STORE_DIR}/ ...")
+    index = ingest_dly(source)
+    print(f"    [OK] {len(index['stations']):,} stations written")
+    print(f"\n[SAVED] {os.path.join(DEFAULT_STORE_DIR, INDEX_FILE)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Unified GHCN Station Ingest
+Reads ghcnd-stations.txt and ghcnd-inventory.txt once and builds every station
+artifact from a declarative per-country config (replaces the add_* scripts)
+"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List
+
+import numpy as np
+
+from ghcn_parser import PERIOD_COLUMNS, decode, parse_inventory, parse_stations
+
+# Country rules keyed by GHCN ID prefix (FIPS code, not ISO).
+# Adding a country is one entry here - no extra rescans or merge scripts.
+#   iso            code used for 'country' and the frontend name prefix
+#   label          display name for reports
+#   elements       any of these with data through min_year makes a station snow-capable
+#   temp_elements  any of these with data through min_year sets has_temp
+#   min_year       last year of data required for the capability flags
+#   require_full   frontend needs temperature, PRCP and SNOW plus RECENT_YEAR data
+COUNTRY_CONFIG = {
+    'GM': {'iso': 'DE', 'label': 'Germany'},
+    'UK': {'iso': 'UK', 'label': 'United Kingdom'},
+    'SW': {'iso': 'SE', 'label': 'Sweden'},
+    'NL': {'iso': 'NL', 'label': 'Netherlands'},
+    'NO': {'iso': 'NO', 'label': 'Norway'},
+    'SZ': {'iso': 'CH', 'label': 'Switzerland'},
+    'FR': {'iso': 'FR', 'label': 'France'},
+    'SP': {'iso': 'ES', 'label': 'Spain'},
+    'JA': {'iso': 'JP', 'label': 'Japan'},
+    'RS': {'iso': 'RU', 'label': 'Russia'},
+    'KZ': {'iso': 'KZ', 'label': 'Kazakhstan'},
+    'TU': {'iso': 'TR', 'label': 'Turkey'},
+    'AR': {'iso': 'AR', 'label': 'Argentina'},
+    'IT': {'iso': 'IT', 'label': 'Italy'},
+    'FI': {'iso': 'FI', 'label': 'Finland'},
+    'PL': {'iso': 'PL', 'label': 'Poland'},
+    'AU': {'iso': 'AT', 'label': 'Austria'},
+    'EZ': {'iso': 'CZ', 'label': 'Czechia'},
+}
+
+# Defaults for configured countries (the add_* script behaviour, where TAVG
+# alone counts as temperature data)
+COUNTRY_DEFAULTS = {'elements': ('SNOW', 'SNWD'), 'temp_elements': ('TMAX', 'TMIN', 'TAVG'),
+                    'min_year': 2020, 'name_prefix': True, 'require_full': False}
+
+# Every other prefix (US, Canada, territories): build_noaa_network +
+# create_frontend_station_db behaviour - the prefix is the country code and
+# names keep their state/province column; only TMAX/TMIN count as temperature
+DEFAULT_RULE = {'elements': ('SNOW',), 'temp_elements': ('TMAX', 'TMIN'), 'min_year': 2020,
+                'name_prefix': False, 'require_full': True}
+
+RECENT_YEAR = 2024
+
+OUTPUT_FILES = {
+    'snow': 'noaa_snow_stations.json',
+    'by_country': 'noaa_stations_by_country.json',
+    'frontend': 'noaa_stations_frontend.json',
+    'stats': 'noaa_network_stats.json'
+}
+
+
+def rule_for(prefix: str, config: Dict = None) -> Dict:
+    """Resolved rule for a GHCN ID prefix"""
+    config = COUNTRY_CONFIG if config is None else config
+    if prefix in config:
+        rule = dict(COUNTRY_DEFAULTS)
+        rule.update(config[prefix])
+        return rule
+    rule = dict(DEFAULT_RULE)
+    rule.update({'iso': prefix, 'label': prefix})
+    return rule
+
+
+def station_record(station_id: str, lat: float, lng: float, elevation: float,
+                   state: str, name: str, rule: Dict) -> Dict:
+    """Station dict in the noaa_snow_stations.json layout"""
+    name = name or "Unknown"
+    if rule['name_prefix']:
+        name = f"{rule['iso']} {name}"
+    elif state:
+        name = f"{state} {name}"
+
+    return {
+        'id': station_id,
+        'name': name,
+        'lat': lat,
+        'lng': lng,
+        'elevation': elevation,
+        'country': rule['iso'],
+        'data_types': {},
+        'has_snow': False,
+        'has_snwd': False,
+        'has_temp': False,
+        'has_precip': False
+    }
+
+
+def read_stations(filename: str, config: Dict = None, processes: int = 1) -> Dict[str, Dict]:
+    """Parse every station in ghcnd-stations.txt under its country rule"""
+    columns = parse_stations(filename, processes=processes)
+    valid = ~np.isnan(columns['lat']) & ~np.isnan(columns['lon'])
+    columns = {key: values[valid] for key, values in columns.items()}
+
+    rules = {}
+    stations = {}
+    for station_id, lat, lng, elevation, state, name in zip(
+            decode(columns['id']), columns['lat'].tolist(), columns['lon'].tolist(),
+            columns['elevation'].tolist(), decode(columns['state']), decode(columns['name'])):
+        prefix = station_id[:2]
+        if prefix not in rules:
+            rules[prefix] = rule_for(prefix, config)
+        stations[station_id] = station_record(station_id, lat, lng, elevation, state, name, rules[prefix])
+
+    return stations
+
+
+def read_inventory(filename: str, stations: Dict[str, Dict], processes: int = 1) -> int:
+    """
+    Attach element periods from ghcnd-inventory.txt
+
+    Returns:
+        Number of inventory rows applied
+    """
+    inventory = parse_inventory(filename, columns=PERIOD_COLUMNS, processes=processes)
+
+    applied = 0
+    for station_id, element, start_year, end_year in zip(
+            decode(inventory['id']), decode(inventory['element']),
+            inventory['first_year'].tolist(), inventory['last_year'].tolist()):
+        station = stations.get(station_id)
+        if station is None:
+            continue
+        station['data_types'][element] = {'start': start_year, 'end': end_year}
+        applied += 1
+
+    return applied
+
+
+def apply_capabilities(station: Dict, rule: Dict) -> None:
+    """Set has_* flags from the station's element periods and its rule"""
+    def active(element):
+        period = station['data_types'].get(element)
+        return period is not None and period['end'] >= rule['min_year']
+
+    station['has_snow'] = any(active(el) for el in rule['elements'])
+    station['has_snwd'] = active('SNWD')
+    station['has_temp'] = any(active(el) for el in rule['temp_elements'])
+    station['has_precip'] = active('PRCP')
+
+
+def frontend_record(station: Dict) -> Dict:
+    """Compact record used by noaa_stations_frontend.json"""
+    return {
+        'id': station['id'],
+        'name': station['name'],
+        'lat': round(station['lat'], 4),
+        'lng': round(station['lng'], 4),
+        'elevation': round(station['elevation'], 1),
+        'country': station['country']
+    }
+
+
+def is_recent(station: Dict) -> bool:
+    return any(period['end'] >= RECENT_YEAR for period in station['data_types'].values())
+
+
+def in_frontend(station: Dict, rule: Dict) -> bool:
+    """Whether a station (with capabilities applied) belongs in the frontend database"""
+    if not station['has_snow']:
+        return False
+    if rule['require_full']:
+        return station['has_temp'] and station['has_precip'] and is_recent(station)
+    return True
+
+
+def ingest(stations_file: str = 'ghcnd-stations.txt', inventory_file: str = 'ghcnd-inventory.txt',
+           config: Dict = None, processes: int = 1) -> Dict:
+    """
+    Build every station artifact from one read of each GHCN file
+
+    Args:
+        stations_file: Path to ghcnd-stations.txt
+        inventory_file: Path to ghcnd-inventory.txt
+        config: Country rules keyed by ID prefix (defaults to COUNTRY_CONFIG)
+        processes: Worker processes for parsing the GHCN files (None = CPU
+                   count); small files are parsed in-process regardless
+
+    Returns:
+        Dictionary with 'stations' (all, by ID), 'snow_stations',
+        'by_country', 'frontend' and 'stats'
+    """
+    stations = read_stations(stations_file, config, processes)
+    inventory_rows = read_inventory(inventory_file, stations, processes)
+
+    snow_stations = []
+    frontend = []
+    for station_id in sorted(stations):
+        station = stations[station_id]
+        rule = rule_for(station_id[:2], config)
+        apply_capabilities(station, rule)
+        if not station['has_snow']:
+            continue
+
+        snow_stations.append(station)
+        if in_frontend(station, rule):
+            frontend.append(frontend_record(station))
+
+    by_country = defaultdict(list)
+    for station in snow_stations:
+        by_country[station['country']].append(station)
+
+    return {
+        'stations': stations,
+        'snow_stations': snow_stations,
+        'by_country': dict(by_country),
+        'frontend': frontend,
+        'stats': generate_statistics(snow_stations, frontend, len(stations), inventory_rows)
+    }
+
+
+def generate_statistics(snow_stations: List[Dict], frontend: List[Dict],
+                        stations_parsed: int, inventory_rows: int) -> Dict:
+    """Coverage statistics for noaa_network_stats.json"""
+    by_country = defaultdict(int)
+    for station in frontend:
+        by_country[station['country']] += 1
+
+    return {
+        'total_stations': len(frontend),
+        'by_country': dict(sorted(by_country.items(), key=lambda item: -item[1])),
+        'snow_capable': len(snow_stations),
+        'full_capability': sum(1 for s in snow_stations if s['has_temp'] and s['has_precip']),
+        'recent_data': sum(1 for s in snow_stations if is_recent(s)),
+        'stations_parsed': stations_parsed,
+        'inventory_rows': inventory_rows,
+        'last_updated': date.today().isoformat()
+    }
+
+
+def write_outputs(result: Dict, output_dir: str = '.', store=None) -> Dict[str, str]:
+    """
+    Write all four station artifacts
+
+    Args:
+        result: Output of ingest
+        output_dir: Directory for the JSON files
+        store: Optional StationStore; it is replaced with the frontend
+               stations (stale rows deleted in the same transaction) and
+               the frontend JSON is exported from the store
+
+    Returns:
+        Paths written, keyed like OUTPUT_FILES
+    """
+    paths = {key: os.path.join(output_dir, name) for key, name in OUTPUT_FILES.items()}
+
+    with open(paths['snow'], 'w') as f:
+        json.dump(result['snow_stations'], f, indent=2)
+    with open(paths['by_country'], 'w') as f:
+        json.dump(result['by_country'], f, indent=2)
+
+    if store is not None:
+        store.replace(result['frontend'])
+        store.export_frontend(paths['frontend'])
+    else:
+        with open(paths['frontend'], 'w') as f:
+            json.dump(result['frontend'], f, separators=(',', ':'))
+    with open(paths['stats'], 'w') as f:
+        json.dump(result['stats'], f, indent=2)
+
+    return paths
+
+
+def main():
+    print("=" * 60)
+    print("UNIFIED GHCN STATION INGEST")
+    print("=" * 60)
+
+    print("\n[*] Reading ghcnd-stations.txt and ghcnd-inventory.txt (single pass each, all cores)...")
+    result = ingest(processes=None)
+    stats = result['stats']
+    print(f"    [OK] {stats['stations_parsed']:,} stations, {stats['inventory_rows']:,} inventory rows")
+    print(f"    [OK] {stats['snow_capable']:,} snow-capable, {stats['total_stations']:,} in frontend database")
+
+    print("\nFRONTEND STATIONS BY COUNTRY:")
+    print("-" * 60)
+    for country, count in list(stats['by_country'].items())[:25]:
+        print(f"  {country:3s}: {count:5,d}")
+
+    print("\n[*] Writing station databases...")
+    for path in write_outputs(result).values():
+        print(f"    [SAVED] {path}")
+
+    print("\n[SUCCESS] Station network ingest complete")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""
+Vectorized GHCN Fixed-Width Parser
+Memory-maps ghcnd-stations.txt / ghcnd-inventory.txt and decodes their
+columns into typed NumPy arrays in bulk instead of slicing line by line
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# (start, end) byte offsets, 0-based and end-exclusive, from the GHCN readme
+STATION_COLUMNS = {
+    'id': (0, 11),
+    'lat': (12, 20),
+    'lon': (21, 30),
+    'elevation': (31, 37),
+    'state': (38, 40),
+    'name': (41, 71)
+}
+
+INVENTORY_COLUMNS = {
+    'id': (0, 11),
+    'lat': (12, 20),
+    'lon': (21, 30),
+    'element': (31, 35),
+    'first_year': (36, 40),
+    'last_year': (41, 45)
+}
+
+# Inventory columns needed to attach element periods to known stations
+PERIOD_COLUMNS = ('id', 'element', 'first_year', 'last_year')
+
+# GHCN-Daily .dly rows: one station/month/element, then 31 day slots of
+# VALUE (5) MFLAG QFLAG SFLAG
+DLY_COLUMNS = {
+    'id': (0, 11),
+    'year': (11, 15),
+    'month': (15, 17),
+    'element': (17, 21)
+}
+DLY_FIRST_SLOT = 21
+DLY_SLOT_WIDTH = 8
+DLY_DAYS = 31
+DLY_MISSING = -9999
+
+# Files smaller than this are parsed in-process; pool start-up would dominate
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+SPACE = ord(' ')
+NEWLINE = ord('\n')
+CR = ord('\r')
+
+
+def _line_matrix(buf: np.ndarray, width: int) -> np.ndarray:
+    """
+    Arrange a text buffer as a (lines, width) byte matrix
+
+    Files with one fixed line length (the last line may lack its newline)
+    are reshaped without copying; anything else is gathered into a
+    space-padded matrix.
+    """
+    newlines = np.flatnonzero(buf == NEWLINE)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    if starts[-1] == len(buf):
+        starts, ends = starts[:-1], ends[:-1]
+    if len(starts) == 0:
+        return np.zeros((0, width), dtype=np.uint8)
+
+    ends = ends - (buf[np.maximum(ends - 1, 0)] == CR)
+    lengths = ends - starts
+
+    n = len(starts)
+    stride = int(starts[1] - starts[0]) if n > 1 else len(buf)
+    if lengths.min() >= width and len(buf) in (n * stride, n * stride - 1) and \
+            (n == 1 or (np.diff(starts) == stride).all()):
+        rows = buf if len(buf) == n * stride else np.append(buf, np.uint8(NEWLINE))
+        return rows.reshape(n, stride)[:, :width]
+
+    cols = np.arange(width)
+    index = np.minimum(starts[:, None] + cols, len(buf) - 1)
+    return np.where(cols < lengths[:, None], buf[index], SPACE).astype(np.uint8)
+
+
+def _field(matrix: np.ndarray, span: Tuple[int, int]) -> np.ndarray:
+    """Fixed-width column as an 'S' array (one bytes string per line)"""
+    start, end = span
+    return np.ascontiguousarray(matrix[:, start:end]).view(f'S{end - start}').ravel()
+
+
+def _numbers(matrix: np.ndarray, span: Tuple[int, int], dtype, blank=0) -> np.ndarray:
+    """Decode a numeric column; blank cells become `blank`, malformed cells NaN / blank"""
+    start, end = span
+    cells = np.ascontiguousarray(matrix[:, start:end])
+    empty = (cells == SPACE).all(axis=1)
+    cells[empty, -1] = ord('0')
+
+    text = cells.view(f'S{end - start}').ravel()
+    try:
+        values = text.astype(dtype)
+    except ValueError:
+        def convert(cell):
+            try:
+                return float(cell)
+            except ValueError:
+                return np.nan
+        values = np.array([convert(cell) for cell in text])
+        if np.issubdtype(dtype, np.integer):
+            values = np.where(np.isnan(values), blank, values)
+        values = values.astype(dtype)
+
+    values[empty] = blank
+    return values
+
+
+def _well_formed(matrix: np.ndarray, span: Tuple[int, int]) -> np.ndarray:
+    """Rows whose cell in a numeric column parses as a number (blank cells do not)"""
+    start, end = span
+    text = np.ascontiguousarray(matrix[:, start:end]).view(f'S{end - start}').ravel()
+    try:
+        text.astype(np.float64)
+        return np.ones(len(text), dtype=bool)
+    except ValueError:
+        def parses(cell):
+            try:
+                float(cell)
+                return True
+            except ValueError:
+                return False
+        return np.array([parses(cell) for cell in text], dtype=bool)
+
+
+def _read_matrix(filename: str, width: int, byte_range: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Memory-map a file (or a line-aligned byte range of it) and return its (lines, width) byte matrix"""
+    with open(filename, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return np.zeros((0, width), dtype=np.uint8)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            if byte_range is not None:
+                buf = buf[byte_range[0]:byte_range[1]]
+            # Copy out so nothing references the map once it is closed
+            matrix = np.array(_line_matrix(buf, width))
+            del buf
+    return matrix
+
+
+def line_ranges(filename: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into about `parts` byte ranges that start and end on line boundaries
+
+    Returns:
+        Consecutive (start, end) offsets covering the whole file
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(1, parts):
+                target = max(size * i // parts, bounds[-1])
+                newline = mm.find(b'\n', target)
+                if newline < 0:
+                    break
+                if newline + 1 > bounds[-1]:
+                    bounds.append(newline + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _worker_count(filename: str, processes: Optional[int]) -> int:
+    """Processes to use for a file: 1 unless it is big enough to be worth splitting"""
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or os.path.getsize(filename) < PARALLEL_MIN_BYTES:
+        return 1
+    return processes
+
+
+def _merge(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate per-range column dicts in file order"""
+    return {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+
+
+def _parse_parallel(worker, filename: str, processes: int, options: Dict) -> Dict[str, np.ndarray]:
+    ranges = line_ranges(filename, processes)
+    jobs = [(filename, byte_range, options) for byte_range in ranges]
+    with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+        return _merge(list(pool.map(worker, jobs)))
+
+
+def _prefix_mask(matrix: np.ndarray, prefixes: Optional[Iterable[str]]) -> np.ndarray:
+    if prefixes is None:
+        return np.ones(len(matrix), dtype=bool)
+    wanted = np.array([p.encode('ascii') for p in prefixes], dtype='S2')
+    return np.isin(_field(matrix, (0, 2)), wanted)
+
+
+def _station_columns(matrix: np.ndarray, prefixes: Optional[Iterable[str]]) -> Dict[str, np.ndarray]:
+    matrix = matrix[_prefix_mask(matrix, prefixes)]
+    return {
+        'id': _field(matrix, STATION_COLUMNS['id']),
+        'lat': _numbers(matrix, STATION_COLUMNS['lat'], np.float64, blank=np.nan),
+        'lon': _numbers(matrix, STATION_COLUMNS['lon'], np.float64, blank=np.nan),
+        'elevation': _numbers(matrix, STATION_COLUMNS['elevation'], np.float64),
+        'state': _field(matrix, STATION_COLUMNS['state']),
+        'name': _field(matrix, STATION_COLUMNS['name'])
+    }
+
+
+def _stations_part(job) -> Dict[str, np.ndarray]:
+    """Process-pool entry point: one byte range of ghcnd-stations.txt"""
+    filename, byte_range, options = job
+    return _station_columns(_read_matrix(filename, STATION_COLUMNS['name'][1], byte_range), **options)
+
+
+def parse_stations(filename: str, prefixes: Optional[Iterable[str]] = None,
+                   processes: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Decode ghcnd-stations.txt into column arrays
+
+    Args:
+        filename: Path to ghcnd-stations.txt
+        prefixes: Two-letter ID prefixes to keep (None keeps every station)
+        processes: Worker processes (None = CPU count); files under
+                   PARALLEL_MIN_BYTES are always parsed in-process
+
+    Returns:
+        Dictionary of equal-length arrays: 'id' (S11), 'lat', 'lon',
+        'elevation' (float64, blank elevation = 0.0), 'state' (S2) and
+        'name' (S30, space padded)
+    """
+    options = {'prefixes': None if prefixes is None else list(prefixes)}
+    workers = _worker_count(filename, processes)
+    if workers > 1:
+        return _parse_parallel(_stations_part, filename, workers, options)
+    return _station_columns(_read_matrix(filename, STATION_COLUMNS['name'][1]), **options)
+
+
+def _inventory_columns(matrix: np.ndarray, prefixes: Optional[Iterable[str]], elements: Optional[Iterable[str]],
+                       min_last_year: Optional[int], columns: Optional[Iterable[str]]) -> Dict[str, np.ndarray]:
+    # Rows with a malformed year are skipped, as the line-by-line parsers did
+    keep = _prefix_mask(matrix, prefixes)
+    keep &= _well_formed(matrix, INVENTORY_COLUMNS['first_year']) & _well_formed(matrix, INVENTORY_COLUMNS['last_year'])
+    if elements is not None:
+        wanted = np.array([e.encode('ascii') for e in elements], dtype='S4')
+        keep &= np.isin(_field(matrix, INVENTORY_COLUMNS['element']), wanted)
+    matrix = matrix[keep]
+
+    decoders = {
+        'id': lambda: _field(matrix, INVENTORY_COLUMNS['id']),
+        'lat': lambda: _numbers(matrix, INVENTORY_COLUMNS['lat'], np.float64, blank=np.nan),
+        'lon': lambda: _numbers(matrix, INVENTORY_COLUMNS['lon'], np.float64, blank=np.nan),
+        'element': lambda: _field(matrix, INVENTORY_COLUMNS['element']),
+        'first_year': lambda: _numbers(matrix, INVENTORY_COLUMNS['first_year'], np.int16),
+        'last_year': lambda: _numbers(matrix, INVENTORY_COLUMNS['last_year'], np.int16)
+    }
+    wanted_columns = set(INVENTORY_COLUMNS if columns is None else columns)
+    if min_last_year is not None:
+        wanted_columns.add('last_year')
+    inventory = {column: decoder() for column, decoder in decoders.items() if column in wanted_columns}
+
+    if min_last_year is not None:
+        recent = inventory['last_year'] >= min_last_year
+        inventory = {column: values[recent] for column, values in inventory.items()}
+    return inventory
+
+
+def _inventory_part(job) -> Dict[str, np.ndarray]:
+    """Process-pool entry point: one byte range of ghcnd-inventory.txt"""
+    filename, byte_range, options = job
+    return _inventory_columns(_read_matrix(filename, INVENTORY_COLUMNS['last_year'][1], byte_range), **options)
+
+
+def parse_inventory(filename: str, prefixes: Optional[Iterable[str]] = None,
+                    elements: Optional[Iterable[str]] = None,
+                    min_last_year: Optional[int] = None,
+                    columns: Optional[Iterable[str]] = None,
+                    processes: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Decode ghcnd-inventory.txt into column arrays, filtering in bulk
+
+    Args:
+        filename: Path to ghcnd-inventory.txt
+        prefixes: Two-letter ID prefixes to keep (None keeps all)
+        elements: Element codes to keep, e.g. ['SNOW', 'SNWD']
+        min_last_year: Drop periods that ended before this year
+        columns: Columns to decode (default all); skipping lat/lon roughly
+                 halves the decode time
+        processes: Worker processes (None = CPU count); files under
+                   PARALLEL_MIN_BYTES are always parsed in-process
+
+    Returns:
+        Dictionary of equal-length arrays: 'id' (S11), 'lat', 'lon'
+        (float64), 'element' (S4) and 'first_year', 'last_year' (int16);
+        rows with a malformed year are skipped
+    """
+    options = {
+        'prefixes': None if prefixes is None else list(prefixes),
+        'elements': None if elements is None else list(elements),
+        'min_last_year': min_last_year,
+        'columns': None if columns is None else list(columns)
+    }
+    workers = _worker_count(filename, processes)
+    if workers > 1:
+        return _parse_parallel(_inventory_part, filename, workers, options)
+    return _inventory_columns(_read_matrix(filename, INVENTORY_COLUMNS['last_year'][1]), **options)
+
+
+def parse_dly(data: bytes, elements: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Decode the monthly rows of a .dly file (already in memory) in bulk
+
+    Args:
+        data: Contents of one station's .dly file
+        elements: Element codes to keep (None keeps all)
+
+    Returns:
+        Dictionary of row arrays: 'id' (S11), 'year' (int16), 'month'
+        (int8), 'element' (S4), 'values' (rows x 31 int16, raw GHCN units,
+        DLY_MISSING where absent) and 'flagged' (rows x 31 bool, set where
+        the value failed a GHCN quality check); rows with a malformed year
+        or month are skipped
+    """
+    width = DLY_FIRST_SLOT + DLY_DAYS * DLY_SLOT_WIDTH
+    matrix = np.array(_line_matrix(np.frombuffer(data, dtype=np.uint8), width))
+    matrix = matrix[_well_formed(matrix, DLY_COLUMNS['year']) & _well_formed(matrix, DLY_COLUMNS['month'])]
+    if elements is not None:
+        wanted = np.array([e.encode('ascii') for e in elements], dtype='S4')
+        matrix = matrix[np.isin(_field(matrix, DLY_COLUMNS['element']), wanted)]
+
+    slots = matrix[:, DLY_FIRST_SLOT:width].reshape(len(matrix), DLY_DAYS, DLY_SLOT_WIDTH)
+    cells = np.ascontiguousarray(slots[:, :, :5])
+    cells[(cells == SPACE).all(axis=2)] = np.frombuffer(str(DLY_MISSING).encode('ascii'), dtype=np.uint8)
+
+    return {
+        'id': _field(matrix, DLY_COLUMNS['id']),
+        'year': _numbers(matrix, DLY_COLUMNS['year'], np.int16),
+        'month': _numbers(matrix, DLY_COLUMNS['month'], np.int8),
+        'element': _field(matrix, DLY_COLUMNS['element']),
+        'values': cells.view('S5').reshape(len(matrix), DLY_DAYS).astype(np.int16),
+        'flagged': slots[:, :, 6] != SPACE
+    }
+
+
+def decode(column: np.ndarray) -> list:
+    """Bytes column to a list of stripped str (for building JSON records)"""
+    return [value.decode('ascii', errors='ignore').strip() for value in column.tolist()]
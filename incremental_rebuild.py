@@ -0,0 +1,286 @@
+"""
+Incremental NOAA Network Rebuild
+Diffs new GHCN station/inventory files against the previous build's
+fingerprints and recomputes only the stations whose rows changed
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
+
+from ghcn_ingest import (COUNTRY_CONFIG, DEFAULT_RULE, OUTPUT_FILES, RECENT_YEAR, apply_capabilities,
+                         frontend_record, in_frontend, ingest, is_recent, read_inventory, read_stations,
+                         rule_for, write_outputs)
+
+FINGERPRINT_FILE = 'noaa_build_fingerprint.json'
+CHANGELOG_FILE = 'noaa_network_changelog.json'
+FINGERPRINT_VERSION = 1
+
+CAPABILITY_FLAGS = ('has_snow', 'has_snwd', 'has_temp', 'has_precip')
+
+
+def station_fingerprint(station: Dict) -> str:
+    """Digest of a station's stations-file row and all of its inventory rows"""
+    periods = sorted(f"{el}:{p['start']}-{p['end']}" for el, p in station['data_types'].items())
+    row = f"{station['name']}|{station['lat']}|{station['lng']}|{station['elevation']}|{','.join(periods)}"
+    return hashlib.sha1(row.encode('utf-8')).hexdigest()[:16]
+
+
+def rules_fingerprint(config: Dict = None) -> str:
+    """Digest of the resolved country rules that every capability flag depends on"""
+    config = COUNTRY_CONFIG if config is None else config
+    state = {
+        'countries': {prefix: rule_for(prefix, config) for prefix in config},
+        'default': DEFAULT_RULE,
+        'recent_year': RECENT_YEAR
+    }
+    return hashlib.sha1(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def diff_fingerprints(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Station IDs added, removed and changed between two fingerprint maps"""
+    return {
+        'added': sorted(new.keys() - old.keys()),
+        'removed': sorted(old.keys() - new.keys()),
+        'changed': sorted(sid for sid in new.keys() & old.keys() if new[sid] != old[sid])
+    }
+
+
+def _load_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _save_fingerprints(path: str, fingerprints: Dict[str, str], rules: str) -> None:
+    with open(path, 'w') as f:
+        json.dump({
+            'version': FINGERPRINT_VERSION,
+            'built': date.today().isoformat(),
+            'rules': rules,
+            'stations': fingerprints
+        }, f, separators=(',', ':'))
+
+
+def _contribution(station: Optional[Dict], frontend_country: Optional[str]) -> Dict:
+    """What one station adds to each counter in noaa_network_stats.json"""
+    snow = station is not None
+    return {
+        'total_stations': int(frontend_country is not None),
+        'snow_capable': int(snow),
+        'full_capability': int(snow and station['has_temp'] and station['has_precip']),
+        'recent_data': int(snow and is_recent(station)),
+        'country': frontend_country
+    }
+
+
+def _change_entry(station_id: str, old_snow: Optional[Dict], old_frontend: Optional[Dict],
+                  new_snow: Optional[Dict], new_frontend: Optional[Dict]) -> Dict:
+    """Changelog entry with the flags and frontend membership that changed for a station"""
+    # Stations outside a snow network have no stored flags; they read as False
+    entry = {'id': station_id}
+    for flag in CAPABILITY_FLAGS:
+        old_value = bool(old_snow and old_snow.get(flag))
+        new_value = bool(new_snow and new_snow.get(flag))
+        if old_value != new_value:
+            entry[flag] = [old_value, new_value]
+    if (old_frontend is None) != (new_frontend is None):
+        entry['frontend'] = [old_frontend is not None, new_frontend is not None]
+    return entry
+
+
+def _apply_to_stats(stats: Dict, before: Dict, after: Dict) -> None:
+    """Move a station's contribution in the stats counters from before to after"""
+    for key in ('total_stations', 'snow_capable', 'full_capability', 'recent_data'):
+        stats[key] = stats.get(key, 0) - before[key] + after[key]
+
+    by_country = stats.setdefault('by_country', {})
+    if before['country'] is not None:
+        by_country[before['country']] = by_country.get(before['country'], 0) - 1
+        if by_country[before['country']] <= 0:
+            del by_country[before['country']]
+    if after['country'] is not None:
+        by_country[after['country']] = by_country.get(after['country'], 0) + 1
+
+
+def incremental_rebuild(stations_file: str = 'ghcnd-stations.txt', inventory_file: str = 'ghcnd-inventory.txt',
+                        output_dir: str = '.', config: Dict = None, store=None) -> Dict:
+    """
+    Bring the station artifacts up to date with new GHCN files
+
+    Without a previous fingerprint, or when the resolved country rules
+    changed since it was written, this is a full ingest. Otherwise only
+    added, removed and changed stations get capability flags and frontend
+    membership recomputed, and the stats counters are adjusted in place.
+
+    Args:
+        stations_file: New ghcnd-stations.txt
+        inventory_file: New ghcnd-inventory.txt
+        output_dir: Directory holding the previous build's artifacts
+        config: Country rules (defaults to ghcn_ingest.COUNTRY_CONFIG)
+        store: Optional StationStore updated alongside the JSON files
+
+    Returns:
+        The changelog written to noaa_network_changelog.json
+    """
+    paths = {key: os.path.join(output_dir, name) for key, name in OUTPUT_FILES.items()}
+    fingerprint_path = os.path.join(output_dir, FINGERPRINT_FILE)
+    previous = _load_json(fingerprint_path, None)
+    if previous is not None and previous.get('version') != FINGERPRINT_VERSION:
+        previous = None
+    rules = rules_fingerprint(config)
+
+    if previous is None or previous.get('rules') != rules:
+        # Flags of unchanged stations depend on the rules too, so recompute everything
+        result = ingest(stations_file, inventory_file, config)
+        changelog = _full_changelog(result, paths, previous)
+        write_outputs(result, output_dir, store)
+    else:
+        changelog = _apply_diff(stations_file, inventory_file, paths, previous, config, store)
+    _save_fingerprints(fingerprint_path, changelog.pop('fingerprints'), rules)
+
+    changelog['summary'] = {key: len(changelog[key]) for key in ('added', 'removed', 'changed')}
+    with open(os.path.join(output_dir, CHANGELOG_FILE), 'w') as f:
+        json.dump(changelog, f, indent=2)
+    return changelog
+
+
+def _full_changelog(result: Dict, paths: Dict[str, str], previous: Optional[Dict]) -> Dict:
+    """Changelog of a full ingest, diffed against the previous build's artifacts when there is one"""
+    fingerprints = {sid: station_fingerprint(s) for sid, s in result['stations'].items()}
+    changelog = {
+        'generated': date.today().isoformat(),
+        'mode': 'full',
+        'previous_build': None,
+        'added': sorted(fingerprints),
+        'removed': [],
+        'changed': [],
+        'fingerprints': fingerprints
+    }
+    if previous is None:
+        return changelog
+
+    diff = diff_fingerprints(previous['stations'], fingerprints)
+    old_snow = {s['id']: s for s in _load_json(paths['snow'], [])}
+    old_frontend = {s['id']: s for s in _load_json(paths['frontend'], [])}
+    new_snow = {s['id']: s for s in result['snow_stations']}
+    new_frontend = {s['id']: s for s in result['frontend']}
+
+    changed = []
+    rows_changed = set(diff['changed'])
+    for station_id in sorted(previous['stations'].keys() & fingerprints.keys()):
+        entry = _change_entry(station_id, old_snow.get(station_id), old_frontend.get(station_id),
+                              new_snow.get(station_id), new_frontend.get(station_id))
+        if len(entry) > 1 or station_id in rows_changed:
+            changed.append(entry)
+
+    changelog.update({
+        'previous_build': previous.get('built'),
+        'added': diff['added'],
+        'removed': diff['removed'],
+        'changed': changed
+    })
+    return changelog
+
+
+def _apply_diff(stations_file: str, inventory_file: str, paths: Dict[str, str], previous: Dict,
+                config: Optional[Dict], store) -> Dict:
+    """Recompute touched stations and rewrite the artifacts from the previous build"""
+    stations = read_stations(stations_file, config)
+    inventory_rows = read_inventory(inventory_file, stations)
+    fingerprints = {sid: station_fingerprint(s) for sid, s in stations.items()}
+    diff = diff_fingerprints(previous['stations'], fingerprints)
+
+    snow = {s['id']: s for s in _load_json(paths['snow'], [])}
+    frontend = {s['id']: s for s in _load_json(paths['frontend'], [])}
+    stats = _load_json(paths['stats'], {})
+
+    changed = []
+    upserts, deletes = [], []
+    for station_id in diff['added'] + diff['changed'] + diff['removed']:
+        old_snow = snow.get(station_id)
+        old_frontend = frontend.get(station_id)
+        before = _contribution(old_snow, old_frontend['country'] if old_frontend else None)
+
+        station = stations.get(station_id)
+        new_frontend = None
+        if station is not None:
+            rule = rule_for(station_id[:2], config)
+            apply_capabilities(station, rule)
+            if in_frontend(station, rule):
+                new_frontend = frontend_record(station)
+
+        if station is not None and station['has_snow']:
+            snow[station_id] = station
+        else:
+            snow.pop(station_id, None)
+            station = None
+
+        if new_frontend is not None:
+            frontend[station_id] = new_frontend
+            upserts.append(new_frontend)
+        elif frontend.pop(station_id, None) is not None:
+            deletes.append(station_id)
+
+        _apply_to_stats(stats, before, _contribution(station, new_frontend['country'] if new_frontend else None))
+
+        if station_id in previous['stations'] and station_id in fingerprints:
+            changed.append(_change_entry(station_id, old_snow, old_frontend, station, new_frontend))
+
+    stats['by_country'] = dict(sorted(stats.get('by_country', {}).items(), key=lambda item: -item[1]))
+    stats['stations_parsed'] = len(stations)
+    stats['inventory_rows'] = inventory_rows
+    stats['last_updated'] = date.today().isoformat()
+
+    snow_stations = [snow[sid] for sid in sorted(snow)]
+    by_country = defaultdict(list)
+    for station in snow_stations:
+        by_country[station['country']].append(station)
+
+    with open(paths['snow'], 'w') as f:
+        json.dump(snow_stations, f, indent=2)
+    with open(paths['by_country'], 'w') as f:
+        json.dump(dict(by_country), f, indent=2)
+    with open(paths['stats'], 'w') as f:
+        json.dump(stats, f, indent=2)
+
+    if store is not None:
+        store.upsert(upserts)
+        store.delete(deletes)
+        store.export_frontend(paths['frontend'])
+    else:
+        with open(paths['frontend'], 'w') as f:
+            json.dump([frontend[sid] for sid in sorted(frontend)], f, separators=(',', ':'))
+
+    return {
+        'generated': date.today().isoformat(),
+        'mode': 'incremental',
+        'previous_build': previous.get('built'),
+        'added': diff['added'],
+        'removed': diff['removed'],
+        'changed': changed,
+        'fingerprints': fingerprints
+    }
+
+
+def main():
+    print("=" * 60)
+    print("INCREMENTAL NOAA NETWORK REBUILD")
+    print("=" * 60)
+
+    print("\n[*] Diffing ghcnd-stations.txt / ghcnd-inventory.txt against last build...")
+    changelog = incremental_rebuild()
+    summary = changelog['summary']
+
+    print(f"    [OK] Mode: {changelog['mode']}")
+    print(f"    [OK] Added: {summary['added']:,}  Removed: {summary['removed']:,}  Changed: {summary['changed']:,}")
+    print(f"\n[SAVED] {CHANGELOG_FILE}")
+    print(f"[SAVED] {FINGERPRINT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
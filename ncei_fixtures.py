@@ -0,0 +1,181 @@
+"""
+NCEI Record/Replay Fixtures
+Captures every NCEI data-service response and station lookup a test suite
+makes into a versioned, gzip-compressed fixture, then serves them back with
+no network access - so the accuracy suites run offline in seconds and check
+the summary math against the recorded results
+
+Mode comes from the NCEI_FIXTURES environment variable:
+    record  run against the live service and (re)write the fixture
+    replay  serve only from the fixture; any unrecorded call is an error
+    live    no fixtures at all
+    (unset) replay when the suite's fixture exists; otherwise live when run
+            as a script, and the test is skipped under pytest
+"""
+
+import gzip
+import json
+import os
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from noaa_data_fetcher import NOAADataFetcher
+
+DEFAULT_FIXTURE_DIR = 'fixtures'
+FIXTURE_VERSION = 1
+MODES = ('record', 'replay', 'live')
+
+
+def _normalize(value):
+    """JSON round trip, so recorded and freshly computed values compare alike"""
+    return json.loads(json.dumps(value))
+
+
+class _RecordedCalls:
+    """Proxy that records (or replays) the return values of an object's method calls"""
+
+    def __init__(self, session: 'FixtureSession', name: str, target=None):
+        self._session = session
+        self._name = name
+        self._target = target
+
+    def __getattr__(self, method: str) -> Callable:
+        def call(*args, **kwargs):
+            key = json.dumps([self._name, method, args, kwargs], sort_keys=True)
+            if self._session.mode == 'replay':
+                return self._session._replay('lookups', key)
+            result = getattr(self._target, method)(*args, **kwargs)
+            self._session.fixture['lookups'][key] = _normalize(result)
+            return result
+        return call
+
+
+class FixtureSession:
+    """
+    One suite's fixture
+
+    Usage:
+        session = FixtureSession('climate_accuracy')
+        matcher = session.lookups('matcher', StationMatcher)
+        fetcher = session.fetcher()
+        ...
+        session.finish(results)
+    """
+
+    def __init__(self, suite: str, directory: str = DEFAULT_FIXTURE_DIR, mode: Optional[str] = None):
+        """
+        Args:
+            suite: Fixture name (the file is <directory>/<suite>.json.gz)
+            directory: Fixture directory
+            mode: 'record', 'replay' or 'live' (defaults to $NCEI_FIXTURES,
+                  then replay if the fixture exists, else live)
+
+        Raises:
+            pytest.skip.Exception: Under pytest, no fixture and no explicit
+                mode - the suite would otherwise go to the network
+        """
+        self.suite = suite
+        self.path = os.path.join(directory, f"{suite}.json.gz")
+        mode = mode or os.environ.get('NCEI_FIXTURES')
+        if mode is None:
+            if os.path.exists(self.path):
+                mode = 'replay'
+            elif 'PYTEST_CURRENT_TEST' in os.environ:
+                import pytest
+                pytest.skip(f"No NCEI fixture at {self.path}; record one with NCEI_FIXTURES=record")
+            else:
+                mode = 'live'
+        if mode not in MODES:
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.mode = mode
+
+        if mode == 'replay':
+            self.fixture = load_fixture(self.path)
+        else:
+            self.fixture = {
+                'version': FIXTURE_VERSION,
+                'suite': suite,
+                'recorded': date.today().isoformat(),
+                'requests': {},
+                'lookups': {},
+                'results': None
+            }
+        print(f"[INFO] NCEI fixtures: {mode} ({self.path})")
+
+    def _replay(self, section: str, key: str):
+        if key not in self.fixture[section]:
+            raise KeyError(f"No recorded {section[:-1]} in {self.path} for {key}; "
+                           f"re-record with NCEI_FIXTURES=record")
+        return self.fixture[section][key]
+
+    def fetcher(self, **kwargs) -> NOAADataFetcher:
+        """NOAADataFetcher whose data-service requests are recorded or replayed"""
+        fetcher = NOAADataFetcher(**kwargs)
+        if self.mode == 'live':
+            return fetcher
+
+        live_request = fetcher._request
+
+        def request(dataset: str, station_id: str, start_date: str, end_date: str,
+                    data_types: List[str]) -> List[Dict]:
+            key = '|'.join([dataset, station_id, start_date, end_date, ','.join(data_types)])
+            if self.mode == 'replay':
+                response = self._replay('requests', key)
+                if 'error' in response:
+                    raise requests.exceptions.RequestException(response['error'])
+                return response['records']
+
+            try:
+                records = live_request(dataset, station_id, start_date, end_date, data_types)
+            except requests.exceptions.RequestException as e:
+                self.fixture['requests'][key] = {'error': str(e)}
+                raise
+            self.fixture['requests'][key] = {'records': records}
+            return records
+
+        fetcher._request = request
+        return fetcher
+
+    def lookups(self, name: str, factory: Callable):
+        """
+        An object (e.g. a StationMatcher) whose method results are recorded
+
+        In replay mode factory is never called, so station files it would
+        load need not exist.
+        """
+        if self.mode == 'live':
+            return factory()
+        return _RecordedCalls(self, name, factory() if self.mode == 'record' else None)
+
+    def finish(self, results) -> None:
+        """
+        Record the suite's results, or check them against the recording
+
+        Raises:
+            AssertionError: Replayed results differ from the recorded ones
+        """
+        if self.mode == 'record':
+            self.fixture['results'] = _normalize(results)
+            save_fixture(self.path, self.fixture)
+            print(f"[SAVED] {self.path} ({len(self.fixture['requests'])} requests, "
+                  f"{len(self.fixture['lookups'])} lookups)")
+        elif self.mode == 'replay':
+            assert _normalize(results) == self.fixture['results'], \
+                f"Results differ from those recorded in {self.path} on {self.fixture['recorded']}"
+
+
+def save_fixture(path: str, fixture: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # mtime=0 keeps re-recordings of identical data byte-identical
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        f.write(json.dumps(fixture, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+def load_fixture(path: str) -> Dict:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        fixture = json.load(f)
+    if fixture.get('version') != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version in {path}: {fixture.get('version')}")
+    return fixture
@@ -0,0 +1,436 @@
+"""
+NCEI Stand-In Server
+Local HTTP server implementing the access/services/data/v1 contract used by
+NOAADataFetcher (daily-summaries, plus global-summary-of-the-month/year
+derived from the same daily data) so tests and load runs work offline
+
+Data comes from any daily backend with daily_series() (DlyStore,
+MemmapStore, ObservationWarehouse) or from SyntheticSource. Latency, error
+injection and throttling follow a named profile, seeded for reproducibility.
+
+Point the fetcher at it with NOAADataFetcher(base_url=server.url) or the
+NCEI_BASE_URL environment variable.
+"""
+
+import csv
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from aggregate_summaries import MONTHLY_DATASET, YEARLY_DATASET
+from daily_series import DEFAULT_ELEMENTS, STANDARD_DECIMALS
+
+SERVICE_PATH = '/access/services/data/v1'
+DAILY_DATASET = 'daily-summaries'
+DEFAULT_PORT = 8765
+
+# latency: seconds per request, jitter: extra uniform 0..jitter seconds,
+# per_kb: seconds per KB of response, error_rate: fraction answered 503,
+# rate / burst: token bucket in requests per second (None = unlimited)
+PROFILES = {
+    'fast': {'latency': 0.0, 'jitter': 0.0, 'per_kb': 0.0, 'error_rate': 0.0, 'rate': None, 'burst': None},
+    'wan': {'latency': 0.25, 'jitter': 0.15, 'per_kb': 0.002, 'error_rate': 0.0, 'rate': None, 'burst': None},
+    'flaky': {'latency': 0.05, 'jitter': 0.05, 'per_kb': 0.0, 'error_rate': 0.2, 'rate': None, 'burst': None},
+    'throttled': {'latency': 0.05, 'jitter': 0.0, 'per_kb': 0.0, 'error_rate': 0.0, 'rate': 5.0, 'burst': 5},
+}
+
+# Standard -> metric units as the service reports them: °C, mm
+METRIC_UNITS = {
+    'TMAX': (lambda v: (v - 32.0) / 1.8, 1),
+    'TMIN': (lambda v: (v - 32.0) / 1.8, 1),
+    'TAVG': (lambda v: (v - 32.0) / 1.8, 1),
+    'PRCP': (lambda v: v * 25.4, 1),
+    'SNOW': (lambda v: v * 25.4, 0),
+    'SNWD': (lambda v: v * 25.4, 0),
+}
+
+
+def _unit_hash(keys: np.ndarray, salt: int) -> np.ndarray:
+    """Deterministic uniforms in [0, 1) per key (splitmix64), independent of the range requested"""
+    with np.errstate(over='ignore'):
+        x = keys.astype(np.uint64) + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class SyntheticSource:
+    """
+    Plausible daily weather for any station ID, in standard units
+
+    Each station gets its own climate from a hash of its ID, and each day's
+    values depend only on the station and date, so overlapping requests
+    always agree.
+    """
+
+    def __init__(self, stations: Optional[List[str]] = None, missing_rate: float = 0.02):
+        """
+        Args:
+            stations: Station IDs that exist (None = every ID)
+            missing_rate: Fraction of days with no observation
+        """
+        self.stations = None if stations is None else set(stations)
+        self.missing_rate = missing_rate
+
+    def daily_series(self, station_id: str, start_date: str, end_date: str,
+                     data_types: Optional[List[str]] = None) -> Dict:
+        if self.stations is not None and station_id not in self.stations:
+            raise KeyError(f"Station {station_id} is not in the synthetic source")
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+
+        dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+        days = dates.astype(np.int64)
+        seed = zlib.crc32(station_id.encode('ascii'))
+        climate = _unit_hash(np.array([0, 1]), seed)
+        u = [_unit_hash(days, seed + k) for k in range(5)]
+
+        season = (dates - dates.astype('datetime64[Y]')).astype(np.int64) / 365.25
+        tmax = np.round(40 + 25 * climate[0] + (18 + 10 * climate[1]) * np.sin(2 * np.pi * (season - 0.29))
+                        + (u[0] - 0.5) * 16)
+        prcp = np.round(np.where(u[2] < 0.3, -np.log1p(-u[3]) * 0.25, 0.0), 2)
+        snow = np.round(np.where(tmax <= 34, prcp * 10, 0.0), 1)
+        generated = {
+            'TMAX': tmax,
+            'TMIN': np.round(tmax - 12 - u[1] * 10),
+            'PRCP': prcp,
+            'SNOW': snow,
+            'SNWD': np.round(np.where(tmax <= 32, (32 - tmax) * 0.5 + snow, 0.0), 1),
+        }
+
+        missing = u[4] < self.missing_rate
+        values = {}
+        for element in data_types:
+            column = generated.get(element, np.full(len(dates), np.nan)).copy()
+            column[missing] = np.nan
+            values[element] = column
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'units': 'standard',
+            'dates': dates,
+            'values': values
+        }
+
+
+def _format(value: float, decimals: int) -> str:
+    return f"{value:.{decimals}f}"
+
+
+def daily_rows(series: Dict, data_types: List[str], units: str = 'standard') -> List[Dict]:
+    """Service records ({'DATE', 'STATION', element: 'value'}) for days with any requested data"""
+    columns = []
+    for element in data_types:
+        values = series['values'][element]
+        decimals = STANDARD_DECIMALS.get(element, 1)
+        if units == 'metric' and element in METRIC_UNITS:
+            convert, decimals = METRIC_UNITS[element]
+            values = convert(values)
+        columns.append((element, values.tolist(), decimals))
+
+    rows = []
+    for i, day in enumerate(series['dates'].astype(str).tolist()):
+        row = {'DATE': day, 'STATION': series['station_id']}
+        for element, values, decimals in columns:
+            if values[i] == values[i]:  # not NaN
+                row[element] = _format(values[i], decimals)
+        if len(row) > 2:
+            rows.append(row)
+    return rows
+
+
+def aggregate_rows(series: Dict, dataset: str, units: str = 'standard') -> List[Dict]:
+    """
+    GSOM ('DATE' YYYY-MM) or GSOY ('DATE' YYYY) records from a standard-unit
+    daily series, reported in standard or metric units (DP01 always counts
+    days with at least 0.01 in)
+    """
+    unit = 'M' if dataset == MONTHLY_DATASET else 'Y'
+    periods = series['dates'].astype(f'datetime64[{unit}]')
+    values = series['values']
+
+    rows = []
+    for period in np.unique(periods):
+        in_period = periods == period
+        row = {'DATE': str(period), 'STATION': series['station_id']}
+        tmax, tmin, prcp, snow = (
+            values[e][in_period & ~np.isnan(values[e])] if e in values else np.zeros(0)
+            for e in ('TMAX', 'TMIN', 'PRCP', 'SNOW')
+        )
+        # (element, daily column, reduction, base element, standard / metric decimals)
+        for element, column, reduce, base, decimals, metric_decimals in (
+            ('TMAX', tmax, np.mean, 'TMAX', 2, 2), ('EMXT', tmax, np.max, 'TMAX', 0, 1),
+            ('TMIN', tmin, np.mean, 'TMIN', 2, 2), ('EMNT', tmin, np.min, 'TMIN', 0, 1),
+            ('PRCP', prcp, np.sum, 'PRCP', 2, 1), ('EMXP', prcp, np.max, 'PRCP', 2, 1),
+            ('SNOW', snow, np.sum, 'SNOW', 1, 0), ('EMSN', snow, np.max, 'SNOW', 1, 0),
+        ):
+            if not len(column):
+                continue
+            # Every conversion is linear, so it commutes with the reduction
+            value = float(reduce(column))
+            if units == 'metric':
+                value, decimals = METRIC_UNITS[base][0](value), metric_decimals
+            row[element] = _format(value, decimals)
+        if len(prcp):
+            row['DP01'] = str(int((prcp >= 0.01).sum()))
+        if len(row) > 2:
+            rows.append(row)
+    return rows
+
+
+def to_csv(rows: List[Dict], data_types: List[str]) -> str:
+    """Quoted CSV with the service's column order: STATION, DATE, then data types"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    header = ['STATION', 'DATE'] + list(data_types)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([row.get(name, '') for name in header])
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'NCEIStub/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stub._record(status, len(body))
+
+    def _error(self, status: int, message: str, headers: Optional[Dict] = None) -> None:
+        body = json.dumps({'errorMessage': message, 'errorCode': status}).encode('utf-8')
+        self._send(status, body, 'application/json', headers)
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != SERVICE_PATH:
+            return self._error(404, f"Unknown path: {url.path}")
+
+        wait = stub._throttle()
+        if wait is not None:
+            return self._error(429, 'Too many requests', {'Retry-After': str(math.ceil(wait))})
+        if stub._inject_error():
+            return self._error(503, 'Service temporarily unavailable')
+
+        try:
+            status, body, content_type = stub.respond(parse_qs(url.query))
+        except ValueError as e:
+            return self._error(400, e.args[0])
+
+        time.sleep(stub._delay(len(body)))
+        self._send(status, body, content_type)
+
+
+class StubNCEIServer:
+    """
+    Background-thread NCEI stand-in
+
+    Usage:
+        with StubNCEIServer(SyntheticSource(), profile='wan') as server:
+            fetcher = NOAADataFetcher(base_url=server.url)
+    """
+
+    def __init__(self, source=None, profile: str = 'fast', port: int = 0, seed: int = 0,
+                 verbose: bool = False, **overrides):
+        """
+        Args:
+            source: Backend with daily_series() (defaults to SyntheticSource())
+            profile: Name in PROFILES
+            port: Port to bind on 127.0.0.1 (0 picks a free port)
+            seed: Seed for jitter and error injection
+            verbose: Log each request
+            **overrides: Profile settings to replace (e.g. error_rate=0.5)
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        unknown = set(overrides) - set(PROFILES[profile])
+        if unknown:
+            raise ValueError(f"Unknown profile settings: {sorted(unknown)}")
+
+        self.source = source or SyntheticSource()
+        self.profile = dict(PROFILES[profile], **overrides)
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = self.profile['burst'] or 0
+        self._last_refill = time.monotonic()
+        self.reset_stats()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{SERVICE_PATH}"
+
+    def start(self) -> 'StubNCEIServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {'requests': 0, 'bytes_sent': 0, 'status': {}}
+
+    def stats(self) -> Dict:
+        """Requests served, response bytes and counts per status code"""
+        with self._lock:
+            return {'requests': self._stats['requests'], 'bytes_sent': self._stats['bytes_sent'],
+                    'status': dict(self._stats['status'])}
+
+    def _record(self, status: int, size: int) -> None:
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['bytes_sent'] += size
+            self._stats['status'][status] = self._stats['status'].get(status, 0) + 1
+
+    def _throttle(self) -> Optional[float]:
+        """Take a token; returns seconds until one is available when the bucket is empty"""
+        rate = self.profile['rate']
+        if rate is None:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.profile['burst'], self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / rate
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.profile['error_rate']
+
+    def _delay(self, size: int) -> float:
+        with self._lock:
+            jitter = self._rng.random() * self.profile['jitter']
+        return self.profile['latency'] + jitter + self.profile['per_kb'] * size / 1024
+
+    def respond(self, query: Dict[str, List[str]]) -> Tuple[int, bytes, str]:
+        """
+        Build a response for parsed query parameters
+
+        Returns:
+            (status, body bytes, content type); raises ValueError for
+            invalid parameters
+        """
+        params = {key: values[-1] for key, values in query.items()}
+        for required in ('dataset', 'stations', 'startDate', 'endDate'):
+            if not params.get(required):
+                raise ValueError(f"Missing required parameter: {required}")
+
+        dataset = params['dataset']
+        if dataset not in (DAILY_DATASET, MONTHLY_DATASET, YEARLY_DATASET):
+            raise ValueError(f"Unsupported dataset: {dataset}")
+        units = params.get('units', 'metric')
+        if units not in ('standard', 'metric'):
+            raise ValueError(f"Unsupported units: {units}")
+        output = params.get('format', 'csv')
+        if output not in ('json', 'csv'):
+            raise ValueError(f"Unsupported format: {output}")
+
+        try:
+            start, end = np.datetime64(params['startDate'][:10], 'D'), np.datetime64(params['endDate'][:10], 'D')
+        except ValueError:
+            raise ValueError("startDate and endDate must be YYYY-MM-DD")
+        if end < start:
+            raise ValueError("endDate is before startDate")
+
+        requested = [t for t in params.get('dataTypes', '').split(',') if t]
+        daily_types = requested or list(DEFAULT_ELEMENTS)
+        if dataset != DAILY_DATASET:
+            # Aggregates derive from the base daily elements
+            daily_types = list(DEFAULT_ELEMENTS)
+
+        rows = []
+        for station_id in [s for s in params['stations'].split(',') if s]:
+            try:
+                series = self.source.daily_series(station_id, str(start), str(end), daily_types)
+            except KeyError:
+                continue    # unknown stations are simply absent, as from the live service
+            if dataset == DAILY_DATASET:
+                rows.extend(daily_rows(series, daily_types, units))
+            else:
+                rows.extend(aggregate_rows(series, dataset, units))
+
+        if dataset != DAILY_DATASET and requested:
+            keep = set(requested) | {'DATE', 'STATION'}
+            rows = [row for row in ({k: v for k, v in r.items() if k in keep} for r in rows) if len(row) > 2]
+        columns = requested or sorted({k for r in rows for k in r} - {'DATE', 'STATION'})
+
+        if output == 'json':
+            return 200, json.dumps(rows).encode('utf-8'), 'application/json'
+        return 200, to_csv(rows, columns).encode('utf-8'), 'text/csv'
+
+
+def main():
+    print("=" * 60)
+    print("NCEI STAND-IN SERVER")
+    print("=" * 60)
+
+    # Optional arguments: profile name, port
+    profile = sys.argv[1] if len(sys.argv) > 1 else 'fast'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+
+    source = SyntheticSource()
+    try:
+        from dly_ingest import DEFAULT_STORE_DIR, DlyStore
+        source = DlyStore(DEFAULT_STORE_DIR)
+        print(f"\n[*] Serving {len(source.index['stations']):,} stations from {DEFAULT_STORE_DIR}/")
+    except (OSError, ValueError):
+        print("\n[*] No daily store found; serving synthetic data for any station ID")
+
+    server = StubNCEIServer(source, profile=profile, port=port, verbose=True)
+    print(f"    [OK] Profile '{profile}': {PROFILES[profile]}")
+    print(f"    [OK] Listening on {server.url}")
+    print(f"\n[INFO] export NCEI_BASE_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,20 +3,56 @@ NOAA Data Fetcher
 Fetches historical weather data directly from NOAA NCEI API
 """
 
+import os
 import requests
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+from aggregate_summaries import (AGGREGATE_ELEMENTS, MONTHLY_DATASET, YEARLY_DATASET,
+                                 monthly_normals, plan_summary, summarize_aggregates, year_complete)
+from storm_events import extract_snow_events
+
+# Late reports and quality-control revisions keep arriving for recent days;
+# summaries ending inside this window are recomputed rather than cached
+PUBLICATION_LAG_DAYS = 30
+
 class NOAADataFetcher:
     """Fetch weather data from NOAA NCEI"""
 
     BASE_URL = "https://www.ncei.noaa.gov/access/services/data/v1"
 
-    def __init__(self):
-        """Initialize NOAA data fetcher"""
+    def __init__(self, backend=None, archive=None, summary_cache=None, aggregate_cache=None,
+                 base_url: Optional[str] = None):
+        """
+        Initialize NOAA data fetcher
+
+        Args:
+            backend: Optional local data source with daily_records() and
+                     daily_series() (dly_ingest.DlyStore or
+                     observation_warehouse.ObservationWarehouse); None uses
+                     the NCEI web service
+            archive: Optional store with write_records() that keeps every
+                     successful web-service fetch (e.g. ObservationWarehouse)
+            summary_cache: Optional summary_cache.SummaryCache for monthly
+                           and yearly summaries
+            aggregate_cache: Optional summary_cache.AggregateCache for GSOM /
+                             GSOY records
+            base_url: Data service URL (defaults to $NCEI_BASE_URL, then
+                      BASE_URL); e.g. an ncei_stub_server.StubNCEIServer
+        """
+        self.backend = backend
+        self.archive = archive
+        self.summary_cache = summary_cache
+        self.aggregate_cache = aggregate_cache
+        self.base_url = base_url or os.environ.get('NCEI_BASE_URL') or self.BASE_URL
         print("[OK] NOAA Data Fetcher initialized")
-        print("[INFO] Using NOAA NCEI Data API v1 (no API key required)")
+        if backend is None and self.base_url != self.BASE_URL:
+            print(f"[INFO] Using NCEI-compatible service at {self.base_url}")
+        elif backend is None:
+            print("[INFO] Using NOAA NCEI Data API v1 (no API key required)")
+        else:
+            print(f"[INFO] Using local backend: {type(backend).__name__}")
 
     def fetch_daily_data(self, station_id: str, start_date: str, end_date: str,
                          data_types: Optional[List[str]] = None) -> Dict:
@@ -36,24 +72,17 @@ class NOAADataFetcher:
         if data_types is None:
             data_types = ['TMAX', 'TMIN', 'PRCP', 'SNOW', 'SNWD']
 
-        params = {
-            'dataset': 'daily-summaries',
-            'stations': station_id,
-            'startDate': start_date,
-            'endDate': end_date,
-            'dataTypes': ','.join(data_types),
-            'format': 'json',
-            'units': 'standard'  # US standard units
-        }
+        if self.backend is not None:
+            return self._fetch_local(station_id, start_date, end_date, data_types)
 
         try:
             print(f"[*] Fetching data for {station_id} ({start_date} to {end_date})...")
-            response = requests.get(self.BASE_URL, params=params, timeout=60)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._request('daily-summaries', station_id, start_date, end_date, data_types)
             print(f"    [OK] Retrieved {len(data)} records")
 
+            if self.archive is not None and data:
+                self.archive.write_records(station_id, data)
+
             return {
                 'station_id': station_id,
                 'start_date': start_date,
@@ -73,7 +102,191 @@ class NOAADataFetcher:
                 'error': str(e)
             }
 
-    def fetch_monthly_summary(self, station_id: str, year: int, month: int) -> Dict:
+    def _request(self, dataset: str, station_id: str, start_date: str, end_date: str,
+                 data_types: List[str]) -> List[Dict]:
+        """One NCEI data service request in standard units; raises requests.RequestException"""
+        params = {
+            'dataset': dataset,
+            'stations': station_id,
+            'startDate': start_date,
+            'endDate': end_date,
+            'dataTypes': ','.join(data_types),
+            'format': 'json',
+            'units': 'standard'  # US standard units
+        }
+        response = requests.get(self.base_url, params=params, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_daily_series(self, station_id: str, start_date: str, end_date: str,
+                           data_types: Optional[List[str]] = None) -> Dict:
+        """
+        Fetch daily data as typed NumPy arrays
+
+        Args:
+            station_id: NOAA station ID
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            data_types: List of data types to fetch (defaults as fetch_daily_data)
+
+        Returns:
+            Dense daily series (see daily_series.records_to_series), with
+            'error' set if the fetch failed
+        """
+        # NumPy is only needed by the analytics paths, not plain fetching
+        from daily_series import DEFAULT_ELEMENTS, records_to_series
+
+        if self.backend is not None:
+            try:
+                return self.backend.daily_series(station_id, start_date, end_date, data_types or DEFAULT_ELEMENTS)
+            except KeyError as e:
+                series = records_to_series([], start_date, end_date, data_types or DEFAULT_ELEMENTS, station_id)
+                series['error'] = e.args[0]
+                return series
+
+        data = self.fetch_daily_data(station_id, start_date, end_date, data_types)
+        series = records_to_series(data['records'], start_date, end_date,
+                                   data_types or DEFAULT_ELEMENTS, station_id)
+        if 'error' in data:
+            series['error'] = data['error']
+
+        return series
+
+    def _fetch_local(self, station_id: str, start_date: str, end_date: str, data_types: List[str]) -> Dict:
+        """fetch_daily_data from the local backend (same result shape as the API)"""
+        try:
+            records = self.backend.daily_records(station_id, start_date, end_date, data_types)
+        except KeyError as e:
+            print(f"    [ERROR] {e.args[0]}")
+            return {
+                'station_id': station_id,
+                'start_date': start_date,
+                'end_date': end_date,
+                'records': [],
+                'record_count': 0,
+                'error': e.args[0]
+            }
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'records': records,
+            'record_count': len(records)
+        }
+
+    def fetch_monthly_aggregates(self, station_id: str, start_year: int, end_year: int) -> Dict:
+        """
+        Fetch Global Summary of the Month records (one per station-month)
+
+        Args:
+            station_id: NOAA station ID
+            start_year: First year
+            end_year: Last year (inclusive)
+
+        Returns:
+            Dictionary with 'records' ('DATE' is YYYY-MM), shaped like
+            fetch_daily_data
+        """
+        return self._fetch_aggregates(MONTHLY_DATASET, station_id, start_year, end_year)
+
+    def fetch_yearly_aggregates(self, station_id: str, start_year: int, end_year: int) -> Dict:
+        """Fetch Global Summary of the Year records ('DATE' is YYYY); see fetch_monthly_aggregates"""
+        return self._fetch_aggregates(YEARLY_DATASET, station_id, start_year, end_year)
+
+    def _fetch_aggregates(self, dataset: str, station_id: str, start_year: int, end_year: int) -> Dict:
+        """GSOM/GSOY records, requesting only the years missing from the aggregate cache"""
+        result = {
+            'station_id': station_id,
+            'start_date': f"{start_year}-01-01",
+            'end_date': f"{end_year}-12-31",
+            'dataset': dataset
+        }
+        years = {}
+        if self.aggregate_cache is not None:
+            years = self.aggregate_cache.get_years(dataset, station_id, start_year, end_year)
+        missing = [year for year in range(start_year, end_year + 1) if year not in years]
+
+        if missing:
+            try:
+                print(f"[*] Fetching {dataset} for {station_id} ({missing[0]} to {missing[-1]})...")
+                data = self._request(dataset, station_id, f"{missing[0]}-01-01", f"{missing[-1]}-12-31",
+                                     AGGREGATE_ELEMENTS)
+                print(f"    [OK] Retrieved {len(data)} records")
+            except requests.exceptions.RequestException as e:
+                print(f"    [ERROR] Failed to fetch data: {e}")
+                result.update({'records': [], 'record_count': 0, 'error': str(e)})
+                return result
+
+            fetched = {year: [] for year in missing}
+            for record in data:
+                fetched.setdefault(int(record['DATE'][:4]), []).append(record)
+            years.update(fetched)
+
+            # Partial years (the current one, or months NCEI has yet to publish) still change
+            if self.aggregate_cache is not None:
+                complete = {
+                    year: records for year, records in fetched.items()
+                    if year < datetime.now().year and year_complete(dataset, records)
+                }
+                self.aggregate_cache.put_years(dataset, station_id, complete)
+
+        records = [record for year in range(start_year, end_year + 1) for record in years.get(year, [])]
+        result.update({'records': records, 'record_count': len(records)})
+        return result
+
+    def summarize(self, station_id: str, start_date: str, end_date: str,
+                  fields: Optional[List[str]] = None) -> Dict:
+        """
+        Summary over start_date..end_date (inclusive) from the cheapest source
+
+        When only monthly or annual totals are needed (fields all in
+        aggregate_summaries.AGGREGATE_FIELDS) and the range is whole months,
+        the summary comes from GSOM/GSOY: 12 records a year instead of 365.
+
+        Args:
+            station_id: NOAA station ID
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            fields: Summary fields needed as 'section.key', e.g.
+                    'snowfall.total' (None = the full daily summary)
+
+        Returns:
+            Summary statistics; aggregate summaries hold only the requested
+            fields plus 'source'. Returns the fetch result (with empty
+            'records') when there is no data.
+        """
+        plan = plan_summary(start_date, end_date, fields, local=self.backend is not None)
+        if plan == 'daily':
+            return self._summarize(station_id, start_date, end_date)
+
+        fetch = self.fetch_yearly_aggregates if plan == 'yearly' else self.fetch_monthly_aggregates
+        data = fetch(station_id, int(start_date[:4]), int(end_date[:4]))
+        if not data['records']:
+            return data
+        return summarize_aggregates(data['records'], start_date, end_date, fields)
+
+    def fetch_monthly_normals(self, station_id: str, start_year: int, end_year: int) -> Dict:
+        """
+        Calendar-month normals (e.g. 1991-2020) from GSOM records
+
+        Returns:
+            Dictionary with 'months' (see aggregate_summaries.monthly_normals),
+            or the fetch result (with empty 'records') when there is no data
+        """
+        data = self.fetch_monthly_aggregates(station_id, start_year, end_year)
+        if not data['records']:
+            return data
+        return {
+            'station_id': station_id,
+            'start_year': start_year,
+            'end_year': end_year,
+            'source': 'gsom',
+            'months': monthly_normals(data['records'])
+        }
+
+    def fetch_monthly_summary(self, station_id: str, year: int, month: int,
+                              fields: Optional[List[str]] = None) -> Dict:
         """
         Fetch monthly weather summary
 
@@ -81,6 +294,8 @@ class NOAADataFetcher:
             station_id: NOAA station ID
             year: Year (YYYY)
             month: Month (1-12)
+            fields: Summary fields needed (see summarize); monthly totals
+                    alone come from GSOM instead of daily records
 
         Returns:
             Monthly summary statistics
@@ -94,27 +309,31 @@ class NOAADataFetcher:
         else:
             next_month = f"{year}-{month+1:02d}-01"
 
-        # Fetch data
-        data = self.fetch_daily_data(station_id, start_date, next_month)
+        # Fetch data and calculate summary statistics
+        if fields is None:
+            summary = self._summarize(station_id, start_date, next_month)
+        else:
+            month_end = datetime.strptime(next_month, '%Y-%m-%d') - timedelta(days=1)
+            summary = self.summarize(station_id, start_date, month_end.strftime('%Y-%m-%d'), fields)
 
-        if not data['records']:
-            return data
+        if 'records' in summary:
+            return summary
 
-        # Calculate summary statistics
-        summary = self._calculate_summary(data['records'])
         summary['station_id'] = station_id
         summary['year'] = year
         summary['month'] = month
 
         return summary
 
-    def fetch_yearly_summary(self, station_id: str, year: int) -> Dict:
+    def fetch_yearly_summary(self, station_id: str, year: int, fields: Optional[List[str]] = None) -> Dict:
         """
         Fetch yearly weather summary
 
         Args:
             station_id: NOAA station ID
             year: Year (YYYY)
+            fields: Summary fields needed (see summarize); annual totals
+                    alone come from GSOY instead of daily records
 
         Returns:
             Yearly summary statistics
@@ -122,13 +341,11 @@ class NOAADataFetcher:
         start_date = f"{year}-01-01"
         end_date = f"{year}-12-31"
 
-        data = self.fetch_daily_data(station_id, start_date, end_date)
+        summary = self.summarize(station_id, start_date, end_date, fields)
 
-        if not data['records']:
-            return data
+        if 'records' in summary:
+            return summary
 
-        # Calculate summary statistics
-        summary = self._calculate_summary(data['records'])
         summary['station_id'] = station_id
         summary['year'] = year
 
@@ -161,6 +378,48 @@ class NOAADataFetcher:
 
         return summary
 
+    def _summarize(self, station_id: str, start_date: str, end_date: str) -> Dict:
+        """
+        _calculate_summary over a date range
+
+        Cached summaries are reused; only ranges ending more than
+        PUBLICATION_LAG_DAYS ago are cached. Backends with summary()
+        (station_memmap.MemmapStore) reduce their arrays directly; otherwise
+        daily records are fetched. Returns the fetch_daily_data result (with
+        empty 'records') when there is no data.
+        """
+        if self.summary_cache is not None:
+            cached = self.summary_cache.get(station_id, start_date, end_date)
+            if cached is not None:
+                return cached
+
+        summary = self._compute_summary(station_id, start_date, end_date)
+        settled = (datetime.now() - timedelta(days=PUBLICATION_LAG_DAYS)).strftime('%Y-%m-%d')
+        if self.summary_cache is not None and 'records' not in summary and end_date < settled:
+            self.summary_cache.put(station_id, start_date, end_date, summary)
+        return summary
+
+    def _compute_summary(self, station_id: str, start_date: str, end_date: str) -> Dict:
+        if self.backend is not None and hasattr(self.backend, 'summary'):
+            empty = {
+                'station_id': station_id,
+                'start_date': start_date,
+                'end_date': end_date,
+                'records': [],
+                'record_count': 0
+            }
+            try:
+                summary = self.backend.summary(station_id, start_date, end_date)
+            except KeyError as e:
+                empty['error'] = e.args[0]
+                return empty
+            return empty if summary is None else summary
+
+        data = self.fetch_daily_data(station_id, start_date, end_date)
+        if not data['records']:
+            return data
+        return self._calculate_summary(data['records'])
+
     def _calculate_summary(self, records: List[Dict]) -> Dict:
         """Calculate summary statistics from daily records"""
 
@@ -196,37 +455,21 @@ class NOAADataFetcher:
     def _calculate_snow_summary(self, records: List[Dict]) -> Dict:
         """Calculate snow-specific statistics"""
 
-        # Convert string values to float
-        snow = [float(r['SNOW']) for r in records if 'SNOW' in r and r['SNOW'] is not None and r['SNOW'] != '']
         snow_depth = [float(r['SNWD']) for r in records if 'SNWD' in r and r['SNWD'] is not None and r['SNWD'] != '']
 
-        # Find snow events (days with measurable snow)
-        snow_events = []
-        for r in records:
-            if 'SNOW' in r and r['SNOW'] and r['SNOW'] != '':
-                snow_amt = float(r['SNOW'])
-                if snow_amt > 0:
-                    snow_events.append({
-                        'date': r['DATE'],
-                        'amount': snow_amt
-                    })
-
-        # Sort by amount
-        snow_events.sort(key=lambda x: x['amount'], reverse=True)
+        # Single pass: top 10 snow days, bucket counts and merged storm events
+        events = extract_snow_events(records, top_k=10)
 
         summary = {
-            'total_snowfall': round(sum(snow), 1) if snow else 0,
-            'days_with_snow': len([s for s in snow if s > 0]),
+            'total_snowfall': round(events['total'], 1) if events['days_reported'] else 0,
+            'days_with_snow': events['days_with_snow'],
             'avg_snow_depth': round(sum(snow_depth) / len(snow_depth), 1) if snow_depth else None,
             'max_snow_depth': max(snow_depth) if snow_depth else None,
-            'biggest_storms': snow_events[:10],  # Top 10 snow events
-            'snow_days_breakdown': {
-                'trace': len([s for s in snow if s > 0 and s < 0.1]),
-                'light (0.1-2")': len([s for s in snow if 0.1 <= s < 2]),
-                'moderate (2-6")': len([s for s in snow if 2 <= s < 6]),
-                'heavy (6-12")': len([s for s in snow if 6 <= s < 12]),
-                'extreme (12"+)': len([s for s in snow if s >= 12])
-            }
+            'max_daily': events['max_daily'],
+            'biggest_storms': events['biggest_days'],  # Top 10 snow days
+            'storm_events': events['biggest_storms'],  # Top 10 multi-day storms by total
+            'storm_count': events['storm_count'],
+            'snow_days_breakdown': events['breakdown']
         }
 
         return summary
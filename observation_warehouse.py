@@ -0,0 +1,293 @@
+"""
+Daily Observation Warehouse
+Persists daily observations as Parquet files partitioned by country, station
+and year, so multi-station / multi-year queries read only the partitions and
+row groups they need - no network access
+"""
+
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from daily_series import DEFAULT_ELEMENTS, WIND_ELEMENTS, records_to_series, series_to_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DEFAULT_ROOT = 'observation_warehouse'
+PART_FILE = 'data.parquet'
+
+# Every file carries every column (null where not observed) so partitions share one schema
+WAREHOUSE_ELEMENTS = tuple(DEFAULT_ELEMENTS) + ('TAVG',) + WIND_ELEMENTS
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("observation_warehouse needs pyarrow (pip install pyarrow)")
+
+
+def file_schema():
+    """Columns stored in each partition file (partition keys live in the path)"""
+    _require_pyarrow()
+    return pa.schema([('date', pa.date32()), ('month', pa.int8())]
+                     + [(element, pa.float64()) for element in WAREHOUSE_ELEMENTS])
+
+
+def partition_schema():
+    _require_pyarrow()
+    return pa.schema([('country', pa.string()), ('station', pa.string()), ('year', pa.int16())])
+
+
+class ObservationWarehouse:
+    """
+    Parquet warehouse of standard-unit daily observations
+
+    Layout: <root>/country=GM/station=GME00102380/year=2024/data.parquet,
+    one row group per month. Country is the station ID's two-letter GHCN
+    prefix, as in the station databases.
+
+    Also usable as a NOAADataFetcher backend (daily_records / daily_series)
+    and archive (write_records).
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        _require_pyarrow()
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _partition_dir(self, station_id: str, year: Optional[int] = None) -> str:
+        path = os.path.join(self.root, f"country={station_id[:2]}", f"station={station_id}")
+        return path if year is None else os.path.join(path, f"year={year}")
+
+    # -- Writing -------------------------------------------------------------
+
+    def write_series(self, series: Dict) -> int:
+        """
+        Merge a standard-unit daily series (daily_series.records_to_series)
+        into the station's year partitions; newer values replace stored ones
+
+        Returns:
+            Number of days written
+        """
+        if series.get('units', 'standard') != 'standard':
+            raise ValueError("The warehouse stores standard units; convert before writing")
+
+        station_id = series['station_id']
+        dates = series['dates']
+        values = series['values']
+        observed = np.zeros(len(dates), dtype=bool)
+        for element in WAREHOUSE_ELEMENTS:
+            if element in values:
+                observed |= ~np.isnan(values[element])
+
+        years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        written = 0
+        for year in np.unique(years[observed]).tolist():
+            rows = observed & (years == year)
+            columns = {'date': dates[rows]}
+            for element in WAREHOUSE_ELEMENTS:
+                column = values.get(element)
+                columns[element] = column[rows] if column is not None else np.full(int(rows.sum()), np.nan)
+            self._merge_year(station_id, year, columns)
+            written += int(rows.sum())
+        return written
+
+    def write_records(self, station_id: str, records: List[Dict]) -> int:
+        """Persist NCEI daily records (as returned by fetch_daily_data)"""
+        if not records:
+            return 0
+        days = sorted(r['DATE'][:10] for r in records)
+        elements = [e for e in WAREHOUSE_ELEMENTS if any(e in r for r in records)]
+        return self.write_series(records_to_series(records, days[0], days[-1], elements, station_id))
+
+    def _merge_year(self, station_id: str, year: int, columns: Dict[str, np.ndarray]) -> None:
+        directory = self._partition_dir(station_id, year)
+        path = os.path.join(directory, PART_FILE)
+
+        if os.path.exists(path):
+            stored = pq.read_table(path)
+            stored_dates = stored.column('date').to_numpy().astype('datetime64[D]')
+            keep = ~np.isin(stored_dates, columns['date'])
+            merged = {'date': np.concatenate([stored_dates[keep], columns['date']])}
+            for element in WAREHOUSE_ELEMENTS:
+                old = stored.column(element).to_numpy(zero_copy_only=False).astype(np.float64)
+                merged[element] = np.concatenate([old[keep], columns[element]])
+            columns = merged
+
+        order = np.argsort(columns['date'], kind='stable')
+        dates = columns['date'][order]
+        months = (dates.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+        arrays = [pa.array(dates, type=pa.date32()), pa.array(months)]
+        arrays += [pa.array(columns[e][order], from_pandas=True) for e in WAREHOUSE_ELEMENTS]
+        table = pa.Table.from_arrays(arrays, schema=file_schema())
+
+        # One row group per month: month/date filters skip the rest of the file
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with pq.ParquetWriter(tmp, file_schema(), compression='zstd') as writer:
+            boundaries = np.flatnonzero(np.diff(months)) + 1
+            for start, end in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(months)]))):
+                writer.write_table(table.slice(int(start), int(end - start)))
+        os.replace(tmp, path)
+
+    # -- Reading -------------------------------------------------------------
+
+    def _files(self, countries: Optional[Iterable[str]], stations: Optional[Iterable[str]],
+               years: Optional[Tuple[int, int]]) -> List[str]:
+        """Partition files that can match, found by walking only the needed directories"""
+        def subdirs(path, key, wanted=None):
+            if not os.path.isdir(path):
+                return []
+            found = []
+            for entry in os.scandir(path):
+                name, _, value = entry.name.partition('=')
+                if entry.is_dir() and name == key and (wanted is None or wanted(value)):
+                    found.append(entry.path)
+            return sorted(found)
+
+        if stations is not None:
+            station_dirs = [self._partition_dir(s) for s in stations]
+            if countries is not None:
+                allowed = set(countries)
+                station_dirs = [d for d, s in zip(station_dirs, stations) if s[:2] in allowed]
+        else:
+            allowed = None if countries is None else set(countries)
+            country_dirs = subdirs(self.root, 'country', None if allowed is None else allowed.__contains__)
+            station_dirs = [d for country_dir in country_dirs for d in subdirs(country_dir, 'station')]
+
+        in_years = None if years is None else (lambda value: years[0] <= int(value) <= years[1])
+        files = []
+        for station_dir in station_dirs:
+            for year_dir in subdirs(station_dir, 'year', in_years):
+                path = os.path.join(year_dir, PART_FILE)
+                if os.path.exists(path):
+                    files.append(path)
+        return files
+
+    def query(self, countries: Optional[Iterable[str]] = None, stations: Optional[Iterable[str]] = None,
+              years: Optional[Tuple[int, int]] = None, months: Optional[Iterable[int]] = None,
+              start_date: Optional[str] = None, end_date: Optional[str] = None,
+              elements: Optional[Iterable[str]] = None):
+        """
+        Read observations matching every given condition
+
+        Country, station and year prune whole partitions; months and dates
+        are pushed down to Parquet row-group statistics.
+
+        Args:
+            countries: GHCN country prefixes, e.g. ['GM']
+            stations: Station IDs
+            years: Inclusive (first, last) year range
+            months: Months to keep (1-12), e.g. [1, 2, 3]
+            start_date / end_date: Inclusive YYYY-MM-DD bounds
+            elements: Element columns to return (default all)
+
+        Returns:
+            pyarrow.Table with station, country, year, date, month and the
+            element columns, sorted by station and date
+        """
+        stations = None if stations is None else list(stations)
+        files = self._files(countries, stations, years)
+        columns = ['station', 'country', 'year', 'date', 'month'] + list(elements or WAREHOUSE_ELEMENTS)
+        schema = pa.unify_schemas([file_schema(), partition_schema()])
+        if not files:
+            return schema.empty_table().select(columns)
+
+        conditions = []
+        if months is not None:
+            conditions.append(ds.field('month').isin(pa.array(sorted(months), type=pa.int8())))
+        if start_date is not None:
+            conditions.append(ds.field('date') >= pa.scalar(date.fromisoformat(start_date), type=pa.date32()))
+        if end_date is not None:
+            conditions.append(ds.field('date') <= pa.scalar(date.fromisoformat(end_date), type=pa.date32()))
+
+        dataset = ds.dataset(files, schema=schema, format='parquet', partition_base_dir=self.root,
+                             partitioning=ds.partitioning(partition_schema(), flavor='hive'))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        return table.sort_by([('station', 'ascending'), ('date', 'ascending')])
+
+    # -- NOAADataFetcher backend ---------------------------------------------
+
+    def daily_series(self, station_id: str, start_date: str, end_date: str,
+                     data_types: Optional[List[str]] = None) -> Dict:
+        """Dense standard-unit series, shaped like daily_series.records_to_series"""
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+        if not os.path.isdir(self._partition_dir(station_id)):
+            raise KeyError(f"Station {station_id} is not in the observation warehouse")
+
+        stored = [e for e in data_types if e in WAREHOUSE_ELEMENTS]
+        table = self.query(stations=[station_id], years=(int(start_date[:4]), int(end_date[:4])),
+                           start_date=start_date, end_date=end_date, elements=stored)
+
+        start = np.datetime64(start_date, 'D')
+        dates = np.arange(start, np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+        offsets = (table.column('date').to_numpy().astype('datetime64[D]') - start).astype(np.int64)
+        values = {element: np.full(len(dates), np.nan) for element in data_types}
+        for element in stored:
+            values[element][offsets] = table.column(element).to_numpy(zero_copy_only=False).astype(np.float64)
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'units': 'standard',
+            'dates': dates,
+            'values': values
+        }
+
+    def daily_records(self, station_id: str, start_date: str, end_date: str,
+                      data_types: Optional[List[str]] = None) -> List[Dict]:
+        """NCEI-style records ({'DATE', 'STATION', element: 'value'}) for days with any data"""
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+        return series_to_records(self.daily_series(station_id, start_date, end_date, data_types), data_types)
+
+
+def load_dly_store(store, warehouse: ObservationWarehouse, stations: Optional[Iterable[str]] = None) -> int:
+    """
+    Copy stations from a dly_ingest.DlyStore into the warehouse
+
+    Returns:
+        Number of station-days written
+    """
+    written = 0
+    for station_id in (stations or sorted(store.index['stations'])):
+        entry = store.index['stations'][station_id]
+        elements = [e for e in entry['elements'] if e in WAREHOUSE_ELEMENTS]
+        written += warehouse.write_series(store.daily_series(station_id, entry['start'], entry['end'], elements))
+    return written
+
+
+def main():
+    from dly_ingest import DEFAULT_STORE_DIR, DlyStore
+
+    print("=" * 60)
+    print("DAILY OBSERVATION WAREHOUSE")
+    print("=" * 60)
+
+    warehouse = ObservationWarehouse()
+    if os.path.isdir(DEFAULT_STORE_DIR):
+        print(f"\n[*] Loading {DEFAULT_STORE_DIR}/ into {DEFAULT_ROOT}/ ...")
+        written = load_dly_store(DlyStore(DEFAULT_STORE_DIR), warehouse)
+        print(f"    [OK] {written:,} station-days written")
+
+    print("\n[*] Example query: German stations, Jan-Mar, 2015-2024")
+    table = warehouse.query(countries=['GM'], years=(2015, 2024), months=[1, 2, 3], elements=['SNOW', 'SNWD'])
+    stations = pc.count_distinct(table.column('station')).as_py() if table.num_rows else 0
+    print(f"    [OK] {table.num_rows:,} rows from {stations} stations")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Project Templates
+Python mirror of ProjectTemplatesLibrary (premium-features.js) thresholds
+All values are metric: °C, mm of rain, cm of snow, km/h of wind
+"""
+
+from typing import Dict
+
+TEMPLATES = {
+    'commercial-concrete': {
+        'name': 'Commercial Concrete Work',
+        'weather_criteria': {'max_rain': 5, 'max_wind': 40, 'min_temp': 4, 'max_temp': 35,
+                             'max_snow': 0, 'consecutive_days': 3},
+        'risk_weights': {'precipitation': 0.35, 'temperature': 0.35, 'wind': 0.15, 'workability': 0.15},
+        'workability_thresholds': {'critical_min_temp': 4, 'ideal_min_temp': 10, 'max_temp': 35,
+                                   'max_rain': 1, 'max_wind': 40, 'max_snow': 0}
+    },
+    'roofing': {
+        'name': 'Roofing Installation',
+        'weather_criteria': {'max_rain': 0, 'max_wind': 30, 'min_temp': -5, 'max_temp': 40,
+                             'max_snow': 0, 'consecutive_days': 2},
+        'risk_weights': {'precipitation': 0.40, 'temperature': 0.15, 'wind': 0.35, 'workability': 0.10},
+        'workability_thresholds': {'critical_min_temp': -5, 'ideal_min_temp': 4, 'max_temp': 40,
+                                   'max_rain': 0, 'max_wind': 30, 'max_snow': 0}
+    },
+    'excavation': {
+        'name': 'Excavation & Earthwork',
+        'weather_criteria': {'max_rain': 10, 'max_wind': 50, 'min_temp': -10, 'max_temp': 45,
+                             'max_snow': 5, 'consecutive_days': 1},
+        'risk_weights': {'precipitation': 0.50, 'temperature': 0.15, 'wind': 0.10, 'workability': 0.25},
+        'workability_thresholds': {'critical_min_temp': -7, 'ideal_min_temp': 5, 'max_temp': 45,
+                                   'max_rain': 15, 'max_wind': 50, 'max_snow': 5}
+    },
+    'exterior-painting': {
+        'name': 'Exterior Painting',
+        'weather_criteria': {'max_rain': 0, 'max_wind': 25, 'min_temp': 10, 'max_temp': 32,
+                             'max_snow': 0, 'consecutive_days': 3},
+        'risk_weights': {'precipitation': 0.30, 'temperature': 0.25, 'wind': 0.15, 'workability': 0.30},
+        'workability_thresholds': {'critical_min_temp': 10, 'ideal_min_temp': 15, 'max_temp': 32,
+                                   'max_rain': 0, 'max_wind': 25, 'max_snow': 0}
+    },
+    'landscaping': {
+        'name': 'Landscaping & Grounds',
+        'weather_criteria': {'max_rain': 15, 'max_wind': 40, 'min_temp': 0, 'max_temp': 38,
+                             'max_snow': 2, 'consecutive_days': 1},
+        'risk_weights': {'precipitation': 0.25, 'temperature': 0.20, 'wind': 0.10, 'workability': 0.45},
+        'workability_thresholds': {'critical_min_temp': 0, 'ideal_min_temp': 10, 'max_temp': 38,
+                                   'max_rain': 15, 'max_wind': 40, 'max_snow': 2}
+    },
+    'hvac-outdoor': {
+        'name': 'HVAC Outdoor Installation',
+        'weather_criteria': {'max_rain': 3, 'max_wind': 35, 'min_temp': -5, 'max_temp': 38,
+                             'max_snow': 5, 'consecutive_days': 1},
+        'risk_weights': {'precipitation': 0.30, 'temperature': 0.20, 'wind': 0.25, 'workability': 0.25},
+        'workability_thresholds': {'critical_min_temp': -5, 'ideal_min_temp': 10, 'max_temp': 38,
+                                   'max_rain': 3, 'max_wind': 35, 'max_snow': 5}
+    },
+    'asphalt-paving': {
+        'name': 'Asphalt Paving',
+        'weather_criteria': {'max_rain': 0, 'max_wind': 30, 'min_temp': 10, 'max_temp': 43.33,
+                             'max_snow': 0, 'consecutive_days': 2},
+        'risk_weights': {'precipitation': 0.40, 'temperature': 0.40, 'wind': 0.05, 'workability': 0.15},
+        'workability_thresholds': {'critical_min_temp': 10, 'ideal_min_temp': 15, 'max_temp': 43.33,
+                                   'max_rain': 0, 'max_wind': 30, 'max_snow': 0}
+    },
+    'general-construction': {
+        'name': 'General Construction',
+        'weather_criteria': {'max_rain': 8, 'max_wind': 40, 'min_temp': 0, 'max_temp': 38,
+                             'max_snow': 3, 'consecutive_days': 2},
+        'risk_weights': {'precipitation': 0.30, 'temperature': 0.25, 'wind': 0.20, 'workability': 0.25},
+        'workability_thresholds': {'critical_min_temp': 0, 'ideal_min_temp': 10, 'max_temp': 38,
+                                   'max_rain': 8, 'max_wind': 40, 'max_snow': 3}
+    }
+}
+
+# Weights used by calculateRiskScore when no template is selected
+DEFAULT_RISK_WEIGHTS = {'precipitation': 0.30, 'temperature': 0.25, 'wind': 0.20, 'workability': 0.25}
+
+# Single-purpose day rules from calculateTemplateKPIs
+KPI_CRITERIA = {
+    # calculateCompactionDays: high >= 10°C (50°F) and dry (trace <= 1mm allowed)
+    'compaction': {'min_high': 10, 'max_rain': 0},
+    # calculatePlantingDays: high between 10 and 27°C (50-80°F)
+    'planting': {'min_high': 10, 'max_high': 27}
+}
+
+
+def get_template(template_id: str) -> Dict:
+    """Return a template by ID, or None if unknown"""
+    return TEMPLATES.get(template_id)
+
+
+def window_criteria() -> Dict[str, Dict]:
+    """Weather-window criteria for every template, keyed by template ID"""
+    return {tid: dict(t['weather_criteria']) for tid, t in TEMPLATES.items()}
+
+
+def application_criteria(template_id: str) -> Dict:
+    """
+    Application-day criteria from a template's workability thresholds
+    (calculatePaintApplicationDays)
+    """
+    thresholds = TEMPLATES[template_id]['workability_thresholds']
+    return {
+        'min_temp': thresholds['critical_min_temp'],
+        'max_temp': thresholds['max_temp'],
+        'max_rain': thresholds['max_rain'],
+        'max_wind': thresholds['max_wind']
+    }
@@ -0,0 +1,252 @@
+"""
+Batch Risk-Scoring Engine
+Scores many project analyses at once with the same rules as calculateRiskScore
+(app.js) and calculateMonthlyRisk (premium-features.js)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from project_templates import DEFAULT_RISK_WEIGHTS, get_template
+
+WEIGHT_KEYS = ('precipitation', 'temperature', 'wind', 'workability')
+
+# 25% work-stopping days = 100 risk
+RATIO_SCALE = 400
+
+# (favorable ratio below, minimum total score) - checked in order
+WORKABILITY_FLOORS = ((0.15, 65), (0.25, 45), (0.30, 30))
+
+RISK_LEVELS = ((25, 'LOW RISK'), (50, 'MODERATE RISK'), (75, 'HIGH RISK'))
+EXTREME_LEVEL = 'EXTREME RISK'
+
+# Best/worst months closer than this (percentage points) are not reported
+MIN_MONTH_SPREAD = 10
+
+COUNT_FIELDS = ('heavyRainDays', 'heavySnowDays', 'extremeColdDays', 'extremeHeatDays', 'workStoppingWindDays')
+
+
+def _js_round(values: np.ndarray) -> np.ndarray:
+    """Math.round: halves round up, unlike numpy's round-half-to-even"""
+    return np.floor(values + 0.5)
+
+
+def _count(value) -> float:
+    """parseInt of a day count; missing or unparsable counts are zero"""
+    try:
+        return float(int(float(value)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _speed(value) -> float:
+    """avgWindSpeed as a float; missing or unparsable speeds are NaN (no wind data)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def analyses_to_columns(projects: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Collect per-project analysis fields into column arrays
+
+    Args:
+        projects: Dicts with an 'analysis' (the fields calculateRiskScore
+                  reads) and optional 'id' and 'template'; a bare
+                  analysis dict is accepted too
+
+    Returns:
+        Dictionary of (N,) arrays plus (N, 4) 'weights' and, when any
+        project has a monthlyBreakdown, (N, M) 'month_workable',
+        'month_total' and 'month_names'
+    """
+    n = len(projects)
+    columns = {field: np.zeros(n) for field in COUNT_FIELDS}
+    columns['total_days'] = np.full(n, 365.0)
+    columns['workable_days'] = np.zeros(n)
+    columns['has_wind'] = np.zeros(n, dtype=bool)
+    columns['weights'] = np.zeros((n, len(WEIGHT_KEYS)))
+    columns['project_id'] = np.empty(n, dtype=object)
+    columns['template'] = np.empty(n, dtype=object)
+
+    breakdowns = []
+    for i, project in enumerate(projects):
+        analysis = project.get('analysis', project)
+        for field in COUNT_FIELDS:
+            columns[field][i] = _count(analysis.get(field))
+
+        actual = analysis.get('actualProjectDays')
+        if actual is not None and actual > 0:
+            columns['total_days'][i] = actual
+        columns['workable_days'][i] = _count(analysis.get('workableDays') or analysis.get('optimalDays'))
+
+        columns['has_wind'][i] = not np.isnan(_speed(analysis.get('avgWindSpeed')))
+
+        template = get_template(project.get('template')) if project.get('template') else None
+        weights = template['risk_weights'] if template else DEFAULT_RISK_WEIGHTS
+        columns['weights'][i] = [weights[key] for key in WEIGHT_KEYS]
+
+        columns['project_id'][i] = project.get('id', i)
+        columns['template'][i] = project.get('template')
+        breakdowns.append(analysis.get('monthlyBreakdown') or [])
+
+    width = max((len(b) for b in breakdowns), default=0)
+    if width:
+        columns['month_workable'] = np.full((n, width), np.nan)
+        columns['month_total'] = np.full((n, width), np.nan)
+        columns['month_names'] = np.full((n, width), None, dtype=object)
+        for i, breakdown in enumerate(breakdowns):
+            for j, month in enumerate(breakdown):
+                columns['month_workable'][i, j] = month['workable']
+                columns['month_total'][i, j] = month['total']
+                columns['month_names'][i, j] = month['month']
+
+    return columns
+
+
+def monthly_extremes(workable: np.ndarray, total: np.ndarray, names: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Best and worst month per project, as calculateMonthlyRisk picks them
+
+    The first month with the highest (lowest) workable percentage wins.
+    Both are dropped when they are the same month or less than
+    MIN_MONTH_SPREAD points apart. Padding and zero-day months are skipped.
+
+    Args:
+        workable: (N, M) workable days per breakdown month, NaN padded
+        total: (N, M) days per breakdown month, NaN padded
+        names: (N, M) month names
+
+    Returns:
+        Dictionary with 'best_month', 'worst_month' (None when not shown)
+        and their workable percentages (NaN when not shown)
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent = np.where(total > 0, workable / total * 100, np.nan)
+
+    valid = ~np.isnan(percent)
+    rows = np.arange(len(percent))
+    best = np.argmax(np.where(valid, percent, -np.inf), axis=1)
+    worst = np.argmin(np.where(valid, percent, np.inf), axis=1)
+    best_percent = percent[rows, best]
+    worst_percent = percent[rows, worst]
+
+    shown = valid.any(axis=1) & (names[rows, best] != names[rows, worst])
+    shown &= np.abs(best_percent - worst_percent) >= MIN_MONTH_SPREAD
+
+    return {
+        'best_month': np.where(shown, names[rows, best], None),
+        'best_month_percent': np.where(shown, best_percent, np.nan),
+        'worst_month': np.where(shown, names[rows, worst], None),
+        'worst_month_percent': np.where(shown, worst_percent, np.nan)
+    }
+
+
+def score_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculateRiskScore over column arrays
+
+    Args:
+        columns: Output of analyses_to_columns (or equivalent arrays)
+
+    Returns:
+        Scored table: identity columns, 'precip_risk', 'temp_risk',
+        'wind_risk' (NaN without wind data), 'season_risk',
+        'favorable_ratio', integer 'total_score' and 'risk_level'
+    """
+    total_days = columns['total_days']
+    weights = columns['weights']
+
+    wet_days = columns['heavyRainDays'] + columns['heavySnowDays']
+    precip_risk = np.minimum(100, wet_days / total_days * RATIO_SCALE)
+
+    temp_days = columns['extremeColdDays'] + _js_round(columns['extremeHeatDays'] * 0.5)
+    temp_risk = np.minimum(100, temp_days / total_days * RATIO_SCALE)
+
+    has_wind = columns['has_wind']
+    wind_risk = np.where(has_wind, np.minimum(100, columns['workStoppingWindDays'] / total_days * RATIO_SCALE), np.nan)
+
+    favorable = columns['workable_days'] / total_days
+    season_risk = np.clip((1 - favorable) * 100, 0, 100)
+
+    w_precip, w_temp, w_wind, w_season = weights.T
+    with_wind = precip_risk * w_precip + temp_risk * w_temp + np.nan_to_num(wind_risk) * w_wind + season_risk * w_season
+
+    # Without wind data its weight is spread proportionally over the others
+    rest = w_precip + w_temp + w_season
+    safe_rest = np.where(rest > 0, rest, 1)
+    wp = np.where(rest > 0, w_precip / safe_rest, 0.33)
+    wt = np.where(rest > 0, w_temp / safe_rest, 0.33)
+    ws = np.where(rest > 0, w_season / safe_rest, 0.34)
+    without_wind = precip_risk * wp + temp_risk * wt + season_risk * ws
+    total = _js_round(np.where(has_wind, with_wind, without_wind))
+
+    floor = np.zeros_like(total)
+    for ratio, minimum in reversed(WORKABILITY_FLOORS):
+        floor = np.where(favorable < ratio, minimum, floor)
+    total = np.clip(np.maximum(total, floor), 0, 100).astype(np.int32)
+
+    bounds = [limit for limit, _ in RISK_LEVELS]
+    labels = np.array([label for _, label in RISK_LEVELS] + [EXTREME_LEVEL], dtype=object)
+    risk_level = labels[np.searchsorted(bounds, total, side='left')]
+
+    table = {
+        'project_id': columns['project_id'],
+        'template': columns['template'],
+        'total_days': total_days,
+        'precip_risk': precip_risk,
+        'temp_risk': temp_risk,
+        'wind_risk': wind_risk,
+        'season_risk': season_risk,
+        'favorable_ratio': favorable,
+        'total_score': total,
+        'risk_level': risk_level
+    }
+    if 'month_workable' in columns:
+        table.update(monthly_extremes(columns['month_workable'], columns['month_total'], columns['month_names']))
+    return table
+
+
+def score_projects(projects: List[Dict]) -> Dict[str, np.ndarray]:
+    """Score a list of project analyses in one call (see score_columns)"""
+    return score_columns(analyses_to_columns(projects))
+
+
+def select(table: Dict[str, np.ndarray], where: Optional[np.ndarray] = None, sort_by: str = 'total_score',
+           descending: bool = True, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Filter and sort a scored table
+
+    Args:
+        table: Output of score_columns
+        where: Boolean row mask, e.g. table['total_score'] >= 50
+        sort_by: Column to order by (stable, so ties keep input order)
+        descending: Highest first
+        limit: Keep at most this many rows
+
+    Returns:
+        A table with the same columns, rows filtered and reordered
+    """
+    rows = np.arange(len(table['total_score']))
+    if where is not None:
+        rows = rows[where]
+
+    keys = table[sort_by][rows]
+    order = np.argsort(-keys if descending else keys, kind='stable')
+    rows = rows[order][:limit]
+    return {column: values[rows] for column, values in table.items()}
+
+
+def table_rows(table: Dict[str, np.ndarray]) -> List[Dict]:
+    """Convert a table to JSON-friendly row dicts (NaN becomes None)"""
+    def plain(value):
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and np.isnan(value):
+            return None
+        return value
+
+    n = len(table['total_score'])
+    return [{column: plain(values[i]) for column, values in table.items()} for i in range(n)]
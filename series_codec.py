@@ -0,0 +1,220 @@
+"""
+Compact Daily Series Encoding
+Packs a station's int16 daily columns (GHCN units, DLY_MISSING = absent)
+into a small binary blob - an alternative to .npz and JSON records for the
+local daily store
+
+Each element is a run-length presence mask followed by its present values,
+coded whichever way is smallest: delta (first value, then day-to-day
+differences; suits TMAX/TMIN), run-length (value, repeat count pairs; suits
+SNWD plateaus) or sparse (zeros skipped, value pairs; suits PRCP/SNOW).
+All integers are zigzag LEB128 varints, so typical values take one byte.
+
+Layout (little-endian):
+    header    magic 'XDSB', u16 version, u16 elements,
+              i32 start (days since 1970-01-01), u32 days
+    elements  4 ASCII bytes code, u8 codec, u32 mask runs, u32 payload bytes,
+              then the payload: mask runs (alternating missing / present
+              lengths, starting with missing) and the coded values
+"""
+
+import struct
+from typing import Dict, Union
+
+import numpy as np
+
+from ghcn_parser import DLY_MISSING
+
+MAGIC = b'XDSB'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sHHiI')
+ELEMENT_HEADER = struct.Struct('<4sBII')
+
+CODEC_DELTA = 0
+CODEC_RLE = 1
+CODEC_SPARSE = 2
+CODECS = {'delta': CODEC_DELTA, 'rle': CODEC_RLE, 'sparse': CODEC_SPARSE}
+
+# A u32 value needs at most five 7-bit groups
+VARINT_MAX_BYTES = 5
+
+
+def zigzag(values: np.ndarray) -> np.ndarray:
+    """Signed to unsigned so small magnitudes of either sign stay small"""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def unzigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return (values >> 1) ^ -(values & 1)
+
+
+def varint_encode(values: np.ndarray) -> bytes:
+    """LEB128-encode unsigned integers (below 2**35), vectorized per byte position"""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b''
+
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, VARINT_MAX_BYTES):
+        nbytes += values >= (1 << (7 * k))
+    starts = np.cumsum(nbytes) - nbytes
+
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max())):
+        sel = nbytes > k
+        group = (values[sel] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (nbytes[sel] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[sel] + k] = group | more
+    return out.tobytes()
+
+
+def varint_decode(data: Union[bytes, memoryview, np.ndarray]) -> np.ndarray:
+    """Decode every LEB128 varint in a buffer"""
+    data = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+
+    values = (data[starts] & 0x7F).astype(np.uint64)
+    for k in range(1, int(lengths.max())):
+        sel = lengths > k
+        values[sel] |= (data[starts[sel] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values
+
+
+def _mask_runs(present: np.ndarray) -> np.ndarray:
+    """Alternating missing / present run lengths, starting with a (possibly empty) missing run"""
+    changes = np.flatnonzero(present[1:] != present[:-1]) + 1
+    bounds = np.concatenate(([0], changes, [len(present)]))
+    runs = np.diff(bounds)
+    if len(present) and present[0]:
+        runs = np.concatenate(([0], runs))
+    return runs
+
+
+def _encode_delta(values: np.ndarray) -> bytes:
+    return varint_encode(zigzag(np.diff(values.astype(np.int64), prepend=0)))
+
+
+def _encode_rle(values: np.ndarray) -> bytes:
+    if len(values) == 0:
+        return b''
+    changes = np.flatnonzero(values[1:] != values[:-1]) + 1
+    bounds = np.concatenate(([0], changes, [len(values)]))
+    pairs = np.column_stack((zigzag(values[bounds[:-1]]), np.diff(bounds).astype(np.uint64)))
+    return varint_encode(pairs.ravel())
+
+
+def _encode_sparse(values: np.ndarray) -> bytes:
+    """(zeros skipped, value) pairs for the non-zero values; trailing zeros are implied"""
+    nonzero = np.flatnonzero(values)
+    skipped = np.diff(nonzero, prepend=-1) - 1
+    pairs = np.column_stack((skipped.astype(np.uint64), zigzag(values[nonzero])))
+    return varint_encode(pairs.ravel())
+
+
+ENCODERS = {'delta': _encode_delta, 'rle': _encode_rle, 'sparse': _encode_sparse}
+
+
+def encode_series(start: np.datetime64, columns: Dict[str, np.ndarray], codec: str = 'auto') -> bytes:
+    """
+    Pack a station's daily columns
+
+    Args:
+        start: Date of index 0 in every column
+        columns: Element -> int16 array in GHCN units (DLY_MISSING = absent);
+                 shorter columns are padded with DLY_MISSING
+        codec: 'delta', 'rle', 'sparse' or 'auto' (per element, whichever
+               is smallest)
+
+    Returns:
+        The encoded bytes
+    """
+    if codec != 'auto' and codec not in CODECS:
+        raise ValueError(f"Unknown series codec: {codec}")
+
+    days = max((len(column) for column in columns.values()), default=0)
+    start_day = int(np.datetime64(start, 'D').astype(np.int64))
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(columns), start_day, days)]
+
+    for element in sorted(columns):
+        column = np.asarray(columns[element])
+        present = np.zeros(days, dtype=bool)
+        present[:len(column)] = column != DLY_MISSING
+        values = column[present[:len(column)]]
+
+        runs = _mask_runs(present)
+        candidates = {name: encoder(values) for name, encoder in ENCODERS.items()
+                      if codec in ('auto', name)}
+        name = min(candidates, key=lambda n: len(candidates[n]))
+        payload = varint_encode(runs) + candidates[name]
+
+        parts.append(ELEMENT_HEADER.pack(element.encode('ascii'), CODECS[name], len(runs), len(payload)))
+        parts.append(payload)
+    return b''.join(parts)
+
+
+def _decode_values(codec: int, coded: np.ndarray, count: int) -> np.ndarray:
+    if codec == CODEC_DELTA:
+        return np.cumsum(unzigzag(coded))
+    if codec == CODEC_RLE:
+        pairs = coded.reshape(-1, 2)
+        return np.repeat(unzigzag(pairs[:, 0]), pairs[:, 1].astype(np.int64))
+    if codec == CODEC_SPARSE:
+        pairs = coded.reshape(-1, 2)
+        values = np.zeros(count, dtype=np.int64)
+        values[np.cumsum(pairs[:, 0].astype(np.int64) + 1) - 1] = unzigzag(pairs[:, 1])
+        return values
+    raise ValueError(f"Unknown series codec id: {codec}")
+
+
+def decode_series(data: Union[bytes, memoryview]) -> Dict:
+    """
+    Unpack encode_series output
+
+    Returns:
+        Dictionary with 'start' (datetime64[D]) and per-element int16 arrays,
+        the shape DlyStore.load returns
+    """
+    magic, version, n_elements, start_day, days = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a daily series file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported daily series version: {version}")
+
+    pos = HEADER.size
+    columns = {}
+    for _ in range(n_elements):
+        code, codec, n_runs, size = ELEMENT_HEADER.unpack_from(data, pos)
+        pos += ELEMENT_HEADER.size
+        varints = varint_decode(data[pos:pos + size])
+        pos += size
+
+        runs = varints[:n_runs].astype(np.int64)
+        present = np.repeat(np.arange(n_runs) % 2 == 1, runs)
+        column = np.full(days, DLY_MISSING, dtype=np.int16)
+        column[present] = _decode_values(codec, varints[n_runs:], int(runs[1::2].sum()))
+        columns[code.decode('ascii')] = column
+
+    return {'start': np.datetime64(start_day, 'D'), 'values': columns}
+
+
+def write_series(path: str, start: np.datetime64, columns: Dict[str, np.ndarray], codec: str = 'auto') -> int:
+    """Write one station's columns. Returns bytes written"""
+    data = encode_series(start, columns, codec)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def read_series(path: str) -> Dict:
+    with open(path, 'rb') as f:
+        return decode_series(f.read())
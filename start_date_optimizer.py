@@ -0,0 +1,193 @@
+"""
+Start-Date Optimizer
+Prefix sums over daily climatology give the best and worst start date for
+every project duration (1-365 days) at many sites in one batch
+"""
+
+import calendar
+from datetime import date, timedelta
+from typing import Dict, List, Union
+
+import numpy as np
+
+from daily_series import day_of_year_index
+from workable_days import evaluate_masks, prepare_series, required_elements
+
+DAYS_PER_YEAR = 365
+FEB_29_SLOT = 59  # Leap-calendar slot dropped from the 365-day start axis
+
+COMPONENTS = ('nonworkable', 'precip', 'snow')
+
+
+def daily_climatology(series: Union[Dict, List[Dict]], criteria: Dict) -> Dict:
+    """
+    Average each calendar day across years for one set of workable criteria
+
+    Args:
+        series: Daily series, list of series, or stacked series
+        criteria: One template's threshold dict (see workable_days.evaluate_masks)
+
+    Returns:
+        Dictionary with 'station_ids' and (stations, 365) arrays of expected
+        'nonworkable' days (0-1), 'precip' (mm) and 'snow' (cm) per day.
+        Days missing an element the criteria read are skipped; absent
+        elements read as missing, and absent snow as none.
+    """
+    stacked = prepare_series(series)
+    values = stacked['values']
+    n_stations = len(stacked['station_ids'])
+    doy = day_of_year_index(stacked['dates'])
+    keep = doy != FEB_29_SLOT
+    slot = np.where(doy > FEB_29_SLOT, doy - 1, doy)[keep]
+
+    workable = evaluate_masks(values, [criteria])[0][:, keep]
+    missing = np.full((n_stations, len(doy)), np.nan)
+    has_data = np.ones(workable.shape, dtype=bool)
+    for element in required_elements(criteria):
+        has_data &= ~np.isnan(values.get(element, missing)[:, keep])
+    precip = values.get('PRCP', missing)[:, keep]
+
+    flat = (np.arange(n_stations)[:, None] * DAYS_PER_YEAR + slot[None, :])
+
+    def slot_mean(data, valid):
+        sums = np.bincount(flat[valid], weights=data[valid], minlength=n_stations * DAYS_PER_YEAR)
+        counts = np.bincount(flat[valid], minlength=n_stations * DAYS_PER_YEAR)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        return mean.reshape(n_stations, DAYS_PER_YEAR)
+
+    snow = values.get('SNOW', missing)[:, keep]
+    return {
+        'station_ids': stacked['station_ids'],
+        'nonworkable': slot_mean(1.0 - workable, has_data),
+        'precip': slot_mean(precip, has_data & ~np.isnan(precip)),
+        'snow': slot_mean(np.nan_to_num(snow), has_data)
+    }
+
+
+def _circular_prefix(daily: np.ndarray) -> np.ndarray:
+    """Prefix sums over two back-to-back years so windows can wrap Dec 31"""
+    doubled = np.concatenate([daily, daily], axis=1)
+    prefix = np.zeros((daily.shape[0], doubled.shape[1] + 1))
+    np.cumsum(doubled, axis=1, out=prefix[:, 1:])
+    return prefix
+
+
+def optimize_start_dates(climatology: Dict, weights: Dict[str, float] = None,
+                         max_duration: int = DAYS_PER_YEAR) -> Dict:
+    """
+    Best and worst start day for every duration at every site
+
+    The cost of a window is the weighted sum of its components; by default
+    only expected non-workable days count. Each candidate window is one
+    prefix-sum difference, so a duration costs O(sites x 365). Windows with
+    a day where a weighted component is NaN (no data for that calendar
+    day) are never picked.
+
+    Args:
+        climatology: Result of daily_climatology (or any dict of (sites, 365)
+                     component arrays)
+        weights: Component weights, e.g. {'nonworkable': 1, 'precip': 0.01}
+        max_duration: Longest duration evaluated (at most 365)
+
+    Returns:
+        Dictionary with (sites, durations) arrays 'best_start', 'worst_start'
+        (0-based day of a 365-day year), 'best_cost', 'worst_cost', and
+        per-component window sums 'best_<component>' / 'worst_<component>'.
+        Where every window of a duration has a data gap, the starts are -1
+        and the costs and sums NaN.
+    """
+    if weights is None:
+        weights = {'nonworkable': 1.0}
+    max_duration = min(max_duration, DAYS_PER_YEAR)
+
+    present = [c for c in COMPONENTS if c in climatology]
+    prefixes = {c: _circular_prefix(np.nan_to_num(climatology[c])) for c in present}
+    n_sites = next(iter(prefixes.values())).shape[0]
+    cost_prefix = sum(weights.get(c, 0.0) * p for c, p in prefixes.items())
+
+    # Days with no data in a weighted component; windows containing one are skipped
+    gaps = np.zeros((n_sites, DAYS_PER_YEAR), dtype=bool)
+    for c in present:
+        if weights.get(c, 0.0):
+            gaps |= np.isnan(climatology[c])
+    gap_prefix = _circular_prefix(gaps.astype(np.float64))
+
+    starts = np.arange(DAYS_PER_YEAR)
+    rows = np.arange(n_sites)
+    shape = (n_sites, max_duration)
+
+    result = {
+        'durations': np.arange(1, max_duration + 1),
+        'best_start': np.zeros(shape, dtype=np.int16),
+        'worst_start': np.zeros(shape, dtype=np.int16),
+        'best_cost': np.zeros(shape),
+        'worst_cost': np.zeros(shape)
+    }
+    for c in prefixes:
+        result[f'best_{c}'] = np.zeros(shape)
+        result[f'worst_{c}'] = np.zeros(shape)
+
+    for d in range(1, max_duration + 1):
+        costs = cost_prefix[:, starts + d] - cost_prefix[:, starts]
+        has_gap = gap_prefix[:, starts + d] - gap_prefix[:, starts] > 0
+        best = np.argmin(np.where(has_gap, np.inf, costs), axis=1)
+        worst = np.argmax(np.where(has_gap, -np.inf, costs), axis=1)
+        none = has_gap.all(axis=1)
+        col = d - 1
+
+        result['best_start'][:, col] = np.where(none, -1, best)
+        result['worst_start'][:, col] = np.where(none, -1, worst)
+        result['best_cost'][:, col] = np.where(none, np.nan, costs[rows, best])
+        result['worst_cost'][:, col] = np.where(none, np.nan, costs[rows, worst])
+
+        for c, p in prefixes.items():
+            result[f'best_{c}'][:, col] = np.where(none, np.nan, p[rows, best + d] - p[rows, best])
+            result[f'worst_{c}'][:, col] = np.where(none, np.nan, p[rows, worst + d] - p[rows, worst])
+
+    if 'station_ids' in climatology:
+        result['station_ids'] = climatology['station_ids']
+    return result
+
+
+def start_date(day_index: int, year: int) -> date:
+    """Convert a 0-based day of the 365-day axis to a calendar date in year"""
+    day_index = int(day_index)
+    if calendar.isleap(year) and day_index >= FEB_29_SLOT:
+        day_index += 1  # Skip Feb 29, which has no slot of its own
+    return date(year, 1, 1) + timedelta(days=day_index)
+
+
+def recommend(result: Dict, site: int, duration: int, year: int) -> Dict:
+    """
+    Best and worst start for one site and duration, as calendar dates
+
+    Args:
+        result: Output of optimize_start_dates
+        site: Row index of the site
+        duration: Project duration in days
+        year: Year the project would start in
+
+    Returns:
+        Dictionary with best/worst start and end dates and window totals;
+        best/worst are None when every window has a data gap
+    """
+    col = duration - 1
+    summary = {'duration_days': duration}
+
+    for kind in ('best', 'worst'):
+        if result[f'{kind}_start'][site, col] < 0:
+            summary[kind] = None
+            continue
+        start = start_date(result[f'{kind}_start'][site, col], year)
+        entry = {
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=duration - 1)).isoformat(),
+            'cost': round(float(result[f'{kind}_cost'][site, col]), 2)
+        }
+        for c in COMPONENTS:
+            if f'{kind}_{c}' in result:
+                entry[c] = round(float(result[f'{kind}_{c}'][site, col]), 1)
+        summary[kind] = entry
+
+    return summary
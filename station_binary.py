@@ -0,0 +1,163 @@
+"""
+Binary Station Format
+Packed fixed-width station records with a deduplicated name table - a
+compact alternative to noaa_stations_frontend.json
+
+Layout (little-endian):
+    header    magic 'XSTB', u16 version, u16 reserved, u32 stations,
+              u16 countries, u32 names
+    countries 2 ASCII bytes each
+    names     u32 offsets (names + 1) into a UTF-8 blob, then the blob,
+              zero-padded to a 4-byte boundary
+    records   26 bytes each: id (11 ASCII), u8 country index,
+              i32 lat * 1e4, i32 lng * 1e4, i16 elevation (m, -32768 when
+              unknown), u32 name index
+"""
+
+import math
+import struct
+from typing import Dict, List, Union
+
+import numpy as np
+
+MAGIC = b'XSTB'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sHHIHI')
+
+# Coordinates are stored as integer 1e-4 degrees (the frontend JSON precision)
+COORD_SCALE = 10000
+
+# Elevation slot for stations without one (decoded as NaN)
+ELEVATION_MISSING = -32768
+
+RECORD_DTYPE = np.dtype([
+    ('id', 'S11'),
+    ('country', 'u1'),
+    ('lat', '<i4'),
+    ('lng', '<i4'),
+    ('elevation', '<i2'),
+    ('name', '<u4')
+])
+
+
+def _pad4(length: int) -> int:
+    return (-length) % 4
+
+
+def _elevation(value) -> int:
+    if value is None or math.isnan(value):
+        return ELEVATION_MISSING
+    return int(round(value))
+
+
+def encode_stations(stations: List[Dict]) -> bytes:
+    """
+    Pack frontend station dicts into the binary format
+
+    Args:
+        stations: Dicts with id, name, lat, lng, elevation and country;
+                  a missing or NaN elevation is stored as ELEVATION_MISSING
+
+    Returns:
+        The encoded file contents
+    """
+    countries = sorted({s['country'] for s in stations})
+    if len(countries) > 255:
+        raise ValueError(f"Too many countries for a u8 index: {len(countries)}")
+    country_index = {code: i for i, code in enumerate(countries)}
+
+    names = []
+    name_index = {}
+    records = np.zeros(len(stations), dtype=RECORD_DTYPE)
+    for i, station in enumerate(stations):
+        name = station['name']
+        if name not in name_index:
+            name_index[name] = len(names)
+            names.append(name)
+        records[i] = (
+            station['id'].encode('ascii'),
+            country_index[station['country']],
+            int(round(station['lat'] * COORD_SCALE)),
+            int(round(station['lng'] * COORD_SCALE)),
+            _elevation(station.get('elevation')),
+            name_index[name]
+        )
+
+    encoded = [name.encode('utf-8') for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = b''.join(encoded)
+
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(stations), len(countries), len(names)),
+        ''.join(f'{c:2.2s}' for c in countries).encode('ascii'),
+        offsets.tobytes(),
+        blob
+    ]
+    size = sum(len(p) for p in parts)
+    parts.append(b'\0' * _pad4(size))
+    parts.append(records.tobytes())
+    return b''.join(parts)
+
+
+def decode_columns(data: Union[bytes, memoryview]) -> Dict:
+    """
+    Decode the binary format into column arrays without building dicts
+
+    Returns:
+        Dictionary with 'records' (structured array), 'countries' and 'names'
+    """
+    magic, version, _, n_stations, n_countries, n_names = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a station binary file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported station binary version: {version}")
+
+    pos = HEADER.size
+    countries = [bytes(data[pos + 2 * i:pos + 2 * i + 2]).decode('ascii').strip() for i in range(n_countries)]
+    pos += 2 * n_countries
+
+    offsets = np.frombuffer(data, dtype='<u4', count=n_names + 1, offset=pos)
+    pos += offsets.nbytes
+    blob = bytes(data[pos:pos + int(offsets[-1])])
+    names = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n_names)]
+    pos += len(blob)
+    pos += _pad4(pos)
+
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=n_stations, offset=pos)
+    return {'records': records, 'countries': countries, 'names': names}
+
+
+def decode_stations(data: Union[bytes, memoryview]) -> List[Dict]:
+    """Decode the binary format into frontend station dicts"""
+    columns = decode_columns(data)
+    records = columns['records']
+    countries = columns['countries']
+    names = columns['names']
+
+    return [
+        {
+            'id': station_id.decode('ascii'),
+            'name': names[name],
+            'lat': lat / COORD_SCALE,
+            'lng': lng / COORD_SCALE,
+            'elevation': math.nan if elevation == ELEVATION_MISSING else float(elevation),
+            'country': countries[country]
+        }
+        for station_id, country, lat, lng, elevation, name in records.tolist()
+    ]
+
+
+def write_stations_binary(stations: List[Dict], path: str = 'noaa_stations_frontend.bin') -> int:
+    """Write stations in the binary format. Returns bytes written"""
+    data = encode_stations(stations)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def read_stations_binary(path: str = 'noaa_stations_frontend.bin') -> List[Dict]:
+    """Read a binary station file back into frontend station dicts"""
+    with open(path, 'rb') as f:
+        return decode_stations(f.read())
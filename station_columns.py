@@ -0,0 +1,259 @@
+"""
+Columnar Station Capabilities
+Holds the GHCN station network as flat arrays - an element bitmask and
+first/last-year columns per station - so capability filters and coverage
+statistics are vectorized instead of walking nested data_types dicts
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ghcn_parser import PERIOD_COLUMNS, decode, parse_inventory, parse_stations
+
+# Elements with their own first/last-year columns and a bit in the masks
+TRACKED_ELEMENTS = ('PRCP', 'SNOW', 'SNWD', 'TMAX', 'TMIN')
+ELEMENT_BITS = {element: 1 << i for i, element in enumerate(TRACKED_ELEMENTS)}
+TEMP_BITS = ELEMENT_BITS['TMAX'] | ELEMENT_BITS['TMIN']
+
+# build_noaa_network flags an element active when its data runs through this year
+CAPABILITY_MIN_YEAR = 2020
+RECENT_YEAR = 2024
+
+
+def _legacy_names(state: np.ndarray, name: np.ndarray) -> np.ndarray:
+    """build_noaa_network reads names from columns 38-68, i.e. 'ST NAME' cut at 30 chars"""
+    joined = np.char.add(np.char.add(state, b' '), np.char.ljust(name, 30)).astype('S33')
+    return np.char.strip(joined.astype('S30'))
+
+
+def build_columns(stations_file: str = 'ghcnd-stations.txt', inventory_file: str = 'ghcnd-inventory.txt',
+                  min_year: int = CAPABILITY_MIN_YEAR, processes: int = 1) -> Dict:
+    """
+    Parse the GHCN metadata files straight into station columns
+
+    Args:
+        stations_file: Path to ghcnd-stations.txt
+        inventory_file: Path to ghcnd-inventory.txt
+        min_year: An element is active when its last year is at least this
+        processes: Worker processes for ghcn_parser (None = CPU count)
+
+    Returns:
+        Dictionary of per-station arrays, in stations-file order:
+        'id', 'name', 'country' (bytes), 'lat', 'lng', 'elevation',
+        'elements' / 'active' (uint8 bitmasks over TRACKED_ELEMENTS),
+        'first_year' / 'last_year' (int16, one column per tracked element,
+        0 when absent) and 'last_year_any' (latest year of any element).
+        Every inventory period is also kept, grouped by station, in
+        'period_offsets', 'period_element', 'period_first', 'period_last'
+        with element codes in 'element_names'.
+    """
+    raw = parse_stations(stations_file, processes=processes)
+    valid = ~np.isnan(raw['lat']) & ~np.isnan(raw['lon'])
+    raw = {key: values[valid] for key, values in raw.items()}
+    n = len(raw['id'])
+
+    inventory = parse_inventory(inventory_file, columns=PERIOD_COLUMNS, processes=processes)
+
+    # Join inventory rows to stations by ID
+    order = np.argsort(raw['id'], kind='stable')
+    sorted_ids = raw['id'][order]
+    pos = np.searchsorted(sorted_ids, inventory['id'])
+    found = pos < n
+    found[found] = sorted_ids[pos[found]] == inventory['id'][found]
+    station = order[pos[found]]
+    element_names, element = np.unique(inventory['element'][found], return_inverse=True)
+    first = inventory['first_year'][found]
+    last = inventory['last_year'][found]
+
+    # A repeated (station, element) row replaces the earlier one, as in the dict build
+    key = station.astype(np.int64) * max(len(element_names), 1) + element
+    _, last_rows = np.unique(key[::-1], return_index=True)
+    rows = np.sort(len(key) - 1 - last_rows)
+    rows = rows[np.argsort(station[rows], kind='stable')]
+    station, element, first, last = station[rows], element[rows], first[rows], last[rows]
+
+    columns = {
+        'id': raw['id'],
+        'name': _legacy_names(raw['state'], raw['name']),
+        'country': raw['id'].astype('S2'),
+        'lat': raw['lat'],
+        'lng': raw['lon'],
+        'elevation': raw['elevation'],
+        'elements': np.zeros(n, dtype=np.uint8),
+        'active': np.zeros(n, dtype=np.uint8),
+        'first_year': np.zeros((n, len(TRACKED_ELEMENTS)), dtype=np.int16),
+        'last_year': np.zeros((n, len(TRACKED_ELEMENTS)), dtype=np.int16),
+        'last_year_any': np.zeros(n, dtype=np.int16),
+        'period_offsets': np.concatenate(([0], np.cumsum(np.bincount(station, minlength=n)))),
+        'period_element': element.astype(np.uint16),
+        'period_first': first,
+        'period_last': last,
+        'element_names': decode(element_names)
+    }
+
+    np.maximum.at(columns['last_year_any'], station, last)
+    for slot, name in enumerate(TRACKED_ELEMENTS):
+        match = np.flatnonzero(element_names == name.encode('ascii'))
+        if len(match) == 0:
+            continue
+        rows = element == match[0]
+        columns['first_year'][station[rows], slot] = first[rows]
+        columns['last_year'][station[rows], slot] = last[rows]
+        columns['elements'][station[rows]] |= ELEMENT_BITS[name]
+        columns['active'][station[rows][last[rows] >= min_year]] |= ELEMENT_BITS[name]
+
+    return columns
+
+
+def columns_from_records(stations: List[Dict]) -> Dict:
+    """
+    Station columns from station dicts (e.g. noaa_snow_stations.json)
+
+    The 'active' bits follow each record's has_* flags (has_temp sets TMAX,
+    has_snwd / has_snow / has_precip their elements), so country rules
+    applied upstream carry over. The per-period arrays are left empty.
+    """
+    n = len(stations)
+    first_year = np.zeros((n, len(TRACKED_ELEMENTS)), dtype=np.int16)
+    last_year = np.zeros((n, len(TRACKED_ELEMENTS)), dtype=np.int16)
+    last_year_any = np.zeros(n, dtype=np.int16)
+    elements = np.zeros(n, dtype=np.uint8)
+    active = np.zeros(n, dtype=np.uint8)
+    flag_bits = (('has_snow', ELEMENT_BITS['SNOW']), ('has_snwd', ELEMENT_BITS['SNWD']),
+                 ('has_temp', ELEMENT_BITS['TMAX']), ('has_precip', ELEMENT_BITS['PRCP']))
+
+    for i, station in enumerate(stations):
+        periods = station['data_types']
+        last_year_any[i] = max((p.get('end', 0) for p in periods.values()), default=0)
+        for slot, name in enumerate(TRACKED_ELEMENTS):
+            period = periods.get(name)
+            if period is not None:
+                first_year[i, slot] = period['start']
+                last_year[i, slot] = period['end']
+                elements[i] |= ELEMENT_BITS[name]
+        for flag, bit in flag_bits:
+            if station.get(flag):
+                active[i] |= bit
+
+    return {
+        'id': np.array([s['id'] for s in stations], dtype='S11'),
+        'name': np.array([s['name'].encode('utf-8') for s in stations], dtype=bytes),
+        'country': np.array([s['country'] for s in stations], dtype='S2'),
+        'lat': np.array([s['lat'] for s in stations], dtype=np.float64),
+        'lng': np.array([s['lng'] for s in stations], dtype=np.float64),
+        'elevation': np.array([s['elevation'] for s in stations], dtype=np.float64),
+        'elements': elements,
+        'active': active,
+        'first_year': first_year,
+        'last_year': last_year,
+        'last_year_any': last_year_any,
+        'period_offsets': np.zeros(n + 1, dtype=np.int64),
+        'period_element': np.zeros(0, dtype=np.uint16),
+        'period_first': np.zeros(0, dtype=np.int16),
+        'period_last': np.zeros(0, dtype=np.int16),
+        'element_names': []
+    }
+
+
+def capability_flags(columns: Dict) -> Dict[str, np.ndarray]:
+    """has_snow / has_temp / has_precip as boolean arrays"""
+    active = columns['active']
+    return {
+        'has_snow': (active & ELEMENT_BITS['SNOW']) > 0,
+        'has_temp': (active & TEMP_BITS) > 0,
+        'has_precip': (active & ELEMENT_BITS['PRCP']) > 0
+    }
+
+
+def snow_mask(columns: Dict) -> np.ndarray:
+    return capability_flags(columns)['has_snow']
+
+
+def quality_mask(columns: Dict, recent_year: int = RECENT_YEAR) -> np.ndarray:
+    """Frontend quality filter: snow, temperature and precipitation plus data through recent_year"""
+    flags = capability_flags(columns)
+    return (flags['has_snow'] & flags['has_temp'] & flags['has_precip']
+            & (columns['last_year_any'] >= recent_year))
+
+
+def generate_statistics(columns: Dict, mask: Optional[np.ndarray] = None,
+                        recent_year: int = RECENT_YEAR) -> Dict:
+    """
+    Coverage statistics as vectorized group-bys
+
+    Args:
+        columns: Station columns
+        mask: Stations to count (default all)
+        recent_year: Year used for 'recent_data'
+
+    Returns:
+        Same structure as build_noaa_network.generate_statistics, with
+        by_country in first-appearance order
+    """
+    if mask is None:
+        mask = np.ones(len(columns['id']), dtype=bool)
+    flags = {key: values[mask] for key, values in capability_flags(columns).items()}
+    country = columns['country'][mask]
+
+    codes, first_seen, inverse = np.unique(country, return_index=True, return_inverse=True)
+    totals = np.bincount(inverse, minlength=len(codes))
+    snow = np.bincount(inverse, weights=flags['has_snow'], minlength=len(codes)).astype(int)
+
+    return {
+        'total_stations': int(mask.sum()),
+        'snow_capable': int(flags['has_snow'].sum()),
+        'full_capability': int((flags['has_snow'] & flags['has_temp'] & flags['has_precip']).sum()),
+        'by_country': {
+            codes[i].decode('ascii'): {'total': int(totals[i]), 'snow': int(snow[i])}
+            for i in np.argsort(first_seen, kind='stable')
+        },
+        'recent_data': int((columns['last_year_any'][mask] >= recent_year).sum())
+    }
+
+
+def frontend_records(columns: Dict, mask: np.ndarray) -> List[Dict]:
+    """Compact noaa_stations_frontend.json records for the masked stations"""
+    index = np.flatnonzero(mask)
+    return [
+        {
+            'id': station_id,
+            'name': name,
+            'lat': round(lat, 4),
+            'lng': round(lng, 4),
+            'elevation': round(elevation, 1),
+            'country': country
+        }
+        for station_id, name, lat, lng, elevation, country in zip(
+            decode(columns['id'][index]),
+            [n.decode('utf-8', errors='ignore') for n in columns['name'][index].tolist()],
+            columns['lat'][index].tolist(), columns['lng'][index].tolist(),
+            columns['elevation'][index].tolist(), decode(columns['country'][index]))
+    ]
+
+
+def station_dicts(columns: Dict, mask: np.ndarray) -> List[Dict]:
+    """
+    build_noaa_network station dicts (with full data_types) for the masked
+    stations only - the rest of the network never becomes Python objects
+    """
+    flags = capability_flags(columns)
+    offsets = columns['period_offsets']
+    element_names = columns['element_names']
+    period_element = columns['period_element'].tolist()
+    period_first = columns['period_first'].tolist()
+    period_last = columns['period_last'].tolist()
+
+    stations = []
+    for record, i in zip(frontend_records(columns, mask), np.flatnonzero(mask).tolist()):
+        record['lat'] = float(columns['lat'][i])
+        record['lng'] = float(columns['lng'][i])
+        record['elevation'] = float(columns['elevation'][i])
+        record['data_types'] = {
+            element_names[period_element[row]]: {'start': period_first[row], 'end': period_last[row]}
+            for row in range(offsets[i], offsets[i + 1])
+        }
+        for flag, values in flags.items():
+            record[flag] = bool(values[i])
+        stations.append(record)
+    return stations
@@ -7,11 +7,36 @@ import json
 import math
 from typing import List, Dict, Tuple
 
+from station_tiles import TileReader
+
+# First search radius when reading from tiles; doubled until enough stations are found
+TILE_SEARCH_MILES = 50
+
+# Half of Earth's circumference - a radius this large covers every tile
+MAX_SEARCH_MILES = 12500
+
+
 class StationMatcher:
     """Find nearest NOAA stations for any US location"""
 
-    def __init__(self, stations_file='noaa_snow_stations.json'):
-        """Load station database"""
+    def __init__(self, stations_file='noaa_snow_stations.json', tiles_dir=None):
+        """
+        Load station database
+
+        With tiles_dir, stations are read on demand from spatial tiles
+        (station_tiles.write_tiles) instead of loading the full file. Tiles
+        must hold quality-filtered stations (create_frontend_station_db
+        writes them from the quality_mask stations), so tile lookups can
+        only serve quality_only searches.
+        """
+        self.tiles = None
+        if tiles_dir:
+            self.tiles = TileReader(tiles_dir)
+            self.stations = []
+            self.quality_stations = []
+            print(f"[OK] Using {len(self.tiles.manifest['tiles'])} station tiles ({self.tiles.station_count} stations)")
+            return
+
         with open(stations_file, 'r') as f:
             self.stations = json.load(f)
 
@@ -59,7 +84,15 @@ class StationMatcher:
 
         Returns:
             List of nearest stations with distance info
+
+        Raises:
+            ValueError: quality_only is False with a tiles-backed matcher
         """
+        if self.tiles:
+            if not quality_only:
+                raise ValueError("Station tiles only hold quality stations; load stations_file for quality_only=False")
+            return self._find_nearest_in_tiles(lat, lng, count)
+
         stations_to_search = self.quality_stations if quality_only else self.stations
 
         # Calculate distance to all stations
@@ -74,6 +107,27 @@ class StationMatcher:
         stations_with_distance.sort(key=lambda x: x['distance_miles'])
         return stations_with_distance[:count]
 
+    def _find_nearest_in_tiles(self, lat: float, lng: float, count: int) -> List[Dict]:
+        """Nearest stations from tiles, widening the search until count are in range"""
+        radius = TILE_SEARCH_MILES
+        while True:
+            in_range = self._stations_within(self.tiles.candidates(lat, lng, radius), lat, lng, radius)
+            if len(in_range) >= count or radius >= MAX_SEARCH_MILES:
+                return in_range[:count]
+            radius *= 2
+
+    def _stations_within(self, stations: List[Dict], lat: float, lng: float, radius_miles: float) -> List[Dict]:
+        """Copies of stations within radius_miles, with distance_miles, nearest first"""
+        found = []
+        for station in stations:
+            distance = self.haversine_distance(lat, lng, station['lat'], station['lng'])
+            if distance <= radius_miles:
+                station_copy = station.copy()
+                station_copy['distance_miles'] = round(distance, 1)
+                found.append(station_copy)
+        found.sort(key=lambda x: x['distance_miles'])
+        return found
+
     def find_best_station(self, lat: float, lng: float) -> Dict:
         """
         Find single best station for a location
@@ -96,13 +150,8 @@ class StationMatcher:
         Returns:
             Coverage statistics for the area
         """
-        all_stations = []
-        for station in self.quality_stations:
-            distance = self.haversine_distance(lat, lng, station['lat'], station['lng'])
-            if distance <= radius_miles:
-                station_copy = station.copy()
-                station_copy['distance_miles'] = round(distance, 1)
-                all_stations.append(station_copy)
+        candidates = self.tiles.candidates(lat, lng, radius_miles) if self.tiles else self.quality_stations
+        all_stations = self._stations_within(candidates, lat, lng, radius_miles)
 
         return {
             'location': {'lat': lat, 'lng': lng},
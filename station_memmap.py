@@ -0,0 +1,248 @@
+"""
+Memory-Mapped Station Arrays
+Stores each station's daily history as fixed-stride int16 files (one per
+element, indexed by day offset from the station's base date) so any date
+range is a zero-copy slice and summaries need no record parsing
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from daily_series import DEFAULT_ELEMENTS, series_to_records
+from dly_ingest import DEFAULT_SOURCE, iter_dly_sources, station_arrays, to_standard
+from ghcn_parser import DLY_MISSING, parse_dly
+
+DEFAULT_ROOT = 'station_memmap'
+META_FILE = 'meta.json'
+MEMMAP_VERSION = 1
+DTYPE = np.dtype('<i2')
+
+# Values are GHCN-Daily storage units: tenths for temperature and
+# precipitation, whole mm for snow (tenths of mm would overflow int16 depth)
+UNITS = {'TMAX': '0.1 C', 'TMIN': '0.1 C', 'TAVG': '0.1 C', 'PRCP': '0.1 mm', 'SNOW': 'mm', 'SNWD': 'mm'}
+
+
+def write_station(root: str, station_id: str, start: np.datetime64, columns: Dict[str, np.ndarray],
+                  suffix: str = '') -> Dict:
+    """
+    Write one station's element arrays and its meta.json
+
+    Args:
+        root: Store directory
+        station_id: GHCN station ID
+        start: Date of element index 0
+        columns: Element -> int16 array in GHCN units (DLY_MISSING = absent)
+        suffix: Appended to every file name (e.g. '.tmp' to stage files
+                that are renamed into place later)
+
+    Returns:
+        The station's metadata
+    """
+    directory = os.path.join(root, station_id)
+    os.makedirs(directory, exist_ok=True)
+
+    days = max(len(column) for column in columns.values())
+    for element, column in columns.items():
+        padded = np.full(days, DLY_MISSING, dtype=DTYPE)
+        padded[:len(column)] = column
+        padded.tofile(os.path.join(directory, f"{element}.i16{suffix}"))
+
+    meta = {
+        'version': MEMMAP_VERSION,
+        'station_id': station_id,
+        'base_date': str(np.datetime64(start, 'D')),
+        'days': days,
+        'elements': sorted(columns),
+        'units': {element: UNITS.get(element, 'ghcn') for element in sorted(columns)}
+    }
+    with open(os.path.join(directory, META_FILE + suffix), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def ingest_dly_memmap(source: str = DEFAULT_SOURCE, root: str = DEFAULT_ROOT,
+                      stations: Optional[Iterable[str]] = None,
+                      elements: Iterable[str] = DEFAULT_ELEMENTS) -> int:
+    """
+    Stream a .dly archive or directory straight into memmap files
+
+    Returns:
+        Number of stations written
+    """
+    elements = list(elements)
+    written = 0
+    for station_id, data in iter_dly_sources(source, stations):
+        arrays = station_arrays(parse_dly(data, elements), elements)
+        if arrays is None or not arrays['values']:
+            continue
+        write_station(root, station_id, arrays['start'], arrays['values'])
+        written += 1
+    return written
+
+
+class MemmapStore:
+    """
+    Zero-copy reader over a memmap store; also a NOAADataFetcher backend
+
+    Element files are opened read-only on first use and kept open, so a
+    date range is a slice of the mapped file rather than a parse.
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self._meta = {}
+        self._maps = {}
+
+    def close(self, station_id: Optional[str] = None) -> None:
+        """Drop cached metadata and maps (for one station or all), e.g. after files were replaced"""
+        if station_id is None:
+            self._meta.clear()
+            self._maps.clear()
+            return
+        self._meta.pop(station_id, None)
+        for key in [key for key in self._maps if key[0] == station_id]:
+            del self._maps[key]
+
+    def load(self, station_id: str) -> Dict:
+        """In-memory copies of a station's arrays: 'start' and per-element int16 arrays"""
+        meta = self.meta(station_id)
+        return {
+            'start': np.datetime64(meta['base_date'], 'D'),
+            'values': {element: np.array(self.array(station_id, element)) for element in meta['elements']}
+        }
+
+    def meta(self, station_id: str) -> Dict:
+        if station_id not in self._meta:
+            path = os.path.join(self.root, station_id, META_FILE)
+            if not os.path.exists(path):
+                raise KeyError(f"Station {station_id} is not in the memmap store")
+            with open(path, 'r') as f:
+                meta = json.load(f)
+            if meta.get('version') != MEMMAP_VERSION:
+                raise ValueError(f"Unsupported memmap store version: {meta.get('version')}")
+            self._meta[station_id] = meta
+        return self._meta[station_id]
+
+    def array(self, station_id: str, element: str) -> Optional[np.memmap]:
+        """The station's full element array (None if the element is not stored)"""
+        key = (station_id, element)
+        if key not in self._maps:
+            meta = self.meta(station_id)
+            if element not in meta['elements']:
+                return None
+            path = os.path.join(self.root, station_id, f"{element}.i16")
+            self._maps[key] = np.memmap(path, dtype=DTYPE, mode='r', shape=(meta['days'],))
+        return self._maps[key]
+
+    def window(self, station_id: str, element: str, start_date: str, end_date: str) -> np.ndarray:
+        """
+        Raw values for start_date..end_date (inclusive)
+
+        Ranges inside the stored history are zero-copy views of the file;
+        ranges reaching outside it are copied and padded with DLY_MISSING.
+        """
+        meta = self.meta(station_id)
+        base = np.datetime64(meta['base_date'], 'D')
+        lo = int((np.datetime64(start_date, 'D') - base).astype(np.int64))
+        hi = int((np.datetime64(end_date, 'D') - base).astype(np.int64)) + 1
+
+        column = self.array(station_id, element)
+        if column is not None and 0 <= lo and hi <= len(column):
+            return column[lo:hi]
+
+        window = np.full(max(hi - lo, 0), DLY_MISSING, dtype=DTYPE)
+        if column is not None:
+            a, b = max(lo, 0), min(hi, len(column))
+            if a < b:
+                window[a - lo:b - lo] = column[a:b]
+        return window
+
+    def standard(self, station_id: str, element: str, start_date: str, end_date: str) -> np.ndarray:
+        """Window in NCEI standard units, rounded as NCEI reports them (NaN = missing)"""
+        return to_standard(element, self.window(station_id, element, start_date, end_date))
+
+    def daily_series(self, station_id: str, start_date: str, end_date: str,
+                     data_types: Optional[List[str]] = None) -> Dict:
+        """Dense standard-unit series, shaped like daily_series.records_to_series"""
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+        self.meta(station_id)
+
+        return {
+            'station_id': station_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'units': 'standard',
+            'dates': np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1,
+                               dtype='datetime64[D]'),
+            'values': {element: self.standard(station_id, element, start_date, end_date)
+                       for element in data_types}
+        }
+
+    def daily_records(self, station_id: str, start_date: str, end_date: str,
+                      data_types: Optional[List[str]] = None) -> List[Dict]:
+        """NCEI-style records ({'DATE', 'STATION', element: 'value'}) for days with any data"""
+        if data_types is None:
+            data_types = DEFAULT_ELEMENTS
+        return series_to_records(self.daily_series(station_id, start_date, end_date, data_types), data_types)
+
+    def summary(self, station_id: str, start_date: str, end_date: str) -> Optional[Dict]:
+        """
+        NOAADataFetcher._calculate_summary computed on the mapped arrays
+
+        Returns:
+            The summary dict, or None when no day in the range has data
+        """
+        values = {element: self.standard(station_id, element, start_date, end_date)
+                  for element in DEFAULT_ELEMENTS}
+        has_data = np.zeros(len(values['TMAX']), dtype=bool)
+        for column in values.values():
+            has_data |= ~np.isnan(column)
+        if not has_data.any():
+            return None
+
+        present = {element: column[~np.isnan(column)] for element, column in values.items()}
+        temps_max, temps_min = present['TMAX'], present['TMIN']
+        precip, snow = present['PRCP'], present['SNOW']
+
+        def mean(x, digits):
+            return round(float(x.sum()) / len(x), digits) if len(x) else None
+
+        return {
+            'days_with_data': int(has_data.sum()),
+            'temperature': {
+                'avg_high': mean(temps_max, 1),
+                'avg_low': mean(temps_min, 1),
+                'max': float(temps_max.max()) if len(temps_max) else None,
+                'min': float(temps_min.min()) if len(temps_min) else None
+            },
+            'precipitation': {
+                'total': round(float(precip.sum()), 2) if len(precip) else None,
+                'avg_daily': mean(precip, 2),
+                'days_with_precip': int((precip > 0).sum())
+            },
+            'snowfall': {
+                'total': round(float(snow.sum()), 1) if len(snow) else None,
+                'avg_daily': mean(snow, 2),
+                'days_with_snow': int((snow > 0).sum()),
+                'max_daily': float(snow.max()) if len(snow) else None
+            }
+        }
+
+
+def main():
+    print("=" * 60)
+    print("MEMORY-MAPPED STATION ARRAYS")
+    print("=" * 60)
+
+    source = DEFAULT_SOURCE if os.path.exists(DEFAULT_SOURCE) else 'ghcnd_all'
+    print(f"\n[*] Streaming {source} into {DEFAULT_ROOT}/ ...")
+    written = ingest_dly_memmap(source)
+    print(f"    [OK] {written:,} stations written")
+
+
+if __name__ == '__main__':
+    main()
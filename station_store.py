@@ -0,0 +1,225 @@
+"""
+Station Store
+SQLite station database keyed by station ID with an R*Tree spatial index;
+upserts and deletes are indexed, and the frontend JSON is exported from it
+"""
+
+import json
+import math
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from station_matcher import StationMatcher
+
+DEFAULT_DB = 'noaa_stations.db'
+
+FRONTEND_FIELDS = ('id', 'name', 'lat', 'lng', 'elevation', 'country')
+
+# Miles per degree of latitude (Earth radius 3956 mi, as StationMatcher)
+MILES_PER_DEGREE = 3956 * math.pi / 180
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    id        TEXT PRIMARY KEY,
+    name      TEXT NOT NULL,
+    lat       REAL NOT NULL,
+    lng       REAL NOT NULL,
+    elevation REAL,
+    country   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stations_country ON stations (country);
+CREATE VIRTUAL TABLE IF NOT EXISTS station_rtree USING rtree (
+    station_rowid, min_lat, max_lat, min_lng, max_lng
+);
+"""
+
+UPSERT = """
+INSERT INTO stations (id, name, lat, lng, elevation, country)
+VALUES (:id, :name, :lat, :lng, :elevation, :country)
+ON CONFLICT (id) DO UPDATE SET
+    name = excluded.name, lat = excluded.lat, lng = excluded.lng,
+    elevation = excluded.elevation, country = excluded.country
+"""
+
+INDEX_POINT = """
+INSERT OR REPLACE INTO station_rtree
+SELECT rowid, lat, lat, lng, lng FROM stations WHERE id = ?
+"""
+
+
+class StationStore:
+    """Station database with O(log n) upsert, delete and radius lookup"""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        """Open (or create) the store at path; ':memory:' works for tests"""
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _record(station: Dict) -> Dict:
+        """Frontend fields of a station; country falls back to the ID prefix"""
+        return {
+            'id': station['id'],
+            'name': station['name'],
+            'lat': round(float(station['lat']), 4),
+            'lng': round(float(station['lng']), 4),
+            'elevation': round(float(station.get('elevation') or 0.0), 1),
+            'country': station.get('country') or station['id'][:2]
+        }
+
+    def upsert(self, stations: Iterable[Dict]) -> int:
+        """
+        Insert or update stations by ID in one transaction
+
+        Rerunning with the same stations leaves the store unchanged, so
+        country additions can be replayed safely.
+
+        Returns:
+            Number of stations written
+        """
+        with self.conn:
+            return len(self._write(stations))
+
+    def delete(self, station_ids: Iterable[str]) -> int:
+        """Remove stations by ID; unknown IDs are ignored. Returns rows deleted"""
+        with self.conn:
+            return self._delete(station_ids)
+
+    def replace(self, stations: Iterable[Dict]) -> int:
+        """
+        Make the store hold exactly these stations, in one transaction
+
+        Stations are upserted as by upsert, and every stored station whose
+        ID is not among them is deleted, so a full rebuild drops stations
+        that left the network.
+
+        Returns:
+            Number of stale stations deleted
+        """
+        with self.conn:
+            current = {r['id'] for r in self._write(stations)}
+            stale = [row[0] for row in self.conn.execute("SELECT id FROM stations") if row[0] not in current]
+            return self._delete(stale)
+
+    def _write(self, stations: Iterable[Dict]) -> List[Dict]:
+        """Upsert and index stations inside the caller's transaction; returns the records"""
+        records = [self._record(s) for s in stations]
+        self.conn.executemany(UPSERT, records)
+        self.conn.executemany(INDEX_POINT, [(r['id'],) for r in records])
+        return records
+
+    def _delete(self, station_ids: Iterable[str]) -> int:
+        """Delete stations inside the caller's transaction; returns rows deleted"""
+        ids = [(sid,) for sid in station_ids]
+        self.conn.executemany(
+            "DELETE FROM station_rtree WHERE station_rowid = (SELECT rowid FROM stations WHERE id = ?)", ids)
+        before = self.conn.total_changes
+        self.conn.executemany("DELETE FROM stations WHERE id = ?", ids)
+        return self.conn.total_changes - before
+
+    def get(self, station_id: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT * FROM stations WHERE id = ?", (station_id,)).fetchone()
+        return dict(row) if row else None
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM stations").fetchone()[0]
+
+    def count_by_country(self) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT country, COUNT(*) AS n FROM stations GROUP BY country ORDER BY n DESC, country")
+        return {row['country']: row['n'] for row in rows}
+
+    def nearby(self, lat: float, lng: float, radius_miles: float = 50) -> List[Dict]:
+        """
+        Stations within radius_miles, nearest first
+
+        The R*Tree narrows candidates to a bounding box; exact distances use
+        StationMatcher.haversine_distance. The box widens in longitude by
+        1/cos(lat) at its poleward edge, splits in two where it crosses the
+        antimeridian, and covers every longitude near the poles.
+        """
+        dlat = radius_miles / MILES_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90)))
+        if cos_lat < 1e-6 or dlat / cos_lat >= 180:
+            spans = [(-180.0, 180.0)]
+        else:
+            dlng = dlat / cos_lat
+            low, high = lng - dlng, lng + dlng
+            if low < -180:
+                spans = [(-180.0, high), (low + 360, 180.0)]
+            elif high > 180:
+                spans = [(low, 180.0), (-180.0, high - 360)]
+            else:
+                spans = [(low, high)]
+
+        found = {}
+        for low, high in spans:
+            for row in self.conn.execute(
+                """
+                SELECT s.* FROM station_rtree r JOIN stations s ON s.rowid = r.station_rowid
+                WHERE r.min_lat <= ? AND r.max_lat >= ? AND r.min_lng <= ? AND r.max_lng >= ?
+                """,
+                (lat + dlat, lat - dlat, high, low)
+            ):
+                found[row['id']] = row
+
+        results = []
+        for row in found.values():
+            station = dict(row)
+            distance = StationMatcher.haversine_distance(lat, lng, station['lat'], station['lng'])
+            if distance <= radius_miles:
+                station['distance_miles'] = round(distance, 1)
+                results.append(station)
+        return sorted(results, key=lambda s: s['distance_miles'])
+
+    def stations(self) -> List[Dict]:
+        """All stations ordered by ID, in the frontend layout"""
+        columns = ', '.join(FRONTEND_FIELDS)
+        return [dict(row) for row in self.conn.execute(f"SELECT {columns} FROM stations ORDER BY id")]
+
+    def export_frontend(self, path: str = 'noaa_stations_frontend.json') -> int:
+        """Write noaa_stations_frontend.json (compact JSON). Returns station count"""
+        stations = self.stations()
+        with open(path, 'w') as f:
+            json.dump(stations, f, separators=(',', ':'))
+        return len(stations)
+
+    def import_json(self, path: str = 'noaa_stations_frontend.json') -> int:
+        """Upsert every station from a frontend or snow-stations JSON file"""
+        with open(path, 'r') as f:
+            return self.upsert(json.load(f))
+
+
+def main():
+    print("=" * 60)
+    print("STATION STORE")
+    print("=" * 60)
+
+    with StationStore() as store:
+        print("\n[*] Importing noaa_stations_frontend.json...")
+        before = store.count()
+        read = store.import_json()
+        print(f"    [OK] {read:,} stations read, store now holds {store.count():,} (was {before:,})")
+
+        print("\n[*] Stations by country:")
+        for country, count in list(store.count_by_country().items())[:20]:
+            print(f"    {country:3s}: {count:5,d}")
+
+        print("\n[*] Exporting frontend database...")
+        exported = store.export_frontend()
+        print(f"    [SAVED] noaa_stations_frontend.json ({exported:,} stations)")
+
+
+if __name__ == '__main__':
+    main()
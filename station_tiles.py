@@ -0,0 +1,157 @@
+"""
+Station Tiles
+Splits the frontend station database into fixed-degree spatial tiles with a
+manifest, so nearest-station lookups only load the tiles near a location
+"""
+
+import json
+import math
+import os
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Tuple
+
+TILE_FORMAT_VERSION = 1
+DEFAULT_TILE_DEGREES = 5
+DEFAULT_TILES_DIR = 'station_tiles'
+MANIFEST_FILE = 'manifest.json'
+
+# Miles per degree of latitude (Earth radius 3956 mi, as StationMatcher)
+MILES_PER_DEGREE = 3956 * math.pi / 180
+
+
+def grid_shape(tile_degrees: float) -> Tuple[int, int]:
+    """Number of tile rows (latitude) and columns (longitude)"""
+    return math.ceil(180 / tile_degrees), math.ceil(360 / tile_degrees)
+
+
+def tile_index(lat: float, lng: float, tile_degrees: float) -> Tuple[int, int]:
+    """Row and column of the tile containing a point"""
+    rows, cols = grid_shape(tile_degrees)
+    row = min(int((lat + 90) // tile_degrees), rows - 1)
+    col = int((lng + 180) // tile_degrees) % cols
+    return row, col
+
+
+def tile_key(row: int, col: int) -> str:
+    return f"{row}_{col}"
+
+
+def write_tiles(stations: List[Dict], output_dir: str = DEFAULT_TILES_DIR,
+                tile_degrees: float = DEFAULT_TILE_DEGREES) -> Dict:
+    """
+    Write one compact JSON file per non-empty tile plus manifest.json
+
+    Args:
+        stations: Frontend station dicts (id, name, lat, lng, elevation, country)
+        output_dir: Directory for the tile files
+        tile_degrees: Tile edge length in degrees
+
+    Returns:
+        The manifest dict
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tiles = defaultdict(list)
+    for station in stations:
+        tiles[tile_index(station['lat'], station['lng'], tile_degrees)].append(station)
+
+    manifest = {
+        'version': TILE_FORMAT_VERSION,
+        'generated': date.today().isoformat(),
+        'tile_degrees': tile_degrees,
+        'station_count': len(stations),
+        'tiles': {}
+    }
+
+    for (row, col), members in sorted(tiles.items()):
+        key = tile_key(row, col)
+        filename = f"{key}.json"
+        payload = json.dumps(sorted(members, key=lambda s: s['id']), separators=(',', ':'))
+        with open(os.path.join(output_dir, filename), 'w') as f:
+            f.write(payload)
+
+        manifest['tiles'][key] = {
+            'file': filename,
+            'count': len(members),
+            'bytes': len(payload.encode('utf-8')),
+            'bounds': [row * tile_degrees - 90, col * tile_degrees - 180,
+                       (row + 1) * tile_degrees - 90, (col + 1) * tile_degrees - 180]
+        }
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class TileReader:
+    """Loads station tiles on demand from a directory written by write_tiles"""
+
+    def __init__(self, directory: str = DEFAULT_TILES_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), 'r') as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get('version') != TILE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported tile format version: {self.manifest.get('version')}")
+
+        self.tile_degrees = self.manifest['tile_degrees']
+        self.rows, self.cols = grid_shape(self.tile_degrees)
+        self._cache = {}
+
+    @property
+    def station_count(self) -> int:
+        return self.manifest['station_count']
+
+    def load_tile(self, key: str) -> List[Dict]:
+        """Stations in one tile (empty for tiles not in the manifest)"""
+        if key not in self._cache:
+            entry = self.manifest['tiles'].get(key)
+            if entry is None:
+                self._cache[key] = []
+            else:
+                with open(os.path.join(self.directory, entry['file']), 'r') as f:
+                    self._cache[key] = json.load(f)
+        return self._cache[key]
+
+    def tiles_for_radius(self, lat: float, lng: float, radius_miles: float) -> List[str]:
+        """
+        Keys of manifest tiles overlapping the bounding box of a search circle
+
+        The box widens in longitude by 1/cos(lat) and wraps at the
+        antimeridian; near the poles every column is searched.
+        """
+        dlat = radius_miles / MILES_PER_DEGREE
+        low_row, _ = tile_index(max(lat - dlat, -90), 0, self.tile_degrees)
+        high_row, _ = tile_index(min(lat + dlat, 90), 0, self.tile_degrees)
+
+        edge_lat = min(abs(lat) + dlat, 90)
+        cos_lat = math.cos(math.radians(edge_lat))
+        if cos_lat < 1e-6 or dlat / cos_lat >= 180:
+            cols = range(self.cols)
+        else:
+            dlng = dlat / cos_lat
+            first = int((lng - dlng + 180) // self.tile_degrees)
+            last = int((lng + dlng + 180) // self.tile_degrees)
+            cols = sorted({c % self.cols for c in range(first, last + 1)})
+
+        keys = []
+        for row in range(low_row, high_row + 1):
+            for col in cols:
+                key = tile_key(row, col)
+                if key in self.manifest['tiles']:
+                    keys.append(key)
+        return keys
+
+    def candidates(self, lat: float, lng: float, radius_miles: float) -> List[Dict]:
+        """All stations in tiles that could lie within radius_miles of a point"""
+        stations = []
+        for key in self.tiles_for_radius(lat, lng, radius_miles):
+            stations.extend(self.load_tile(key))
+        return stations
+
+    def all_stations(self) -> List[Dict]:
+        """Every station (loads every tile)"""
+        stations = []
+        for key in self.manifest['tiles']:
+            stations.extend(self.load_tile(key))
+        return stations
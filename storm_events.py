@@ -0,0 +1,137 @@
+"""
+Snow Storm Event Extractor
+Single-pass top-k storm days, snowfall buckets and multi-day storm merging
+"""
+
+import heapq
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# Lower bounds (inches) of the light/moderate/heavy/extreme buckets.
+# Any measurable snow below the first bound counts as a trace day.
+SNOW_BUCKET_EDGES = [0.1, 2, 6, 12]
+SNOW_BUCKET_LABELS = [
+    'trace',
+    'light (0.1-2")',
+    'moderate (2-6")',
+    'heavy (6-12")',
+    'extreme (12"+)'
+]
+
+
+class _TopK:
+    """Bounded min-heap keeping the k largest items in arrival order for ties"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+
+    def push(self, value: float, item: Dict):
+        if self.k <= 0:
+            return
+        # Negated sequence number makes earlier items win ties, which matches
+        # a stable sort(reverse=True) over the full list
+        entry = (value, -self._seq, item)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict]:
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+def _snow_value(record: Dict) -> Optional[float]:
+    """Return the SNOW value of a record as float, or None if not reported"""
+    value = record.get('SNOW')
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def extract_snow_events(records: Iterable[Dict], top_k: int = 10) -> Dict:
+    """
+    Scan daily records once and collect snow statistics
+
+    Consecutive calendar days with measurable snow are merged into one storm
+    event. Records are expected in date order, as returned by NCEI.
+
+    Args:
+        records: Daily records with 'DATE' and optional 'SNOW' values
+        top_k: Number of biggest snow days and storms to keep
+
+    Returns:
+        Dictionary with totals, bucket counts, top days and top storms
+    """
+    total = 0.0
+    days_reported = 0
+    days_with_snow = 0
+    max_daily = None
+    buckets = [0] * len(SNOW_BUCKET_LABELS)
+
+    top_days = _TopK(top_k)
+    top_storms = _TopK(top_k)
+    storm_count = 0
+    storm = None
+    last_day = None
+
+    def close_storm():
+        nonlocal storm_count
+        storm['total'] = round(storm['total'], 1)
+        top_storms.push(storm['total'], storm)
+        storm_count += 1
+
+    for record in records:
+        snow_amt = _snow_value(record)
+        if snow_amt is None:
+            continue
+
+        total += snow_amt
+        days_reported += 1
+        if snow_amt <= 0:
+            continue
+
+        days_with_snow += 1
+        buckets[bisect_right(SNOW_BUCKET_EDGES, snow_amt)] += 1
+        if max_daily is None or snow_amt > max_daily:
+            max_daily = snow_amt
+
+        top_days.push(snow_amt, {'date': record['DATE'], 'amount': snow_amt})
+
+        day = date.fromisoformat(record['DATE'][:10])
+        if storm is not None and day == last_day + timedelta(days=1):
+            storm['end_date'] = record['DATE']
+            storm['days'] += 1
+            storm['total'] += snow_amt
+            if snow_amt > storm['peak_amount']:
+                storm['peak_date'] = record['DATE']
+                storm['peak_amount'] = snow_amt
+        else:
+            if storm is not None:
+                close_storm()
+            storm = {
+                'start_date': record['DATE'],
+                'end_date': record['DATE'],
+                'days': 1,
+                'total': snow_amt,
+                'peak_date': record['DATE'],
+                'peak_amount': snow_amt
+            }
+        last_day = day
+
+    if storm is not None:
+        close_storm()
+
+    return {
+        'total': total,
+        'days_reported': days_reported,
+        'days_with_snow': days_with_snow,
+        'max_daily': max_daily,
+        'breakdown': dict(zip(SNOW_BUCKET_LABELS, buckets)),
+        'biggest_days': top_days.items(),
+        'storm_count': storm_count,
+        'biggest_storms': top_storms.items()
+    }
@@ -0,0 +1,147 @@
+"""
+Summary Cache
+SQLite cache of NOAADataFetcher range summaries keyed by station and date
+range, with invalidation by changed station-days, plus the GSOM/GSOY
+monthly and yearly records those summaries can be built from
+"""
+
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_DB = 'summary_cache.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    station_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date   TEXT NOT NULL,
+    summary    TEXT NOT NULL,
+    PRIMARY KEY (station_id, start_date, end_date)
+);
+"""
+
+AGGREGATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregates (
+    dataset    TEXT NOT NULL,
+    station_id TEXT NOT NULL,
+    year       INTEGER NOT NULL,
+    records    TEXT NOT NULL,
+    PRIMARY KEY (dataset, station_id, year)
+);
+"""
+
+
+class SummaryCache:
+    """Range summaries by (station, start, end); ISO dates compare as text"""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        """Open (or create) the cache at path; ':memory:' works for tests"""
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, station_id: str, start_date: str, end_date: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT summary FROM summaries WHERE station_id = ? AND start_date = ? AND end_date = ?",
+            (station_id, start_date, end_date)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, station_id: str, start_date: str, end_date: str, summary: Dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                (station_id, start_date, end_date, json.dumps(summary))
+            )
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def invalidate(self, station_id: str, first_day: str, last_day: str) -> int:
+        """Drop the station's summaries whose range overlaps first_day..last_day. Returns rows dropped"""
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM summaries WHERE station_id = ? AND start_date <= ? AND end_date >= ?",
+                (station_id, last_day, first_day)
+            ).rowcount
+
+    def invalidate_days(self, changed: Dict[str, Iterable]) -> int:
+        """
+        Drop summaries touching any changed station-day
+
+        Args:
+            changed: Station ID -> changed dates (datetime64[D] or ISO strings)
+
+        Returns:
+            Number of cached summaries dropped
+        """
+        spans = []
+        for station_id, days in changed.items():
+            days = np.unique(np.asarray(days, dtype='datetime64[D]'))
+            if len(days) == 0:
+                continue
+            # Consecutive days collapse into one range check
+            breaks = np.flatnonzero(np.diff(days).astype(np.int64) > 1) + 1
+            for run in np.split(days, breaks):
+                spans.append((station_id, str(run[-1]), str(run[0])))
+
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "DELETE FROM summaries WHERE station_id = ? AND start_date <= ? AND end_date >= ?", spans
+            )
+            return self.conn.total_changes - before
+
+
+class AggregateCache:
+    """
+    GSOM/GSOY records by (dataset, station, year)
+
+    NOAADataFetcher only caches complete years (see
+    aggregate_summaries.year_complete): months still being published and
+    years with no records yet are requested again.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(AGGREGATE_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get_years(self, dataset: str, station_id: str, start_year: int, end_year: int) -> Dict[int, List[Dict]]:
+        """Cached records for the years in start_year..end_year that are present"""
+        rows = self.conn.execute(
+            "SELECT year, records FROM aggregates WHERE dataset = ? AND station_id = ? AND year BETWEEN ? AND ?",
+            (dataset, station_id, start_year, end_year)
+        ).fetchall()
+        return {year: json.loads(records) for year, records in rows}
+
+    def put_years(self, dataset: str, station_id: str, years: Dict[int, List[Dict]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?)",
+                [(dataset, station_id, year, json.dumps(records)) for year, records in years.items()]
+            )
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM aggregates").fetchone()[0]
@@ -0,0 +1,287 @@
+"""
+superghcnd Diff Updater
+Applies NOAA's GHCN-Daily daily diff files (inserts, updates, deletes) to
+the memory-mapped station store in one transactional batch and invalidates
+the cached summaries that cover changed station-days
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import tarfile
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from daily_series import DEFAULT_ELEMENTS
+from ghcn_parser import DLY_MISSING
+from station_memmap import DEFAULT_ROOT, META_FILE, MemmapStore, write_station
+
+DEFAULT_DIFF_DIR = 'superghcnd_diffs'
+STATE_FILE = 'superghcnd_state.json'
+JOURNAL_FILE = 'superghcnd_journal.json'
+STAGED_SUFFIX = '.tmp'
+
+# superghcnd_diff_20240101_to_20240102.tar.gz (or an extracted directory of that name)
+DIFF_NAME = re.compile(r'superghcnd_diff_(\d{8})_to_(\d{8})')
+CHANGE_KINDS = ('insert', 'update', 'delete')
+
+
+def find_diffs(directory: str) -> List[Dict]:
+    """Diff archives / directories in a folder, oldest first"""
+    diffs = []
+    for entry in os.scandir(directory):
+        match = DIFF_NAME.match(entry.name)
+        if match:
+            diffs.append({'name': match.group(0), 'from': match.group(1), 'to': match.group(2),
+                          'path': entry.path})
+    return sorted(diffs, key=lambda d: (d['to'], d['from']))
+
+
+def _diff_files(path: str) -> Iterator[Tuple[str, io.TextIOBase]]:
+    """(kind, text stream) for each of insert/update/delete.csv in a diff"""
+    if os.path.isdir(path):
+        for kind in CHANGE_KINDS:
+            filename = os.path.join(path, f"{kind}.csv")
+            if os.path.exists(filename):
+                with open(filename, 'r', newline='') as f:
+                    yield kind, f
+        return
+
+    with tarfile.open(path, 'r:*') as archive:
+        for member in archive.getmembers():
+            kind = os.path.splitext(os.path.basename(member.name))[0]
+            if member.isfile() and kind in CHANGE_KINDS:
+                yield kind, io.TextIOWrapper(archive.extractfile(member), newline='')
+
+
+def read_diff(path: str, elements: Iterable[str] = DEFAULT_ELEMENTS) -> Dict:
+    """
+    Read one diff's changes for the tracked elements
+
+    Rows are ID,YYYYMMDD,ELEMENT,VALUE,MFLAG,QFLAG,SFLAG,OBS-TIME. Deleted
+    values and values with a quality flag become DLY_MISSING.
+
+    Returns:
+        Dictionary of row arrays 'id', 'date' (datetime64[D]), 'element',
+        'value' (int16) plus 'counts' per change kind
+    """
+    wanted = set(elements)
+    ids, days, codes, values = [], [], [], []
+    counts = dict.fromkeys(CHANGE_KINDS, 0)
+
+    for kind, stream in _diff_files(path):
+        for row in csv.reader(stream):
+            if len(row) < 4 or row[2] not in wanted or not row[1].isdigit():
+                continue
+            ids.append(row[0])
+            days.append(f"{row[1][:4]}-{row[1][4:6]}-{row[1][6:8]}")
+            codes.append(row[2])
+            flagged = len(row) > 5 and row[5].strip() != ''
+            values.append(DLY_MISSING if kind == 'delete' or flagged else int(row[3]))
+            counts[kind] += 1
+
+    return {
+        'id': np.array(ids, dtype='U11'),
+        'date': np.array(days, dtype='datetime64[D]'),
+        'element': np.array(codes, dtype='U4'),
+        'value': np.array(values, dtype=np.int16),
+        'counts': counts
+    }
+
+
+def _latest_changes(diffs: List[Dict]) -> Dict[str, np.ndarray]:
+    """Concatenate diffs in order; for a repeated station-day-element the last change wins"""
+    columns = {key: np.concatenate([d[key] for d in diffs]) for key in ('id', 'date', 'element', 'value')}
+    if len(columns['id']) == 0:
+        return columns
+
+    keys = np.char.add(np.char.add(columns['id'], columns['element']), columns['date'].astype('U10'))
+    _, last = np.unique(keys[::-1], return_index=True)
+    keep = np.sort(len(keys) - 1 - last)
+    return {key: values[keep] for key, values in columns.items()}
+
+
+def _load_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Write via a temp file and rename, so readers never see a partial file"""
+    tmp = path + STAGED_SUFFIX
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class SuperGhcndUpdater:
+    """Keeps a station_memmap store current from superghcnd diff files"""
+
+    def __init__(self, store: MemmapStore = None, summary_cache=None,
+                 elements: Iterable[str] = DEFAULT_ELEMENTS):
+        """
+        Args:
+            store: Memmap store to update (defaults to station_memmap/)
+            summary_cache: Optional summary_cache.SummaryCache to invalidate
+            elements: Elements kept in the store
+        """
+        self.store = store or MemmapStore(DEFAULT_ROOT)
+        self.summary_cache = summary_cache
+        self.elements = list(elements)
+        self.state_path = os.path.join(self.store.root, STATE_FILE)
+        self.journal_path = os.path.join(self.store.root, JOURNAL_FILE)
+
+    def state(self) -> Dict:
+        return _load_json(self.state_path, {'last_applied': None, 'applied': []})
+
+    def recover(self) -> bool:
+        """
+        Finish a batch interrupted after its journal was written
+
+        Every staged file is already complete at that point, so recovery
+        rolls forward. Returns True if a batch was recovered.
+        """
+        journal = _load_json(self.journal_path, None)
+        if journal is None:
+            return False
+        self._commit(journal)
+        return True
+
+    def _commit(self, journal: Dict) -> int:
+        """Rename staged files into place, record state, invalidate summaries. Returns summaries dropped"""
+        for staged, final in journal['files']:
+            if os.path.exists(staged):
+                os.replace(staged, final)
+
+        state = self.state()
+        state['last_applied'] = journal['last_applied']
+        state['applied'] = state['applied'] + journal['diffs']
+        state['updated'] = date.today().isoformat()
+        _write_json(self.state_path, state)
+
+        for station_id in journal['changed']:
+            self.store.close(station_id)
+
+        invalidated = 0
+        if self.summary_cache is not None:
+            invalidated = self.summary_cache.invalidate_days(journal['changed'])
+
+        # The journal goes last, so an interrupted commit is redone in full
+        os.remove(self.journal_path)
+        return invalidated
+
+    def _stage_station(self, station_id: str, changes: Dict[str, np.ndarray]) -> List[List[str]]:
+        """Apply one station's changes in memory and write staged files"""
+        if os.path.exists(os.path.join(self.store.root, station_id, META_FILE)):
+            current = self.store.load(station_id)
+        else:
+            current = {'start': changes['date'].min(), 'values': {}}
+
+        old_days = max((len(c) for c in current['values'].values()), default=0)
+        start = min(current['start'], changes['date'].min())
+        end = max(current['start'] + old_days, changes['date'].max() + 1)
+        shift = int((current['start'] - start).astype(np.int64))
+        days = int((end - start).astype(np.int64))
+
+        columns = {}
+        for element in sorted(set(current['values']) | set(changes['element'].tolist())):
+            column = np.full(days, DLY_MISSING, dtype=np.int16)
+            old = current['values'].get(element)
+            if old is not None:
+                column[shift:shift + len(old)] = old
+            rows = changes['element'] == element
+            column[(changes['date'][rows] - start).astype(np.int64)] = changes['value'][rows]
+            columns[element] = column
+
+        meta = write_station(self.store.root, station_id, start, columns, suffix=STAGED_SUFFIX)
+        directory = os.path.join(self.store.root, station_id)
+        finals = [os.path.join(directory, f"{element}.i16") for element in meta['elements']]
+        # meta.json last: it is what readers consult for the array length
+        finals.append(os.path.join(directory, META_FILE))
+        return [[final + STAGED_SUFFIX, final] for final in finals]
+
+    def update(self, diff_dir: str = DEFAULT_DIFF_DIR) -> Dict:
+        """
+        Apply every diff newer than the last applied one, as one batch
+
+        Changes are staged next to the live files, a journal is written,
+        then staged files are renamed into place and the state file records
+        the last applied diff. Rerunning with the same diffs is a no-op.
+
+        Returns:
+            Report with 'applied' diff names, change 'counts', 'stations'
+            touched and cached summaries 'invalidated'
+        """
+        self.recover()
+        state = self.state()
+        last = state['last_applied']
+        pending = [d for d in find_diffs(diff_dir) if last is None or d['to'] > last]
+        report = {'applied': [], 'counts': dict.fromkeys(CHANGE_KINDS, 0), 'stations': 0, 'invalidated': 0}
+        if not pending:
+            return report
+
+        if last is not None and pending[0]['from'] != last:
+            print(f"[WARN] Diff gap: last applied {last}, next diff starts {pending[0]['from']}")
+
+        diffs = [read_diff(d['path'], self.elements) for d in pending]
+        for diff in diffs:
+            for kind, count in diff['counts'].items():
+                report['counts'][kind] += count
+        changes = _latest_changes(diffs)
+
+        order = np.argsort(changes['id'], kind='stable')
+        changes = {key: values[order] for key, values in changes.items()}
+        station_ids, starts = np.unique(changes['id'], return_index=True)
+        bounds = list(starts) + [len(changes['id'])]
+
+        files = []
+        changed_days = {}
+        for i, station_id in enumerate(station_ids.tolist()):
+            rows = {key: values[bounds[i]:bounds[i + 1]] for key, values in changes.items()}
+            files.extend(self._stage_station(station_id, rows))
+            changed_days[station_id] = np.unique(rows['date']).astype(str).tolist()
+
+        journal = {
+            'diffs': [d['name'] for d in pending],
+            'last_applied': pending[-1]['to'],
+            'files': files,
+            'changed': changed_days
+        }
+        _write_json(self.journal_path, journal)
+        report['invalidated'] = self._commit(journal)
+        report['applied'] = journal['diffs']
+        report['stations'] = len(station_ids)
+        return report
+
+
+def main():
+    print("=" * 60)
+    print("SUPERGHCND DIFF UPDATE")
+    print("=" * 60)
+
+    from summary_cache import SummaryCache
+
+    with SummaryCache() as cache:
+        updater = SuperGhcndUpdater(summary_cache=cache)
+        print(f"\n[*] Last applied diff: {updater.state()['last_applied'] or 'none'}")
+        report = updater.update()
+
+    if not report['applied']:
+        print("    [OK] Store is up to date")
+        return
+
+    counts = report['counts']
+    print(f"    [OK] Applied {len(report['applied'])} diffs through {report['applied'][-1]}")
+    print(f"    [OK] {counts['insert']:,} inserts, {counts['update']:,} updates, {counts['delete']:,} deletes "
+          f"across {report['stations']:,} stations")
+    print(f"    [OK] {report['invalidated']:,} cached summaries invalidated")
+
+
+if __name__ == '__main__':
+    main()
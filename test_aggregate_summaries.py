@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test Pre-Aggregated Summaries
+Plans GSOM/GSOY against daily fetches and checks aggregate summaries agree
+with the daily path, using a fake NCEI service built from daily records
+"""
+
+from datetime import date, timedelta
+
+from aggregate_summaries import MONTHLY_DATASET, YEARLY_DATASET, plan_summary
+from noaa_data_fetcher import NOAADataFetcher
+from summary_cache import AggregateCache, SummaryCache
+
+STATION = 'USW00094728'
+TOTALS = ['temperature.avg_high', 'temperature.max', 'precipitation.total',
+          'precipitation.days_with_precip', 'snowfall.total', 'snowfall.max_daily']
+
+
+def daily_records(start_year, end_year):
+    records = []
+    day = date(start_year, 1, 1)
+    while day.year <= end_year:
+        n = day.toordinal()
+        records.append({
+            'DATE': day.isoformat(),
+            'STATION': STATION,
+            'TMAX': str(40 + n % 37),
+            'TMIN': str(20 + n % 23),
+            'PRCP': f"{(n % 7 == 0) * (n % 13) / 10:.2f}",
+            'SNOW': f"{(day.month in (1, 2, 12) and n % 11 == 0) * 2.5:.1f}",
+        })
+        day += timedelta(days=1)
+    return records
+
+
+def aggregate(records, width):
+    """What GSOM (width 7) / GSOY (width 4) report for these daily records"""
+    periods = {}
+    for r in records:
+        periods.setdefault(r['DATE'][:width], []).append(r)
+    out = []
+    for period, rows in sorted(periods.items()):
+        tmax = [float(r['TMAX']) for r in rows]
+        prcp = [float(r['PRCP']) for r in rows]
+        snow = [float(r['SNOW']) for r in rows]
+        out.append({
+            'DATE': period, 'STATION': STATION,
+            'TMAX': f"{sum(tmax) / len(tmax):.2f}", 'EMXT': f"{max(tmax):.0f}",
+            'PRCP': f"{sum(prcp):.2f}", 'DP01': str(sum(p >= 0.01 for p in prcp)),
+            'SNOW': f"{sum(snow):.1f}", 'EMSN': f"{max(snow):.1f}",
+        })
+    return out
+
+
+class FakeService:
+    def __init__(self, start_year, end_year):
+        self.daily = daily_records(start_year, end_year)
+        self.calls = []
+
+    def __call__(self, dataset, station_id, start_date, end_date, data_types):
+        self.calls.append((dataset, start_date, end_date))
+        rows = [r for r in self.daily if start_date <= r['DATE'] <= end_date]
+        if dataset == MONTHLY_DATASET:
+            return aggregate(rows, 7)
+        if dataset == YEARLY_DATASET:
+            return aggregate(rows, 4)
+        return rows
+
+
+def make_fetcher(service, cache=None):
+    fetcher = NOAADataFetcher(aggregate_cache=cache)
+    fetcher._request = service
+    return fetcher
+
+
+def test_plan():
+    assert plan_summary('2020-01-01', '2020-12-31', TOTALS) == 'yearly'
+    assert plan_summary('1991-01-01', '2020-12-31', ['snowfall.total']) == 'yearly'
+    assert plan_summary('2020-02-01', '2020-02-29', ['snowfall.total']) == 'monthly'
+    assert plan_summary('2020-11-01', '2021-03-31', ['snowfall.total']) == 'monthly'
+    assert plan_summary('2020-02-01', '2020-02-28', ['snowfall.total']) == 'daily'   # not month end
+    assert plan_summary('2020-01-01', '2020-12-31', ['snowfall.days_with_snow']) == 'daily'
+    assert plan_summary('2020-01-01', '2020-12-31', None) == 'daily'
+    assert plan_summary('2020-01-01', '2020-12-31', TOTALS, local=True) == 'daily'
+
+
+def test_aggregates_match_daily():
+    service = FakeService(2019, 2020)
+    fetcher = make_fetcher(service)
+
+    daily = fetcher._calculate_summary(service.daily[365:])          # 2020
+    yearly = fetcher.fetch_yearly_summary(STATION, 2020, fields=TOTALS)
+    assert service.calls[-1][0] == YEARLY_DATASET
+    assert yearly['source'] == 'gsoy' and yearly['year'] == 2020
+    for field in TOTALS:
+        section, key = field.split('.')
+        assert yearly[section][key] == daily[section][key], field
+
+    # Whole months spanning a year boundary come from GSOM, day-weighted
+    winter = [r for r in service.daily if '2019-12-01' <= r['DATE'] <= '2020-02-29']
+    daily = fetcher._calculate_summary(winter)
+    summary = fetcher.summarize(STATION, '2019-12-01', '2020-02-29', ['temperature.avg_high', 'snowfall.total'])
+    assert service.calls[-1] == (MONTHLY_DATASET, '2019-01-01', '2020-12-31')
+    assert summary['source'] == 'gsom' and summary['periods'] == 3
+    assert summary['temperature']['avg_high'] == daily['temperature']['avg_high']
+    assert summary['snowfall']['total'] == daily['snowfall']['total']
+
+    # Fields GSOM cannot answer fall back to daily records
+    monthly = fetcher.fetch_monthly_summary(STATION, 2020, 2, fields=['snowfall.days_with_snow'])
+    assert service.calls[-1][0] == 'daily-summaries' and monthly['month'] == 2
+    assert 'days_with_data' in monthly
+
+
+def test_normals_and_cache():
+    service = FakeService(1991, 2020)
+    fetcher = make_fetcher(service, AggregateCache(':memory:'))
+
+    normals = fetcher.fetch_monthly_normals(STATION, 1991, 2020)
+    assert len(service.calls) == 1 and len(normals['months']) == 12
+    january = normals['months'][0]
+    assert january['month'] == 1 and january['years'] == 30
+    assert january['snowfall'] is not None and normals['months'][6]['snowfall'] == 0.0
+
+    # Fully cached: no request. A wider range only requests the new years.
+    assert fetcher.fetch_monthly_normals(STATION, 1991, 2020) == normals
+    assert len(service.calls) == 1
+    data = fetcher.fetch_monthly_aggregates(STATION, 1991, 2021)
+    assert service.calls[-1] == (MONTHLY_DATASET, '2021-01-01', '2021-12-31')
+    assert data['record_count'] == 360
+    assert fetcher.aggregate_cache.count() == 30                 # 2021 has no records yet: not cached
+
+    # so asking again requests 2021 again
+    fetcher.fetch_monthly_aggregates(STATION, 1991, 2021)
+    assert len(service.calls) == 3 and service.calls[-1] == (MONTHLY_DATASET, '2021-01-01', '2021-12-31')
+
+
+def test_partial_years_not_cached():
+    service = FakeService(2018, 2019)
+    service.daily = [r for r in service.daily if r['DATE'] < '2019-07-01']
+    fetcher = make_fetcher(service, AggregateCache(':memory:'))
+
+    # 2019 has six GSOM months: returned, but requested again next time
+    assert fetcher.fetch_monthly_aggregates(STATION, 2018, 2019)['record_count'] == 18
+    assert fetcher.aggregate_cache.count() == 1
+    fetcher.fetch_monthly_aggregates(STATION, 2018, 2019)
+    assert service.calls[-1] == (MONTHLY_DATASET, '2019-01-01', '2019-12-31')
+
+    # A GSOY row is the whole year
+    fetcher.fetch_yearly_aggregates(STATION, 2018, 2019)
+    fetcher.fetch_yearly_aggregates(STATION, 2018, 2019)
+    assert len(service.calls) == 3 and fetcher.aggregate_cache.count() == 3
+
+
+def test_recent_summaries_not_cached():
+    today = date.today()
+    service = FakeService(2024, today.year)
+    fetcher = NOAADataFetcher(summary_cache=SummaryCache(':memory:'))
+    fetcher._request = service
+
+    fetcher.fetch_monthly_summary(STATION, 2024, 3)
+    fetcher.fetch_monthly_summary(STATION, 2024, 3)
+    assert len(service.calls) == 1 and fetcher.summary_cache.count() == 1
+
+    # The current month is still being published: recomputed every time
+    fetcher.fetch_monthly_summary(STATION, today.year, today.month)
+    fetcher.fetch_monthly_summary(STATION, today.year, today.month)
+    assert len(service.calls) == 3 and fetcher.summary_cache.count() == 1
+
+
+if __name__ == '__main__':
+    test_plan()
+    test_aggregates_match_daily()
+    test_normals_and_cache()
+    test_partial_years_not_cached()
+    test_recent_summaries_not_cached()
+    print("[OK] Aggregate summary tests passed")
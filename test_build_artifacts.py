@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Build Artifacts
+Hashed names stay stable across rebuilds of unchanged data, and the manifest
+describes exactly the files that were written
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from build_artifacts import MANIFEST_FILE, publish_artifact, publish_artifacts
+
+
+def write_json(directory, name, payload):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def stats(last_updated, total=120):
+    return {'total_stations': total, 'by_country': {'US': total}, 'last_updated': last_updated}
+
+
+def test_hash_ignores_build_time_fields():
+    source, output = tempfile.mkdtemp(), tempfile.mkdtemp()
+
+    first = publish_artifact(write_json(source, 'noaa_network_stats.json', stats('2025-11-21')), output)
+    again = publish_artifact(write_json(source, 'noaa_network_stats.json', stats('2025-11-22')), output)
+    assert first == again
+
+    with open(os.path.join(output, first['file'])) as f:
+        assert json.load(f) == {'total_stations': 120, 'by_country': {'US': 120}}
+
+    package = {'version': '2.0', 'generated': '2025-11-21', 'station_count': 3}
+    first = publish_artifact(write_json(source, 'xyloclime_noaa_package.json', package), output)
+    package['generated'] = '2026-01-01'
+    assert publish_artifact(write_json(source, 'xyloclime_noaa_package.json', package), output) == first
+
+    # Real data changes still change the hash
+    changed = publish_artifact(write_json(source, 'noaa_network_stats.json', stats('2025-11-22', 121)), output)
+    assert changed['sha256'] != again['sha256'] and changed['file'] != again['file']
+
+
+def test_manifest():
+    source, output = tempfile.mkdtemp(), tempfile.mkdtemp()
+    binary = os.path.join(source, 'noaa_stations_frontend.bin')
+    with open(binary, 'wb') as f:
+        f.write(bytes(range(256)) * 8)
+    sources = [binary, write_json(source, 'noaa_network_stats.json', stats('2025-11-21'))]
+
+    manifest = publish_artifacts(sources, output)
+    with open(os.path.join(output, MANIFEST_FILE)) as f:
+        assert json.load(f) == manifest
+    assert manifest['version'] == 1 and manifest['generated']
+    assert sorted(manifest['artifacts']) == ['noaa_network_stats.json', 'noaa_stations_frontend.bin']
+
+    entry = manifest['artifacts']['noaa_stations_frontend.bin']
+    assert entry['file'] == f"noaa_stations_frontend.{entry['sha256'][:12]}.bin"
+    for entry in manifest['artifacts'].values():
+        with open(os.path.join(output, entry['file']), 'rb') as f:
+            data = f.read()
+        assert hashlib.sha256(data).hexdigest() == entry['sha256'] and len(data) == entry['bytes']
+
+        gz = entry['encodings']['gzip']
+        assert gz['file'] == f"{entry['file']}.gz"
+        with open(os.path.join(output, gz['file']), 'rb') as f:
+            compressed = f.read()
+        assert len(compressed) == gz['bytes'] and gzip.decompress(compressed) == data
+
+    # Republishing the same data names the same files
+    assert publish_artifacts(sources, output)['artifacts'] == manifest['artifacts']
+
+
+if __name__ == '__main__':
+    test_hash_ignores_build_time_fields()
+    test_manifest()
+    print("[OK] Build artifact tests passed")
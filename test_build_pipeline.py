@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Station-Network Build Pipeline
+Runs the stages on small GHCN files: outputs match ghcn_ingest, a rerun comes
+from cache and a change to the files or country rules reruns the ingest
+"""
+
+import os
+import tempfile
+
+import ghcn_ingest
+from build_pipeline import DEFAULT_CONFIG, Pipeline, network_stages
+from incremental_rebuild import incremental_rebuild
+from test_ghcn_ingest import INVENTORY, STATIONS
+from test_incremental_rebuild import NEW_INVENTORY, NEW_STATIONS, artifacts, write_ghcn
+
+
+def make_pipeline(files, output_dir, cache_dir, **overrides):
+    config = dict(DEFAULT_CONFIG, stations_file=files[0], inventory_file=files[1], output_dir=output_dir)
+    config.update(overrides)
+    return Pipeline(network_stages(), config, cache_dir=cache_dir)
+
+
+def statuses(result):
+    return {t['stage']: t['status'] for t in result['timings']}
+
+
+def test_matches_ingest():
+    tmp = tempfile.mkdtemp()
+    files = write_ghcn(os.path.join(tmp, 'ghcn'), STATIONS, INVENTORY)
+    built, expected = os.path.join(tmp, 'built'), os.path.join(tmp, 'expected')
+    os.makedirs(built)
+    os.makedirs(expected)
+
+    result = make_pipeline(files, built, os.path.join(tmp, 'cache')).run(verbose=False)
+    ingest = ghcn_ingest.ingest(*files)
+    assert result['outputs']['ingest'] == ingest
+    ghcn_ingest.write_outputs(ingest, expected)
+    assert artifacts(built) == artifacts(expected)
+
+    # Country rules apply: Munich reports snow depth only
+    assert 'GME00102380' in {s['id'] for s in artifacts(built)['frontend']}
+    assert artifacts(built)['stats']['by_country'] == {'AT': 1, 'DE': 1, 'US': 1}
+
+
+def test_incremental_rebuild_continues_pipeline_build():
+    tmp = tempfile.mkdtemp()
+    build, fresh = os.path.join(tmp, 'build'), os.path.join(tmp, 'fresh')
+    os.makedirs(build)
+    os.makedirs(fresh)
+    files = write_ghcn(os.path.join(tmp, 'v1'), STATIONS, INVENTORY)
+
+    incremental_rebuild(*files, build)
+    make_pipeline(files, build, os.path.join(tmp, 'cache')).run(verbose=False)
+
+    new_files = write_ghcn(os.path.join(tmp, 'v2'), NEW_STATIONS, NEW_INVENTORY)
+    assert incremental_rebuild(*new_files, build)['mode'] == 'incremental'
+    incremental_rebuild(*new_files, fresh)
+    assert artifacts(build) == artifacts(fresh)
+
+
+def test_cache_hit_and_rule_changes():
+    tmp = tempfile.mkdtemp()
+    files = write_ghcn(tmp, STATIONS, INVENTORY)
+    cache_dir = os.path.join(tmp, 'cache')
+
+    first = make_pipeline(files, tmp, cache_dir).run(verbose=False)
+    assert statuses(first) == {'ingest': 'ran', 'write': 'always'}
+    again = make_pipeline(files, tmp, cache_dir).run(verbose=False)
+    assert statuses(again) == {'ingest': 'cached', 'write': 'always'}
+    assert again['outputs'] == first['outputs']
+
+    # A config with a looser Sweden rule: Stockholm's 2010 snow counts
+    config = dict(ghcn_ingest.COUNTRY_CONFIG)
+    config['SW'] = {'iso': 'SE', 'label': 'Sweden', 'min_year': 2005}
+    looser = make_pipeline(files, tmp, cache_dir, country_config=config).run(verbose=False)
+    assert statuses(looser)['ingest'] == 'ran'
+    assert 'SWE00100026' in {s['id'] for s in looser['outputs']['ingest']['frontend']}
+
+    # Rules edited in code invalidate the cache too: Chemainus' snow ended in 2015
+    saved = ghcn_ingest.DEFAULT_RULE['min_year']
+    try:
+        ghcn_ingest.DEFAULT_RULE['min_year'] = 2010
+        edited = make_pipeline(files, tmp, cache_dir).run(verbose=False)
+    finally:
+        ghcn_ingest.DEFAULT_RULE['min_year'] = saved
+    assert statuses(edited)['ingest'] == 'ran'
+    assert 'CA001011500' in {s['id'] for s in edited['outputs']['ingest']['snow_stations']}
+    assert statuses(make_pipeline(files, tmp, cache_dir).run(verbose=False))['ingest'] == 'cached'
+
+    # Changed input files invalidate the ingest
+    with open(files[1], 'a') as f:
+        f.write(f"{'SWE00100026':11s} {0:8.4f} {0:9.4f} SNOW 2011 2025\n")
+    changed = make_pipeline(files, tmp, cache_dir).run(verbose=False)
+    assert statuses(changed)['ingest'] == 'ran'
+    assert 'SWE00100026' in {s['id'] for s in changed['outputs']['ingest']['snow_stations']}
+
+
+if __name__ == '__main__':
+    test_matches_ingest()
+    test_incremental_rebuild_continues_pipeline_build()
+    test_cache_hit_and_rule_changes()
+    print("[OK] Build pipeline tests passed")
@@ -1,9 +1,15 @@
 """
 NOAA Climate Data Accuracy Test
 Tests real NOAA station data against known climate patterns
+
+No fixture has been recorded yet, so under pytest this suite is skipped
+(see ncei_fixtures) until one is recorded against the live service:
+    NCEI_FIXTURES=record python test_climate_accuracy.py
+which needs network access and noaa_snow_stations.json. Commit the
+resulting fixtures/climate_accuracy.json.gz to run it in CI.
 """
 
-from noaa_data_fetcher import NOAADataFetcher
+from ncei_fixtures import FixtureSession
 from station_matcher import StationMatcher
 from datetime import datetime
 
@@ -107,8 +113,10 @@ def test_location_accuracy():
     print("Testing 8 diverse US climate zones")
     print("=" * 80)
 
-    matcher = StationMatcher()
-    fetcher = NOAADataFetcher()
+    # Recorded responses replay offline (see ncei_fixtures)
+    session = FixtureSession('climate_accuracy')
+    matcher = session.lookups('matcher', StationMatcher)
+    fetcher = session.fetcher()
 
     results = []
 
@@ -240,7 +248,7 @@ def test_location_accuracy():
 
     print("=" * 80 + "\n")
 
-    return results
+    session.finish(results)
 
 if __name__ == '__main__':
     test_location_accuracy()
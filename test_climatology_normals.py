@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Day-of-Year Climatology Normals
+Computes normals from a synthetic series and checks store windows and
+predictions against hand-computed values
+"""
+
+import tempfile
+
+import numpy as np
+
+from climatology_normals import NORMAL_FIELDS, ClimatologyStore, compute_normals
+from daily_series import day_of_year_index
+
+STATION = 'USC00050848'
+
+
+def synthetic_series():
+    """Four years where TMAX is ten times the month and it snows 1" every January day"""
+    dates = np.arange(np.datetime64('2020-01-01'), np.datetime64('2024-01-01'), dtype='datetime64[D]')
+    months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+    values = {
+        'TMAX': months.astype(np.float64) * 10,
+        'TMIN': months.astype(np.float64),
+        'PRCP': np.where(np.arange(len(dates)) % 2 == 0, 0.2, 0.0),
+        'SNOW': np.where(months == 1, 1.0, 0.0)
+    }
+    values['TMIN'][:31] = np.nan  # January 2020 TMIN missing
+    return {'dates': dates, 'values': values}
+
+
+def write_store():
+    directory = tempfile.mkdtemp()
+    normals = compute_normals(synthetic_series(), half_window=0)
+    ClimatologyStore.write(directory, [STATION], normals[None], {'period': [2020, 2023]})
+    return ClimatologyStore(directory)
+
+
+def test_compute_normals():
+    normals = compute_normals(synthetic_series(), half_window=0)
+    column = {name: i for i, name in enumerate(NORMAL_FIELDS)}
+    assert normals.shape == (366, len(NORMAL_FIELDS)) and normals.dtype == np.float32
+
+    jan_15, jul_4 = day_of_year_index(np.array(['2021-01-15', '2021-07-04'], dtype='datetime64[D]'))
+    assert normals[jan_15, column['TMAX_MEAN']] == 10 and normals[jul_4, column['TMAX_P90']] == 70
+    assert normals[jan_15, column['TMIN_MEAN']] == 1            # NaN days are skipped
+    assert normals[jan_15, column['SNOW_PROB']] == 1 and normals[jul_4, column['SNOW_MEAN']] == 0
+    assert 0 <= normals[jan_15, column['PRCP_PROB']] <= 1
+
+    # Feb 29 has one year of data; smoothing fills it from its neighbours too
+    feb_29 = 59
+    assert normals[feb_29, column['TMAX_MEAN']] == 20
+    smoothed = compute_normals(synthetic_series(), half_window=7)
+    assert smoothed[jan_15, column['TMAX_MEAN']] == 10        # +/- 7 days stays in January
+    assert 10 < smoothed[0, column['TMAX_MEAN']] < 120          # Jan 1 pools late December
+
+    # Elements absent from the series stay NaN
+    series = synthetic_series()
+    del series['values']['SNOW']
+    assert np.isnan(compute_normals(series)[:, column['SNOW_MEAN']]).all()
+
+
+def test_window():
+    store = write_store()
+
+    window = store.window(STATION, '2025-01-30', '2025-02-02')
+    assert window['dates'][0] == np.datetime64('2025-01-30') and len(window['dates']) == 4
+    assert window['TMAX_MEAN'].tolist() == [10, 10, 20, 20]
+
+    # Wraps the year end, and a non-leap year skips the Feb 29 slot
+    window = store.window(STATION, '2024-12-30', '2025-01-02')
+    assert window['TMAX_MEAN'].tolist() == [120, 120, 10, 10]
+    window = store.window(STATION, '2025-02-28', '2025-03-01')
+    assert window['TMAX_MEAN'].tolist() == [20, 30]
+
+    assert len(store.window(STATION, '2025-06-01', '2025-06-01')['dates']) == 1
+    try:
+        store.window(STATION, '2025-06-02', '2025-06-01')
+        assert False, "reversed window should fail"
+    except ValueError as e:
+        assert '2025-06-02' in str(e)
+
+
+def test_predict():
+    store = write_store()
+    prediction = store.predict(STATION, '2025-01-01', '2025-01-31')
+
+    assert prediction['days'] == 31
+    assert prediction['temperature']['avg_high'] == 10.0
+    assert prediction['temperature']['typical_high_range'] == [10.0, 10.0]
+    assert prediction['temperature']['avg_low'] == 1.0
+    assert prediction['snowfall'] == {'expected_total': 31.0, 'expected_days': 31.0}
+
+    summer = store.predict(STATION, '2025-07-01', '2025-07-10')
+    assert summer['snowfall'] == {'expected_total': 0.0, 'expected_days': 0.0}
+    assert summer['temperature']['avg_high'] == 70.0
+
+
+if __name__ == '__main__':
+    test_compute_normals()
+    test_window()
+    test_predict()
+    print("[OK] Climatology normals tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test Monte Carlo Schedule-Delay Simulator
+Seeded runs: determinism, serial vs process-pool equality and edge cases
+"""
+
+import numpy as np
+
+from daily_series import records_to_series
+from delay_simulator import completion_dates, simulate_portfolio, simulate_schedule, yearly_workable_matrix
+
+CRITERIA = {'min_temp': 0, 'max_rain': 5}
+
+
+def seasonal_matrix(years=20, seed=3):
+    """Workable most of the summer, rarely in winter"""
+    rng = np.random.default_rng(seed)
+    chance = 0.5 + 0.45 * np.sin(2 * np.pi * (np.arange(365) - 100) / 365)
+    return rng.random((years, 365)) < chance
+
+
+def test_seeded_runs_are_deterministic():
+    workable = seasonal_matrix()
+    first = simulate_schedule(workable, start_day=90, work_days=60, planned_days=80,
+                              daily_delay_cost=1000.0, simulations=3000, seed=42)
+    again = simulate_schedule(workable, start_day=90, work_days=60, planned_days=80,
+                              daily_delay_cost=1000.0, simulations=3000, seed=42)
+    other = simulate_schedule(workable, start_day=90, work_days=60, planned_days=80,
+                              daily_delay_cost=1000.0, simulations=3000, seed=43)
+    assert first == again and first != other
+
+    assert first['completion_days']['p50'] <= first['completion_days']['p80'] <= first['completion_days']['p95']
+    assert first['delay_cost']['p95'] == first['delay_days']['p95'] * 1000.0
+    assert first['censored'] == 0 and 0 < first['probability_late'] < 1
+
+    weekly = simulate_schedule(workable, 90, 60, 80, simulations=3000, block='week', seed=42)
+    assert weekly['block'] == 'week' and weekly['simulations'] == 3000
+
+
+def test_serial_matches_process_pool():
+    projects = [
+        {'id': 'spring', 'workable': seasonal_matrix(seed=1), 'start_day': 60, 'planned_days': 70, 'work_days': 50},
+        {'id': 'summer', 'workable': seasonal_matrix(seed=2), 'start_day': 150, 'planned_days': 40},
+        {'id': 'winter', 'workable': seasonal_matrix(seed=3), 'start_day': 330, 'planned_days': 90,
+         'work_days': 30, 'daily_delay_cost': 250.0},
+    ]
+    serial = simulate_portfolio(projects, simulations=1500, processes=1, seed=7)
+    pooled = simulate_portfolio(projects, simulations=1500, processes=2, seed=7)
+    assert serial == pooled
+    assert [r['project_id'] for r in serial] == ['spring', 'summer', 'winter']
+    assert serial[0] != serial[1]
+
+
+def test_edge_cases():
+    always = np.ones((5, 365), dtype=bool)
+    never = np.zeros((5, 365), dtype=bool)
+
+    result = simulate_schedule(always, start_day=0, work_days=30, planned_days=30, simulations=100, seed=0)
+    assert result['completion_days'] == {'p50': 30.0, 'p80': 30.0, 'p95': 30.0}
+    assert result['probability_late'] == 0.0
+
+    result = simulate_schedule(always, start_day=200, work_days=0, planned_days=10, simulations=100, seed=0)
+    assert result['completion_days']['p95'] == 0.0 and result['mean_delay_days'] == 0.0
+
+    result = simulate_schedule(never, start_day=0, work_days=5, planned_days=10, simulations=100, seed=0)
+    assert result['censored'] == 100
+    assert result['completion_days']['p50'] == result['horizon_days']
+
+    for kwargs in ({'block': 'month'}, {'work_days': -1}):
+        args = dict(start_day=0, work_days=5, planned_days=10, simulations=10, seed=0)
+        args.update(kwargs)
+        try:
+            simulate_schedule(always, **args)
+            assert False, f"{kwargs} should fail"
+        except ValueError:
+            pass
+    try:
+        simulate_schedule(always[:0], 0, 5, 10, simulations=10)
+        assert False, "empty history should fail"
+    except ValueError:
+        pass
+
+    assert completion_dates({'completion_days': {'p50': 1.0, 'p80': 31.2}}, '2025-03-01') == \
+        {'p50': '2025-03-01', 'p80': '2025-04-01'}
+
+
+def test_yearly_workable_matrix():
+    records = []
+    for day in np.arange(np.datetime64('2019-06-01'), np.datetime64('2021-01-01')):
+        records.append({'DATE': str(day), 'TMIN': '50', 'TMAX': '70', 'PRCP': '0.00'})
+    series = records_to_series(records, '2019-06-01', '2020-12-31', ['TMIN', 'TMAX', 'PRCP'], 'STATION_A')
+
+    # 2019 covers only June onward and is dropped; 2020 loses Feb 29
+    matrix = yearly_workable_matrix(series, CRITERIA)
+    assert matrix['years'].tolist() == [2020]
+    assert matrix['workable'].shape == (1, 365) and matrix['workable'].all()
+
+
+if __name__ == '__main__':
+    test_seeded_runs_are_deterministic()
+    test_serial_matches_process_pool()
+    test_edge_cases()
+    test_yearly_workable_matrix()
+    print("[OK] Delay simulator tests passed")
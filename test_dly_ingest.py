@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test GHCN-Daily Bulk Ingest
+Streams a small .dly tarball into the store and reads it back through
+NOAADataFetcher's local backend
+"""
+
+import io
+import os
+import tarfile
+import tempfile
+
+import numpy as np
+
+from dly_ingest import DlyStore, ingest_dly
+from noaa_data_fetcher import NOAADataFetcher
+
+STATION = 'USC00050848'
+
+
+def dly_line(station_id, year, month, element, values, qflags=None):
+    """One .dly row; values maps day (1-31) to a raw GHCN value"""
+    slots = []
+    for day in range(1, 32):
+        value = values.get(day, -9999)
+        qflag = (qflags or {}).get(day, ' ')
+        slots.append(f"{value:5d} {qflag} ")
+    return f"{station_id:11s}{year:4d}{month:02d}{element:4s}{''.join(slots)}\n"
+
+
+DLY = ''.join([
+    # Tenths of °C: 0.0 °C = 32 °F, -10.0 °C = 14 °F
+    dly_line(STATION, 2024, 1, 'TMAX', {1: 0, 2: -100, 31: 50}),
+    # Tenths of mm: 25.4 mm = 1.00 in; day 3 failed quality control
+    dly_line(STATION, 2024, 1, 'PRCP', {1: 254, 3: 999}, qflags={3: 'X'}),
+    # mm: 127 mm = 5.0 in
+    dly_line(STATION, 2024, 1, 'SNOW', {2: 127}),
+    # February slot 30/31 are padding and must be ignored
+    dly_line(STATION, 2024, 2, 'SNOW', {1: 51, 29: 25, 30: 999, 31: 999}),
+    dly_line(STATION, 2024, 2, 'WT01', {1: 1}),
+])
+
+
+def build_store():
+    tmp = tempfile.mkdtemp()
+    archive = os.path.join(tmp, 'ghcnd_all.tar.gz')
+    with tarfile.open(archive, 'w:gz') as tar:
+        for name, text in ((f'ghcnd_all/{STATION}.dly', DLY),
+                           ('ghcnd_all/USW00094728.dly', dly_line('USW00094728', 2024, 1, 'SNOW', {1: 10}))):
+            data = text.encode('ascii')
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    store_dir = os.path.join(tmp, 'dly_store')
+    index = ingest_dly(archive, store_dir, stations=[STATION])
+    return index, DlyStore(store_dir)
+
+
+def test_ingest_index():
+    index, store = build_store()
+    assert list(index['stations']) == [STATION]
+    entry = index['stations'][STATION]
+    assert entry['start'] == '2024-01-01' and entry['end'] == '2024-02-29'
+    assert entry['elements'] == ['PRCP', 'SNOW', 'TMAX']
+    assert 'USW00094728' not in store
+
+
+def test_standard_units():
+    _, store = build_store()
+    series = store.daily_series(STATION, '2023-12-31', '2024-03-01', ['TMAX', 'PRCP', 'SNOW'])
+    values = series['values']
+    assert len(series['dates']) == 62
+    assert np.isnan(values['TMAX'][0])
+    assert values['TMAX'][1] == 32 and values['TMAX'][2] == 14 and values['TMAX'][31] == 41
+    assert values['PRCP'][1] == 1.0
+    assert np.isnan(values['PRCP'][3])         # quality-flagged
+    assert values['SNOW'][2] == 5.0
+    assert values['SNOW'][60] == 1.0           # Feb 29
+    assert np.isnan(values['SNOW'][61])        # Mar 1 - beyond the store
+
+
+def test_fetcher_backend():
+    _, store = build_store()
+    fetcher = NOAADataFetcher(backend=store)
+
+    data = fetcher.fetch_daily_data(STATION, '2024-01-01', '2024-01-31')
+    assert data['record_count'] == 3
+    assert data['records'][0] == {'DATE': '2024-01-01', 'STATION': STATION, 'TMAX': '32', 'PRCP': '1.00'}
+
+    # The monthly range runs through the 1st of the next month, as with the API
+    summary = fetcher.fetch_monthly_summary(STATION, 2024, 1)
+    assert summary['snowfall']['total'] == 7.0
+    assert summary['temperature']['min'] is None and summary['temperature']['max'] == 41
+
+    missing = fetcher.fetch_daily_data('USW00094728', '2024-01-01', '2024-01-31')
+    assert missing['records'] == [] and 'error' in missing
+
+    series = fetcher.fetch_daily_series(STATION, '2024-02-01', '2024-02-29', ['SNOW'])
+    assert np.nansum(series['values']['SNOW']) == 3.0
+
+
+if __name__ == '__main__':
+    test_ingest_index()
+    test_standard_units()
+    test_fetcher_backend()
+    print("[OK] GHCN-Daily ingest tests passed")
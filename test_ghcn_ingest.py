@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test Unified GHCN Ingest
+Builds the station artifacts from small fixed-width GHCN files
+"""
+
+import json
+import os
+import tempfile
+
+import ghcn_parser
+from ghcn_ingest import COUNTRY_CONFIG, ingest, write_outputs
+from station_store import StationStore
+from test_dly_ingest import dly_line
+
+
+def station_line(station_id, lat, lon, elev, state, name):
+    return f"{station_id:11s} {lat:8.4f} {lon:9.4f} {elev:6.1f} {state:2s} {name:30s}\n"
+
+
+def inventory_line(station_id, element, first, last):
+    return f"{station_id:11s} {0:8.4f} {0:9.4f} {element:4s} {first:4d} {last:4d}\n"
+
+
+STATIONS = [
+    station_line('USC00050848', 39.9919, -105.2667, 1671.5, 'CO', 'BOULDER'),
+    station_line('USC00051294', 38.4600, -105.2256, 1625.2, 'CO', 'CANON CITY'),
+    station_line('CA001011500', 48.9333, -123.75, 75.0, 'BC', 'CHEMAINUS'),
+    station_line('GME00102380', 48.1631, 11.5428, 515.0, '', 'MUENCHEN-STADT'),
+    station_line('SWE00100026', 59.3500, 18.0500, 44.0, '', 'STOCKHOLM'),
+    station_line('AU000005901', 48.2331, 16.3500, 198.0, '', 'WIEN'),
+]
+
+INVENTORY = [
+    # Boulder: full capability with recent data
+    inventory_line('USC00050848', 'TMAX', 1893, 2025),
+    inventory_line('USC00050848', 'PRCP', 1893, 2025),
+    inventory_line('USC00050848', 'SNOW', 1893, 2025),
+    # Canon City: snow but no precipitation - snow file only
+    inventory_line('USC00051294', 'TMAX', 1893, 2025),
+    inventory_line('USC00051294', 'SNOW', 1893, 2025),
+    # Chemainus: snow ended before 2020
+    inventory_line('CA001011500', 'TMAX', 1919, 2025),
+    inventory_line('CA001011500', 'PRCP', 1919, 2025),
+    inventory_line('CA001011500', 'SNOW', 1919, 2015),
+    # Munich: snow depth only is enough for configured countries
+    inventory_line('GME00102380', 'SNWD', 1950, 2025),
+    # Stockholm: no recent snow
+    inventory_line('SWE00100026', 'SNOW', 1950, 2010),
+    inventory_line('AU000005901', 'SNOW', 1950, 2024),
+]
+
+
+def run_ingest(config=None, stations=STATIONS, inventory=INVENTORY):
+    tmp = tempfile.mkdtemp()
+    stations_file = os.path.join(tmp, 'ghcnd-stations.txt')
+    inventory_file = os.path.join(tmp, 'ghcnd-inventory.txt')
+    with open(stations_file, 'w') as f:
+        f.writelines(stations)
+    with open(inventory_file, 'w') as f:
+        f.writelines(inventory)
+    return tmp, ingest(stations_file, inventory_file, config)
+
+
+def test_country_rules():
+    _, result = run_ingest()
+    frontend = {s['id']: s for s in result['frontend']}
+
+    assert set(frontend) == {'USC00050848', 'GME00102380', 'AU000005901'}
+    assert frontend['USC00050848']['name'] == 'CO BOULDER'
+    assert frontend['GME00102380'] == {
+        'id': 'GME00102380', 'name': 'DE MUENCHEN-STADT', 'lat': 48.1631,
+        'lng': 11.5428, 'elevation': 515.0, 'country': 'DE'
+    }
+    assert frontend['AU000005901']['country'] == 'AT'
+
+    snow_ids = [s['id'] for s in result['snow_stations']]
+    assert 'USC00051294' in snow_ids and 'CA001011500' not in snow_ids
+    assert result['stats']['by_country'] == {'AT': 1, 'DE': 1, 'US': 1}
+    assert result['stats']['inventory_rows'] == len(INVENTORY)
+
+
+def test_adding_country_is_config_only():
+    config = dict(COUNTRY_CONFIG)
+    config['SW'] = {'iso': 'SE', 'label': 'Sweden', 'min_year': 2005}
+    _, result = run_ingest(config)
+    assert 'SWE00100026' in {s['id'] for s in result['frontend']}
+
+
+def test_fips_prefixes_and_temperature_rules():
+    stations = STATIONS + [
+        station_line('SZ000006717', 47.2500, 9.3500, 2502.0, '', 'SAENTIS'),
+        station_line('CHM00054511', 39.9330, 116.2830, 55.0, '', 'BEIJING'),
+        station_line('USC00059999', 40.0000, -105.0000, 1600.0, 'CO', 'TAVG ONLY'),
+    ]
+    inventory = INVENTORY + [
+        # Saentis: FIPS SZ is Switzerland; TAVG alone is temperature data there
+        inventory_line('SZ000006717', 'TAVG', 1950, 2025),
+        inventory_line('SZ000006717', 'SNWD', 1950, 2025),
+        # Beijing: FIPS CH is China, which has no country entry
+        inventory_line('CHM00054511', 'SNWD', 1950, 2025),
+        # US stations keep the TMAX/TMIN rule, so TAVG alone is not enough
+        inventory_line('USC00059999', 'TAVG', 1950, 2025),
+        inventory_line('USC00059999', 'PRCP', 1950, 2025),
+        inventory_line('USC00059999', 'SNOW', 1950, 2025),
+    ]
+    _, result = run_ingest(stations=stations, inventory=inventory)
+    by_id = result['stations']
+
+    assert by_id['SZ000006717']['country'] == 'CH' and by_id['SZ000006717']['name'] == 'CH SAENTIS'
+    assert by_id['SZ000006717']['has_temp']
+    assert by_id['CHM00054511']['name'] == 'BEIJING' and not by_id['CHM00054511']['has_snow']
+    assert by_id['USC00059999']['has_snow'] and not by_id['USC00059999']['has_temp']
+
+    frontend = {s['id'] for s in result['frontend']}
+    assert 'SZ000006717' in frontend and 'USC00059999' not in frontend
+
+
+def test_write_outputs():
+    tmp, result = run_ingest()
+    paths = write_outputs(result, tmp)
+
+    with open(paths['frontend']) as f:
+        text = f.read()
+    assert ', ' not in text and ': ' not in text  # compact separators
+    assert len(json.loads(text)) == 3
+
+    with open(paths['by_country']) as f:
+        assert set(json.load(f)) == {'US', 'DE', 'AT'}
+
+
+def test_write_outputs_replaces_store():
+    tmp, result = run_ingest()
+    stale = {'id': 'USC00099999', 'name': 'CO GONE', 'lat': 39.0, 'lng': -105.0, 'elevation': 0.0, 'country': 'US'}
+    with StationStore(':memory:') as store:
+        store.upsert([stale] + result['frontend'])
+        paths = write_outputs(result, tmp, store)
+        assert store.get('USC00099999') is None and store.nearby(39.0, -105.0, 1) == []
+        assert store.count() == result['stats']['total_stations']
+
+    with open(paths['frontend']) as f:
+        exported = json.load(f)
+    with open(paths['stats']) as f:
+        assert len(exported) == json.load(f)['total_stations'] == 3
+
+
+def test_parser_ragged_last_line_and_bad_years():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'ghcnd-inventory.txt')
+    rows = [inventory_line('USC00050848', el, 1893, 2025) for el in ('TMAX', 'PRCP', 'SNOW')]
+    rows.insert(1, rows[0][:36] + 'ABCD' + rows[0][40:])             # malformed first year
+
+    # Trailing blanks on every line but the last, which also lacks its newline:
+    # the last line is still long enough but shorter than the stride
+    with open(path, 'w') as f:
+        f.write(''.join(row.rstrip('\n') + '    \n' for row in rows[:-1]) + rows[-1].rstrip('\n'))
+
+    inventory = ghcn_parser.parse_inventory(path)
+    assert ghcn_parser.decode(inventory['element']) == ['TMAX', 'PRCP', 'SNOW']
+    assert inventory['first_year'].tolist() == [1893] * 3 and inventory['last_year'].tolist() == [2025] * 3
+
+    # Uniform lines without a final newline still take the reshape path
+    with open(path, 'w') as f:
+        f.write(''.join(rows[::2]).rstrip('\n'))
+    assert ghcn_parser.decode(ghcn_parser.parse_inventory(path)['element']) == ['TMAX', 'PRCP']
+
+    january = dly_line('USC00050848', 2024, 1, 'SNOW', {1: 10})
+    february = dly_line('USC00050848', 2024, 2, 'SNOW', {1: 20})
+    parsed = ghcn_parser.parse_dly((january + january[:11] + '20X4' + january[15:] + february).encode('ascii'))
+    assert parsed['year'].tolist() == [2024, 2024] and parsed['month'].tolist() == [1, 2]
+    assert parsed['values'][:, 0].tolist() == [10, 20]
+
+
+def test_parallel_parse_matches_serial():
+    tmp, serial = run_ingest()
+    ranges = ghcn_parser.line_ranges(os.path.join(tmp, 'ghcnd-inventory.txt'), 4)
+    assert len(ranges) == 4
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    threshold = ghcn_parser.PARALLEL_MIN_BYTES
+    ghcn_parser.PARALLEL_MIN_BYTES = 0
+    try:
+        parallel = ingest(os.path.join(tmp, 'ghcnd-stations.txt'),
+                          os.path.join(tmp, 'ghcnd-inventory.txt'), processes=3)
+    finally:
+        ghcn_parser.PARALLEL_MIN_BYTES = threshold
+
+    assert parallel['frontend'] == serial['frontend']
+    assert parallel['snow_stations'] == serial['snow_stations']
+    assert parallel['stats']['inventory_rows'] == serial['stats']['inventory_rows']
+
+
+if __name__ == '__main__':
+    test_country_rules()
+    test_adding_country_is_config_only()
+    test_fips_prefixes_and_temperature_rules()
+    test_write_outputs()
+    test_write_outputs_replaces_store()
+    test_parser_ragged_last_line_and_bad_years()
+    test_parallel_parse_matches_serial()
+    print("[OK] GHCN ingest tests passed")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test Incremental NOAA Network Rebuild
+Checks a fingerprint-diff rebuild against a full ingest of the same files,
+and that a country-rule change forces a full rebuild
+"""
+
+import json
+import os
+import tempfile
+
+from ghcn_ingest import COUNTRY_CONFIG, OUTPUT_FILES
+from incremental_rebuild import incremental_rebuild
+from station_store import StationStore
+from test_ghcn_ingest import INVENTORY, STATIONS, inventory_line, station_line
+
+# Second release: Stockholm reports snow again, Canon City is withdrawn,
+# Boulder loses precipitation and a new Denver station appears
+NEW_STATIONS = [line for line in STATIONS if line[:11] != 'USC00051294'] + [
+    station_line('USW00023062', 39.8328, -104.6575, 1650.2, 'CO', 'DENVER INTL AP'),
+]
+NEW_INVENTORY = [line for line in INVENTORY
+                 if line[:11] != 'USC00051294' and (line[:11], line[31:35]) != ('USC00050848', 'PRCP')] + [
+    inventory_line('SWE00100026', 'SNWD', 2015, 2025),
+    inventory_line('USW00023062', 'TMAX', 1994, 2025),
+    inventory_line('USW00023062', 'PRCP', 1994, 2025),
+    inventory_line('USW00023062', 'SNOW', 1994, 2025),
+]
+
+
+def write_ghcn(directory, stations, inventory):
+    os.makedirs(directory, exist_ok=True)
+    files = os.path.join(directory, 'ghcnd-stations.txt'), os.path.join(directory, 'ghcnd-inventory.txt')
+    with open(files[0], 'w') as f:
+        f.writelines(stations)
+    with open(files[1], 'w') as f:
+        f.writelines(inventory)
+    return files
+
+
+def artifacts(directory):
+    loaded = {}
+    for key, name in OUTPUT_FILES.items():
+        with open(os.path.join(directory, name)) as f:
+            loaded[key] = json.load(f)
+    return loaded
+
+
+def test_data_diff_matches_full_ingest():
+    tmp = tempfile.mkdtemp()
+    build, fresh = os.path.join(tmp, 'build'), os.path.join(tmp, 'fresh')
+    os.makedirs(build)
+    os.makedirs(fresh)
+
+    with StationStore(':memory:') as store:
+        first = incremental_rebuild(*write_ghcn(os.path.join(tmp, 'v1'), STATIONS, INVENTORY), build, store=store)
+        assert first['mode'] == 'full' and first['previous_build'] is None
+
+        files = write_ghcn(os.path.join(tmp, 'v2'), NEW_STATIONS, NEW_INVENTORY)
+        second = incremental_rebuild(*files, build, store=store)
+        assert second['mode'] == 'incremental'
+        assert second['summary'] == {'added': 1, 'removed': 1, 'changed': 2}
+        assert second['added'] == ['USW00023062'] and second['removed'] == ['USC00051294']
+        changes = {entry['id']: entry for entry in second['changed']}
+        assert changes['SWE00100026'] == {'id': 'SWE00100026', 'has_snow': [False, True], 'has_snwd': [False, True],
+                                          'frontend': [False, True]}
+        assert changes['USC00050848'] == {'id': 'USC00050848', 'has_precip': [True, False],
+                                          'frontend': [True, False]}
+        assert store.count() == len(artifacts(build)['frontend'])
+
+    full = incremental_rebuild(*files, fresh)
+    assert full['mode'] == 'full'
+    assert artifacts(build) == artifacts(fresh)
+
+
+def test_rule_change_forces_full_rebuild():
+    tmp = tempfile.mkdtemp()
+    files = write_ghcn(tmp, STATIONS, INVENTORY)
+    incremental_rebuild(*files, tmp)
+    assert incremental_rebuild(*files, tmp)['summary'] == {'added': 0, 'removed': 0, 'changed': 0}
+
+    # Same files, looser Sweden rule: Stockholm's 2010 snow record now counts
+    config = dict(COUNTRY_CONFIG)
+    config['SW'] = {'iso': 'SE', 'label': 'Sweden', 'min_year': 2005}
+    changelog = incremental_rebuild(*files, tmp, config=config)
+    assert changelog['mode'] == 'full' and changelog['previous_build'] is not None
+    assert changelog['added'] == [] and changelog['removed'] == []
+    assert changelog['changed'] == [{'id': 'SWE00100026', 'has_snow': [False, True], 'frontend': [False, True]}]
+
+    built = artifacts(tmp)
+    assert 'SWE00100026' in {s['id'] for s in built['frontend']}
+    assert built['stats']['total_stations'] == len(built['frontend'])
+
+    # The new rules are remembered: an unchanged rerun is incremental again
+    assert incremental_rebuild(*files, tmp, config=config)['mode'] == 'incremental'
+
+
+if __name__ == '__main__':
+    test_data_diff_matches_full_ingest()
+    test_rule_change_forces_full_rebuild()
+    print("[OK] Incremental rebuild tests passed")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test NCEI Record/Replay Fixtures
+Records a small suite against the local stand-in server, then replays it
+with the server stopped and checks results, errors and misses
+"""
+
+import gzip
+import os
+import tempfile
+
+from ncei_fixtures import FixtureSession, load_fixture
+from ncei_stub_server import StubNCEIServer
+
+CITIES = [('Buffalo, NY', 42.8864, -78.8784), ('Denver, CO', 39.7392, -104.9903)]
+
+
+class FakeMatcher:
+    def find_best_station(self, lat, lng):
+        return {'id': f"USC00{abs(int(lat * 1000)) % 1000000:06d}", 'name': 'Test', 'distance_miles': 1.5}
+
+
+def no_matcher():
+    raise AssertionError("replay must not build the station matcher")
+
+
+def run_suite(session, url, down_url, matcher_factory=FakeMatcher):
+    matcher = session.lookups('matcher', matcher_factory)
+    fetcher = session.fetcher(base_url=url)
+    results = []
+    for name, lat, lng in CITIES:
+        station = matcher.find_best_station(lat, lng)
+        season = fetcher.fetch_snowfall_season(station['id'], 2023)
+        results.append({'city': name, 'station': station['id'], 'total': season['total_snowfall'],
+                        'storms': season['storm_events']})
+    failed = session.fetcher(base_url=down_url).fetch_daily_data('USW00094728', '2024-01-01', '2024-01-02')
+    results.append({'error': failed.get('error')})
+    return results
+
+
+def test_record_then_replay():
+    directory = tempfile.mkdtemp()
+    with StubNCEIServer() as server, StubNCEIServer(error_rate=1.0) as down:
+        session = FixtureSession('demo', directory, mode='record')
+        recorded = run_suite(session, server.url, down.url)
+        session.finish(recorded)
+        assert server.stats()['requests'] == 2 and down.stats()['requests'] == 1
+        url, down_url = server.url, down.url
+
+    path = os.path.join(directory, 'demo.json.gz')
+    fixture = load_fixture(path)
+    assert len(fixture['requests']) == 3 and len(fixture['lookups']) == 2
+    with open(path, 'rb') as f:
+        compressed = f.read()
+    assert len(compressed) * 3 < len(gzip.decompress(compressed))
+
+    # Servers are gone: everything comes from the fixture (auto mode picks replay)
+    session = FixtureSession('demo', directory)
+    assert session.mode == 'replay'
+    replayed = run_suite(session, url, down_url, matcher_factory=no_matcher)
+    assert replayed == recorded and '503' in replayed[-1]['error']
+    session.finish(replayed)
+
+
+def test_replay_misses_and_regressions():
+    directory = tempfile.mkdtemp()
+    with StubNCEIServer() as server, StubNCEIServer(error_rate=1.0) as down:
+        session = FixtureSession('demo', directory, mode='record')
+        session.finish(run_suite(session, server.url, down.url))
+
+    session = FixtureSession('demo', directory, mode='replay')
+    try:
+        session.fetcher().fetch_daily_data('USW00014733', '2024-01-01', '2024-01-31')
+        assert False, "unrecorded request should fail"
+    except KeyError as e:
+        assert 'NCEI_FIXTURES=record' in e.args[0]
+
+    try:
+        session.finish([{'city': 'changed'}])
+        assert False, "changed results should fail"
+    except AssertionError as e:
+        assert 'differ' in str(e)
+
+
+def test_missing_fixture_skips_under_pytest():
+    directory = tempfile.mkdtemp()
+    saved = {name: os.environ.pop(name, None) for name in ('NCEI_FIXTURES', 'PYTEST_CURRENT_TEST')}
+    try:
+        # Run as a script, a suite with no fixture goes live
+        assert FixtureSession('missing', directory).mode == 'live'
+
+        import pytest
+        os.environ['PYTEST_CURRENT_TEST'] = 'test_ncei_fixtures.py::test_missing_fixture_skips_under_pytest'
+        try:
+            FixtureSession('missing', directory)
+            assert False, "missing fixture should skip under pytest"
+        except pytest.skip.Exception as e:
+            assert 'NCEI_FIXTURES=record' in str(e)
+        assert FixtureSession('missing', directory, mode='live').mode == 'live'
+    finally:
+        for name, value in saved.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+
+
+if __name__ == '__main__':
+    test_record_then_replay()
+    test_replay_misses_and_regressions()
+    test_missing_fixture_skips_under_pytest()
+    print("[OK] NCEI fixture tests passed")
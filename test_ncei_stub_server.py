@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test NCEI Stand-In Server
+Drives NOAADataFetcher and raw requests against the local server: JSON and
+CSV, multi-station, dataTypes filtering, store-backed data and the latency,
+error and throttling profiles
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+from dly_ingest import DlyStore, ingest_dly
+from ncei_stub_server import StubNCEIServer, SyntheticSource
+from noaa_data_fetcher import NOAADataFetcher
+from test_dly_ingest import DLY, STATION
+
+OTHER = 'USW00094728'
+
+
+def test_daily_contract():
+    with StubNCEIServer(SyntheticSource()) as server:
+        fetcher = NOAADataFetcher(base_url=server.url)
+        data = fetcher.fetch_daily_data(OTHER, '2024-01-01', '2024-01-31', ['SNOW', 'TMAX'])
+        assert 25 <= data['record_count'] <= 31
+        assert all(set(r) <= {'DATE', 'STATION', 'SNOW', 'TMAX'} for r in data['records'])
+        assert data['records'][0]['STATION'] == OTHER
+
+        # Same days from any overlapping request
+        again = fetcher.fetch_daily_data(OTHER, '2024-01-15', '2024-02-10', ['SNOW', 'TMAX'])
+        assert [r for r in again['records'] if r['DATE'] <= '2024-01-31'] == \
+               [r for r in data['records'] if r['DATE'] >= '2024-01-15']
+
+        params = {'dataset': 'daily-summaries', 'stations': f'{STATION},{OTHER}', 'startDate': '2024-01-01',
+                  'endDate': '2024-01-03', 'dataTypes': 'PRCP,SNOW', 'units': 'standard'}
+        rows = list(csv.reader(io.StringIO(requests.get(server.url, params=params).text)))
+        assert rows[0] == ['STATION', 'DATE', 'PRCP', 'SNOW']
+        assert [r[0] for r in rows[1:]].count(STATION) >= 2 and rows[-1][0] == OTHER
+
+        assert requests.get(server.url, params={'dataset': 'daily-summaries'}).status_code == 400
+        assert requests.get(server.url.replace('/v1', '/v2')).status_code == 404
+        assert server.stats()['status'] == {200: 3, 400: 1, 404: 1}
+
+
+def test_store_backed_and_aggregates():
+    tmp = tempfile.mkdtemp()
+    source = os.path.join(tmp, 'ghcnd_all')
+    os.makedirs(source)
+    with open(os.path.join(source, f'{STATION}.dly'), 'w') as f:
+        f.write(DLY)
+    ingest_dly(source, os.path.join(tmp, 'dly_store'))
+    store = DlyStore(os.path.join(tmp, 'dly_store'))
+
+    with StubNCEIServer(store) as server:
+        remote = NOAADataFetcher(base_url=server.url)
+        local = NOAADataFetcher(backend=store)
+        assert remote.fetch_daily_data(STATION, '2024-01-01', '2024-02-29') == \
+               local.fetch_daily_data(STATION, '2024-01-01', '2024-02-29')
+        assert remote.fetch_daily_data(OTHER, '2024-01-01', '2024-01-31')['records'] == []
+
+        # GSOM derived from the same days
+        fields = ['snowfall.total', 'precipitation.total', 'temperature.avg_high']
+        monthly = remote.fetch_monthly_summary(STATION, 2024, 1, fields=fields)
+        daily = local.summarize(STATION, '2024-01-01', '2024-01-31')
+        assert monthly['source'] == 'gsom'
+        assert monthly['snowfall']['total'] == daily['snowfall']['total']
+        assert monthly['precipitation']['total'] == daily['precipitation']['total']
+
+
+def test_metric_units():
+    with StubNCEIServer(SyntheticSource()) as server:
+        def rows(dataset, units=None):
+            query = {'dataset': [dataset], 'stations': [OTHER], 'startDate': ['2024-01-01'],
+                     'endDate': ['2024-12-31'], 'format': ['json']}
+            if units:
+                query['units'] = [units]
+            return json.loads(server.respond(query)[1])
+
+        for dataset, elements in (
+                ('daily-summaries', ('TMAX', 'TMIN', 'PRCP', 'SNOW', 'SNWD')),
+                ('global-summary-of-the-month', ('TMAX', 'EMXT', 'TMIN', 'EMNT', 'PRCP', 'EMXP', 'SNOW', 'EMSN')),
+                ('global-summary-of-the-year', ('TMAX', 'EMXT', 'TMIN', 'EMNT', 'PRCP', 'EMXP', 'SNOW', 'EMSN'))):
+            standard, metric = rows(dataset, 'standard'), rows(dataset, 'metric')
+            assert rows(dataset) == metric                       # the service defaults to metric
+            assert [r['DATE'] for r in standard] == [r['DATE'] for r in metric] and standard
+            for s, m in zip(standard, metric):
+                assert s.get('DP01') == m.get('DP01')
+                for element in elements:
+                    if element not in s:
+                        continue
+                    value, converted = float(s[element]), float(m[element])
+                    if element in ('TMAX', 'TMIN', 'EMXT', 'EMNT'):
+                        assert abs((value - 32) / 1.8 - converted) <= 0.35, (dataset, element)
+                    else:
+                        assert abs(value * 25.4 - converted) <= 2.0, (dataset, element)   # both sides rounded
+
+
+def test_profiles():
+    with StubNCEIServer(profile='fast', error_rate=1.0) as server:
+        data = NOAADataFetcher(base_url=server.url).fetch_daily_data(OTHER, '2024-01-01', '2024-01-05')
+        assert '503' in data['error'] and data['records'] == []
+
+    params = {'dataset': 'daily-summaries', 'stations': OTHER, 'startDate': '2024-01-01', 'endDate': '2024-01-02'}
+    with StubNCEIServer(profile='throttled', latency=0.0, rate=1.0, burst=2) as server:
+        codes = [requests.get(server.url, params=params).status_code for _ in range(4)]
+        assert codes == [200, 200, 429, 429]
+        assert server.stats()['requests'] == 4
+
+    with StubNCEIServer(latency=0.2) as server:
+        start = time.perf_counter()
+        requests.get(server.url, params=params)
+        assert time.perf_counter() - start >= 0.2
+
+
+if __name__ == '__main__':
+    test_daily_contract()
+    test_store_backed_and_aggregates()
+    test_metric_units()
+    test_profiles()
+    print("[OK] NCEI stand-in server tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Daily Observation Warehouse
+Writes a few stations into partitioned Parquet and queries them back
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from daily_series import records_to_series
+from noaa_data_fetcher import NOAADataFetcher
+from observation_warehouse import ObservationWarehouse
+
+
+def synthetic_series(station_id, start, end, seed):
+    rng = np.random.default_rng(seed)
+    series = records_to_series([], start, end, ['TMAX', 'SNOW'], station_id)
+    days = len(series['dates'])
+    series['values']['TMAX'] = np.round(rng.normal(40, 15, days))
+    series['values']['SNOW'] = np.round(rng.exponential(0.5, days), 1)
+    series['values']['SNOW'][::7] = np.nan
+    return series
+
+
+def build_warehouse():
+    warehouse = ObservationWarehouse(os.path.join(tempfile.mkdtemp(), 'warehouse'))
+    for station_id, seed in (('GME00102380', 1), ('GM000004199', 2), ('USC00050848', 3)):
+        warehouse.write_series(synthetic_series(station_id, '2013-01-01', '2024-12-31', seed))
+    return warehouse
+
+
+def test_partitions_and_row_groups():
+    warehouse = build_warehouse()
+    path = os.path.join(warehouse.root, 'country=GM', 'station=GME00102380', 'year=2016', 'data.parquet')
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_rows == 366
+    assert metadata.num_row_groups == 12
+
+
+def test_multi_station_query():
+    warehouse = build_warehouse()
+    table = warehouse.query(countries=['GM'], years=(2015, 2024), months=[1, 2, 3], elements=['SNOW'])
+
+    assert set(table.column('station').to_pylist()) == {'GME00102380', 'GM000004199'}
+    assert set(table.column('month').to_pylist()) == {1, 2, 3}
+    years = table.column('year').to_numpy()
+    assert years.min() == 2015 and years.max() == 2024
+
+    # 10 years of Jan-Mar (3 leap Februaries) per station
+    assert table.num_rows == 2 * (10 * 90 + 3)
+
+    expected = synthetic_series('GME00102380', '2013-01-01', '2024-12-31', 1)
+    day = (np.datetime64('2020-02-29') - np.datetime64('2013-01-01')).astype(int)
+    rows = table.filter(table.column('station').to_numpy(zero_copy_only=False) == 'GME00102380')
+    dates = rows.column('date').to_numpy().astype('datetime64[D]')
+    snow = rows.column('SNOW').to_numpy(zero_copy_only=False)
+    stored = snow[dates == np.datetime64('2020-02-29')][0]
+    assert (np.isnan(stored) and np.isnan(expected['values']['SNOW'][day])) or stored == expected['values']['SNOW'][day]
+
+
+def test_merge_and_fetcher_backend():
+    warehouse = build_warehouse()
+    records = [
+        {'DATE': '2024-01-05', 'STATION': 'USC00050848', 'TMAX': '31', 'SNOW': '4.2'},
+        {'DATE': '2025-01-02', 'STATION': 'USC00050848', 'SNOW': '1.0'},
+    ]
+    assert warehouse.write_records('USC00050848', records) == 2
+
+    fetcher = NOAADataFetcher(backend=warehouse)
+    data = fetcher.fetch_daily_data('USC00050848', '2024-01-05', '2024-01-05', ['TMAX', 'SNOW'])
+    assert data['records'] == [{'DATE': '2024-01-05', 'STATION': 'USC00050848', 'TMAX': '31', 'SNOW': '4.2'}]
+
+    series = fetcher.fetch_daily_series('USC00050848', '2024-12-31', '2025-01-03', ['SNOW'])
+    assert series['values']['SNOW'][2] == 1.0
+    assert np.isnan(series['values']['SNOW'][1])
+
+    missing = fetcher.fetch_daily_data('CA001011500', '2024-01-01', '2024-01-31')
+    assert missing['records'] == [] and 'error' in missing
+
+
+if __name__ == '__main__':
+    test_partitions_and_row_groups()
+    test_multi_station_query()
+    test_merge_and_fetcher_backend()
+    print("[OK] Observation warehouse tests passed")
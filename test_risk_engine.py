@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Batch Risk Engine
+Checks vectorized scoring against a line-by-line port of calculateRiskScore
+"""
+
+import math
+
+import numpy as np
+
+from project_templates import DEFAULT_RISK_WEIGHTS, TEMPLATES
+from risk_engine import score_projects, select, table_rows
+
+
+def js_round(x):
+    return math.floor(x + 0.5)
+
+
+def reference_score(analysis, weights):
+    """calculateRiskScore from app.js, one analysis at a time"""
+    actual = analysis.get('actualProjectDays')
+    total_days = actual if actual is not None and actual > 0 else 365
+
+    precip = min(100, (analysis['heavyRainDays'] + analysis['heavySnowDays']) / total_days * 400)
+    temp_days = analysis['extremeColdDays'] + js_round(analysis['extremeHeatDays'] * 0.5)
+    temp = min(100, temp_days / total_days * 400)
+
+    wind = None
+    if analysis.get('avgWindSpeed') is not None:
+        wind = min(100, analysis['workStoppingWindDays'] / total_days * 400)
+
+    favorable = analysis['workableDays'] / total_days
+    season = max(0, min(100, (1 - favorable) * 100))
+
+    if wind is None:
+        rest = weights['precipitation'] + weights['temperature'] + weights['workability']
+        score = js_round(precip * (weights['precipitation'] / rest) + temp * (weights['temperature'] / rest) +
+                         season * (weights['workability'] / rest))
+    else:
+        score = js_round(precip * weights['precipitation'] + temp * weights['temperature'] +
+                         wind * weights['wind'] + season * weights['workability'])
+
+    if favorable < 0.30:
+        score = max(score, 65 if favorable < 0.15 else 45 if favorable < 0.25 else 30)
+    return max(0, min(100, score))
+
+
+def random_projects(n, seed=11):
+    rng = np.random.default_rng(seed)
+    template_ids = [None] + list(TEMPLATES)
+    projects = []
+    for i in range(n):
+        days = int(rng.choice([0, 30, 90, 180, 365]))
+        span = days or 365
+        analysis = {
+            'actualProjectDays': days,
+            'heavyRainDays': int(rng.integers(0, span // 4)),
+            'heavySnowDays': int(rng.integers(0, span // 8)),
+            'extremeColdDays': int(rng.integers(0, span // 6)),
+            'extremeHeatDays': int(rng.integers(0, span // 6)),
+            'workStoppingWindDays': int(rng.integers(0, span // 10)),
+            'avgWindSpeed': float(rng.random() * 20) if rng.random() < 0.7 else None,
+            'workableDays': int(rng.integers(0, span + 1))
+        }
+        projects.append({'id': i, 'template': template_ids[i % len(template_ids)], 'analysis': analysis})
+    return projects
+
+
+def test_matches_reference():
+    projects = random_projects(2000)
+    table = score_projects(projects)
+
+    for i, project in enumerate(projects):
+        template = TEMPLATES.get(project['template'])
+        weights = template['risk_weights'] if template else DEFAULT_RISK_WEIGHTS
+        assert table['total_score'][i] == reference_score(project['analysis'], weights), project
+
+    assert np.isnan(table['wind_risk'][[p['analysis']['avgWindSpeed'] is None for p in projects]]).all()
+
+
+def test_levels_and_monthly_extremes():
+    breakdown = [
+        {'month': 'March', 'workable': 10, 'total': 31},
+        {'month': 'April', 'workable': 24, 'total': 30},
+        {'month': 'May', 'workable': 24, 'total': 30}
+    ]
+    flat = [
+        {'month': 'June', 'workable': 20, 'total': 30},
+        {'month': 'July', 'workable': 21, 'total': 31}
+    ]
+    projects = [
+        {'id': 'a', 'analysis': {'workableDays': 300, 'avgWindSpeed': 10, 'monthlyBreakdown': breakdown}},
+        {'id': 'b', 'analysis': {'workableDays': 40, 'monthlyBreakdown': flat}},
+        {'id': 'c', 'analysis': {'workableDays': 100}},
+        {'id': 'd', 'analysis': {'workableDays': 100, 'avgWindSpeed': 'N/A', 'workStoppingWindDays': 50}}
+    ]
+    rows = {row['project_id']: row for row in table_rows(score_projects(projects))}
+
+    assert rows['a']['risk_level'] == 'LOW RISK'
+    assert rows['a']['best_month'] == 'April'  # first of the tied months
+    assert rows['a']['worst_month'] == 'March'
+    assert rows['b']['total_score'] == 65 and rows['b']['risk_level'] == 'HIGH RISK'
+    assert rows['b']['best_month'] is None  # less than 10 points apart
+    assert rows['c']['best_month'] is None and rows['c']['wind_risk'] is None
+    # A non-numeric wind speed counts as no wind data
+    assert rows['d']['wind_risk'] is None and rows['d']['total_score'] == rows['c']['total_score']
+
+
+def test_select_filters_and_sorts():
+    table = score_projects(random_projects(500, seed=3))
+    risky = select(table, where=table['total_score'] > 50, limit=20)
+
+    assert len(risky['project_id']) <= 20
+    assert (risky['total_score'] > 50).all()
+    assert (np.diff(risky['total_score']) <= 0).all()
+
+    safest = select(table, sort_by='total_score', descending=False, limit=1)
+    assert safest['total_score'][0] == table['total_score'].min()
+
+
+if __name__ == '__main__':
+    test_matches_reference()
+    test_levels_and_monthly_extremes()
+    test_select_filters_and_sorts()
+    print("[OK] Risk engine tests passed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test Compact Daily Series Encoding
+Round trips through the delta / run-length codecs and the .xds daily store
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from dly_ingest import DlyStore, ingest_dly
+from series_codec import (CODEC_DELTA, CODEC_RLE, CODEC_SPARSE, ELEMENT_HEADER, HEADER, decode_series,
+                          encode_series, varint_decode, varint_encode)
+from test_station_memmap import STATION, long_history
+
+START = np.datetime64('1990-01-01')
+
+
+def test_varints():
+    values = np.array([0, 1, 127, 128, 16383, 16384, 2 ** 32 - 1], dtype=np.uint64)
+    data = varint_encode(values)
+    assert len(data) == 1 + 1 + 1 + 2 + 2 + 3 + 5
+    assert varint_decode(data).tolist() == values.tolist()
+    assert varint_encode(np.array([], dtype=np.uint64)) == b''
+
+
+def test_round_trip():
+    rng = np.random.default_rng(3)
+    tmax = np.cumsum(rng.integers(-20, 21, 4000)).astype(np.int16)
+    tmax[rng.random(4000) < 0.1] = -9999
+    snow = np.where(rng.random(4000) < 0.03, rng.integers(1, 300, 4000), 0).astype(np.int16)
+    snow[:45] = -9999
+    columns = {
+        'TMAX': tmax,
+        'SNOW': snow,
+        'PRCP': np.full(4000, -9999, dtype=np.int16),       # all missing
+        'SNWD': np.array([5, 5, -9999, 7], dtype=np.int16),  # shorter, padded
+    }
+
+    for codec in ('auto', 'delta', 'rle', 'sparse'):
+        decoded = decode_series(encode_series(START, columns, codec))
+        assert decoded['start'] == START
+        for element, column in columns.items():
+            assert decoded['values'][element].dtype == np.int16
+            assert decoded['values'][element][:len(column)].tolist() == column.tolist()
+        assert decoded['values']['SNWD'][4:].tolist() == [-9999] * 3996
+
+
+def test_codec_choice():
+    """Smooth temperatures pick delta, snow-depth plateaus run-length, rare snowfall sparse"""
+    rng = np.random.default_rng(5)
+    columns = {
+        'TMAX': (200 + np.cumsum(rng.integers(-15, 16, 3000))).astype(np.int16),
+        'SNOW': np.where(rng.random(3000) < 0.02, rng.integers(1, 300, 3000), 0).astype(np.int16),
+        'SNWD': np.repeat(rng.integers(0, 400, 60), 50).astype(np.int16),
+    }
+    data = encode_series(START, columns)
+
+    pos = HEADER.size
+    codecs = {}
+    for _ in columns:
+        code, codec, _, size = ELEMENT_HEADER.unpack_from(data, pos)
+        codecs[code.decode('ascii')] = codec
+        pos += ELEMENT_HEADER.size + size
+    assert codecs == {'SNOW': CODEC_SPARSE, 'SNWD': CODEC_RLE, 'TMAX': CODEC_DELTA}
+    assert len(data) < sum(c.nbytes for c in columns.values()) / 3
+
+
+def test_xds_store_matches_npz():
+    tmp = tempfile.mkdtemp()
+    source = os.path.join(tmp, 'ghcnd_all')
+    os.makedirs(source)
+    with open(os.path.join(source, f'{STATION}.dly'), 'w') as f:
+        f.write(long_history())
+
+    npz_index = ingest_dly(source, os.path.join(tmp, 'npz'))
+    xds_index = ingest_dly(source, os.path.join(tmp, 'xds'), encoding='xds')
+    assert xds_index['encoding'] == 'xds'
+    assert xds_index['stations'] == npz_index['stations']
+
+    # Even uniform noise with random gaps beats fixed-width int16
+    raw_size = sum(c.nbytes for c in DlyStore(os.path.join(tmp, 'npz')).load(STATION)['values'].values())
+    assert os.path.getsize(os.path.join(tmp, 'xds', f'{STATION}.xds')) < raw_size
+
+    npz, xds = DlyStore(os.path.join(tmp, 'npz')), DlyStore(os.path.join(tmp, 'xds'))
+    assert xds.daily_records(STATION, '2010-01-01', '2012-12-31') == npz.daily_records(STATION, '2010-01-01', '2012-12-31')
+
+
+if __name__ == '__main__':
+    test_varints()
+    test_round_trip()
+    test_codec_choice()
+    test_xds_store_matches_npz()
+    print("[OK] Series codec tests passed")
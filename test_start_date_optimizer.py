@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Start-Date Optimizer
+Checks prefix-sum window search against a brute-force scan
+"""
+
+import numpy as np
+
+from daily_series import records_to_series
+from start_date_optimizer import daily_climatology, optimize_start_dates, recommend, start_date
+
+
+def brute_force(daily, duration):
+    """Recompute every circular window from scratch (the old O(days x window) scan)"""
+    costs = [sum(daily[(s + i) % 365] for i in range(duration)) for s in range(365)]
+    return int(np.argmin(costs)), int(np.argmax(costs)), min(costs), max(costs)
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(7)
+    climatology = {
+        'nonworkable': rng.random((3, 365)),
+        'precip': rng.random((3, 365)) * 10,
+        'snow': np.zeros((3, 365))
+    }
+    result = optimize_start_dates(climatology)
+
+    for site in range(3):
+        for duration in (1, 14, 90, 200):
+            best, worst, best_cost, worst_cost = brute_force(climatology['nonworkable'][site], duration)
+            assert result['best_start'][site, duration - 1] == best
+            assert result['worst_start'][site, duration - 1] == worst
+            assert np.isclose(result['best_cost'][site, duration - 1], best_cost)
+            assert np.isclose(result['worst_cost'][site, duration - 1], worst_cost)
+
+        # A full-year window covers every day whatever the start
+        assert np.isclose(result['best_cost'][site, 364], climatology['nonworkable'][site].sum())
+
+
+def test_window_wraps_year_end():
+    """A bad-weather block in January is avoided, a good block spans New Year"""
+    nonworkable = np.full((1, 365), 0.5)
+    nonworkable[0, 10:40] = 1.0
+    nonworkable[0, 355:] = 0.0
+    nonworkable[0, :5] = 0.0
+
+    result = optimize_start_dates({'nonworkable': nonworkable})
+    summary = recommend(result, site=0, duration=15, year=2025)
+
+    assert summary['best']['start_date'] == '2025-12-22'
+    assert summary['best']['end_date'] == '2026-01-05'
+    assert summary['worst']['start_date'] == '2025-01-11'
+
+
+def test_data_gaps_are_never_recommended():
+    """No winter records: the gap must not look like zero non-workable days"""
+    nonworkable = np.full((2, 365), 0.5)
+    nonworkable[0, :60] = np.nan
+    nonworkable[0, 335:] = np.nan
+    nonworkable[0, 150:180] = 0.2
+    nonworkable[1, 200:230] = 0.9
+
+    result = optimize_start_dates({'nonworkable': nonworkable})
+    assert result['best_start'][0, 29] == 150 and np.isclose(result['best_cost'][0, 29], 6.0)
+    assert 60 <= result['worst_start'][0, 29] <= 335 - 30 and np.isclose(result['worst_cost'][0, 29], 15.0)
+    assert result['worst_start'][1, 29] == 200                 # complete sites are unaffected
+
+    # The longest gap-free window is 275 days; nothing longer has a start
+    assert result['best_start'][0, 274] == 60
+    assert result['best_start'][0, 275] == -1 and np.isnan(result['best_cost'][0, 275])
+    summary = recommend(result, site=0, duration=300, year=2025)
+    assert summary['best'] is None and summary['worst'] is None
+    assert recommend(result, site=1, duration=300, year=2025)['best'] is not None
+
+    # An unweighted component's gaps do not matter
+    precip = np.full((2, 365), np.nan)
+    result = optimize_start_dates({'nonworkable': nonworkable, 'precip': precip})
+    assert result['best_start'][0, 29] == 150
+
+
+def test_leap_year_dates_skip_feb_29():
+    assert start_date(58, 2024).isoformat() == '2024-02-28'
+    assert start_date(59, 2024).isoformat() == '2024-03-01'
+    assert start_date(59, 2025).isoformat() == '2025-03-01'
+
+
+def test_daily_climatology_missing_elements():
+    """No TMAX at all, and missing TMIN days are skipped rather than counted non-workable"""
+    records = []
+    for i, day in enumerate(np.arange(np.datetime64('2021-01-01'), np.datetime64('2023-01-01'))):
+        record = {'DATE': str(day), 'PRCP': '0.00'}
+        if not (str(day).startswith('2021-01') and i % 2):
+            record['TMIN'] = '50' if str(day) < '2022' else '20'
+        records.append(record)
+    series = records_to_series(records, '2021-01-01', '2022-12-31', ['TMIN', 'PRCP'], 'STATION_A')
+
+    climatology = daily_climatology(series, {'min_temp': 0, 'max_rain': 5})
+    assert climatology['station_ids'] == ['STATION_A']
+    # Jan 2: 2021 has no TMIN, 2022 is too cold -> always non-workable
+    # Jan 3: 2021 workable, 2022 too cold -> half
+    assert climatology['nonworkable'][0, 1] == 1.0
+    assert climatology['nonworkable'][0, 2] == 0.5
+    assert climatology['precip'][0, 1] == 0.0 and climatology['snow'][0, 1] == 0.0
+
+    # Criteria that read TMAX: every day is unusable, so nothing is averaged
+    climatology = daily_climatology(series, {'max_temp': 30})
+    assert np.isnan(climatology['nonworkable']).all()
+
+
+if __name__ == '__main__':
+    test_matches_brute_force()
+    test_window_wraps_year_end()
+    test_data_gaps_are_never_recommended()
+    test_leap_year_dates_skip_feb_29()
+    test_daily_climatology_missing_elements()
+    print("[OK] Start-date optimizer tests passed")
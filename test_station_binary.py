@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test Binary Station Format
+Round-trips stations through the packed format: NaN elevation, non-ASCII
+names, the shared name table and the magic/version checks
+"""
+
+import json
+import math
+import os
+import struct
+import tempfile
+
+from station_binary import (FORMAT_VERSION, HEADER, decode_columns, decode_stations, encode_stations,
+                            read_stations_binary, write_stations_binary)
+
+STATIONS = [
+    {'id': 'GME00102380', 'name': 'DE MÜNCHEN-STADT', 'lat': 48.1631, 'lng': 11.5428, 'elevation': 515.0,
+     'country': 'DE'},
+    {'id': 'SWE00138750', 'name': 'SE ÅRE ÖSTERSUND', 'lat': 63.1972, 'lng': 14.4833, 'elevation': 376.0,
+     'country': 'SE'},
+    {'id': 'JA000047662', 'name': 'JP 東京', 'lat': 35.6833, 'lng': 139.7667, 'elevation': 36.0, 'country': 'JP'},
+    {'id': 'USC00050848', 'name': 'CO BOULDER', 'lat': 39.9919, 'lng': -105.2667, 'elevation': float('nan'),
+     'country': 'US'},
+    {'id': 'USC00050849', 'name': 'CO BOULDER', 'lat': -0.0001, 'lng': 179.9999, 'elevation': -12.0,
+     'country': 'US'},
+]
+
+
+def test_round_trip():
+    data = encode_stations(STATIONS)
+    decoded = decode_stations(data)
+
+    assert [s['id'] for s in decoded] == [s['id'] for s in STATIONS]
+    assert [s['name'] for s in decoded] == [s['name'] for s in STATIONS]
+    assert [(s['lat'], s['lng'], s['country']) for s in decoded] == \
+           [(s['lat'], s['lng'], s['country']) for s in STATIONS]
+    assert math.isnan(decoded[3]['elevation'])
+    assert [s['elevation'] for s in decoded[:3] + decoded[4:]] == [515.0, 376.0, 36.0, -12.0]
+
+    # Repeated names are stored once; records sit on a 4-byte boundary
+    columns = decode_columns(data)
+    assert columns['names'].count('CO BOULDER') == 1 and len(columns['names']) == 4
+    assert columns['countries'] == ['DE', 'JP', 'SE', 'US']
+    assert (len(data) - columns['records'].nbytes) % 4 == 0
+
+
+def test_file_and_frontend_json():
+    path = os.path.join(tempfile.mkdtemp(), 'stations.bin')
+    assert write_stations_binary(STATIONS, path) == os.path.getsize(path)
+    assert [s['name'] for s in read_stations_binary(path)] == [s['name'] for s in STATIONS]
+
+    with open('noaa_stations_frontend.json', 'r') as f:
+        frontend = json.load(f)
+    decoded = decode_stations(encode_stations(frontend))
+    assert [(s['id'], s['name'], s['lat'], s['lng']) for s in decoded] == \
+           [(s['id'], s['name'], s['lat'], s['lng']) for s in frontend]
+    assert all(abs(a['elevation'] - b['elevation']) <= 0.5 for a, b in zip(decoded, frontend))
+
+
+def test_header_checks():
+    data = bytearray(encode_stations(STATIONS))
+    magic, version = HEADER.unpack_from(data, 0)[:2]
+    assert magic == b'XSTB' and version == FORMAT_VERSION
+
+    struct.pack_into('<H', data, 4, FORMAT_VERSION + 1)
+    try:
+        decode_stations(bytes(data))
+        assert False, "newer version should be rejected"
+    except ValueError as e:
+        assert str(FORMAT_VERSION + 1) in str(e)
+
+    try:
+        decode_stations(b'JSON' + bytes(data[4:]))
+        assert False, "wrong magic should be rejected"
+    except ValueError as e:
+        assert 'Not a station binary' in str(e)
+
+
+if __name__ == '__main__':
+    test_round_trip()
+    test_file_and_frontend_json()
+    test_header_checks()
+    print("[OK] Station binary format tests passed")
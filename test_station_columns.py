@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Columnar Station Capabilities
+Checks the bitmask/year-array build against build_noaa_network's dict build
+"""
+
+import os
+import tempfile
+
+import build_noaa_network
+import station_columns
+from test_ghcn_ingest import INVENTORY, STATIONS, inventory_line, station_line
+
+EXTRA_STATIONS = [
+    station_line('USW00094728', 40.7789, -73.9692, 39.6, 'NY', 'NEW YORK CNTRL PK TWR LONG NAME'),
+]
+
+EXTRA_INVENTORY = [
+    inventory_line('USW00094728', 'PRCP', 1869, 2025),
+    inventory_line('USW00094728', 'SNOW', 1869, 2025),
+    inventory_line('USW00094728', 'TMIN', 1869, 2025),
+    inventory_line('USW00094728', 'WT01', 1869, 2025),
+    # Unknown station - ignored
+    inventory_line('ZZ000000001', 'SNOW', 1950, 2025),
+]
+
+
+def write_files():
+    tmp = tempfile.mkdtemp()
+    stations_file = os.path.join(tmp, 'ghcnd-stations.txt')
+    inventory_file = os.path.join(tmp, 'ghcnd-inventory.txt')
+    with open(stations_file, 'w') as f:
+        f.writelines(STATIONS + EXTRA_STATIONS)
+    with open(inventory_file, 'w') as f:
+        f.writelines(INVENTORY + EXTRA_INVENTORY)
+    return stations_file, inventory_file
+
+
+def legacy_build(stations_file, inventory_file):
+    stations = build_noaa_network.parse_stations(stations_file)
+    stations = build_noaa_network.parse_inventory(inventory_file, stations)
+    return {sid: s for sid, s in stations.items() if s['has_snow']}
+
+
+def test_matches_dict_build():
+    stations_file, inventory_file = write_files()
+    snow_stations = legacy_build(stations_file, inventory_file)
+    columns = station_columns.build_columns(stations_file, inventory_file)
+    snow = station_columns.snow_mask(columns)
+
+    stats = build_noaa_network.generate_statistics(snow_stations)
+    stats['by_country'] = dict(stats['by_country'])
+    assert station_columns.generate_statistics(columns, snow) == stats
+    assert station_columns.station_dicts(columns, snow) == list(snow_stations.values())
+
+
+def test_quality_filter_from_records():
+    stations_file, inventory_file = write_files()
+    snow_stations = list(legacy_build(stations_file, inventory_file).values())
+
+    expected = [
+        s['id'] for s in snow_stations
+        if s['has_temp'] and s['has_precip'] and s['has_snow']
+        and any(dt.get('end', 0) >= 2024 for dt in s['data_types'].values())
+    ]
+    columns = station_columns.columns_from_records(snow_stations)
+    records = station_columns.frontend_records(columns, station_columns.quality_mask(columns))
+    assert [r['id'] for r in records] == expected == ['USC00050848', 'USW00094728']
+
+
+def test_bitmask_layout():
+    stations_file, inventory_file = write_files()
+    columns = station_columns.build_columns(stations_file, inventory_file)
+    index = list(columns['id']).index(b'CA001011500')
+    bits = station_columns.ELEMENT_BITS
+    slot = station_columns.TRACKED_ELEMENTS.index('SNOW')
+
+    # Snow present but ended in 2015: recorded, not active
+    assert columns['elements'][index] & bits['SNOW']
+    assert not columns['active'][index] & bits['SNOW']
+    assert columns['last_year'][index, slot] == 2015
+    assert columns['last_year_any'][index] == 2025
+
+
+if __name__ == '__main__':
+    test_matches_dict_build()
+    test_quality_filter_from_records()
+    test_bitmask_layout()
+    print("[OK] Station column tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Memory-Mapped Station Arrays
+Zero-copy windows and array summaries against the record-based path
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from dly_ingest import DlyStore, ingest_dly
+from noaa_data_fetcher import NOAADataFetcher
+from station_memmap import MemmapStore, ingest_dly_memmap
+from test_dly_ingest import dly_line
+
+STATION = 'USC00050848'
+
+
+def long_history(seed=7, years=range(1990, 2025)):
+    """Random daily values for every month, with gaps"""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for year in years:
+        for month in range(1, 13):
+            for element, low, high in (('TMAX', -150, 350), ('TMIN', -250, 200),
+                                       ('PRCP', 0, 300), ('SNOW', 0, 200), ('SNWD', 0, 800)):
+                days = rng.choice(np.arange(1, 32), size=20, replace=False)
+                values = {int(d): int(v) for d, v in zip(days, rng.integers(low, high, size=20))}
+                lines.append(dly_line(STATION, year, month, element, values))
+    return ''.join(lines)
+
+
+def build_stores():
+    tmp = tempfile.mkdtemp()
+    source = os.path.join(tmp, 'ghcnd_all')
+    os.makedirs(source)
+    with open(os.path.join(source, f'{STATION}.dly'), 'w') as f:
+        f.write(long_history())
+
+    root = os.path.join(tmp, 'station_memmap')
+    assert ingest_dly_memmap(source, root) == 1
+    ingest_dly(source, os.path.join(tmp, 'dly_store'))
+    return MemmapStore(root), DlyStore(os.path.join(tmp, 'dly_store'))
+
+
+def test_zero_copy_window():
+    store, _ = build_stores()
+    full = store.array(STATION, 'SNOW')
+    window = store.window(STATION, 'SNOW', '2000-01-01', '2009-12-31')
+    assert len(window) == 3653
+    assert isinstance(full, np.memmap) and np.shares_memory(window, full)
+
+    # Ranges past the stored history are padded copies
+    padded = store.window(STATION, 'SNOW', '1989-12-30', '1990-01-02')
+    assert list(padded[:2]) == [-9999, -9999] and not np.shares_memory(padded, full)
+
+
+def test_matches_record_path():
+    memmap, dly = build_stores()
+    array_fetcher = NOAADataFetcher(backend=memmap)
+    record_fetcher = NOAADataFetcher(backend=dly)
+
+    assert array_fetcher.fetch_yearly_summary(STATION, 2015) == record_fetcher.fetch_yearly_summary(STATION, 2015)
+    assert array_fetcher.fetch_monthly_summary(STATION, 2024, 12) == record_fetcher.fetch_monthly_summary(STATION, 2024, 12)
+
+    records = memmap.daily_records(STATION, '2001-02-01', '2001-03-31')
+    assert records == dly.daily_records(STATION, '2001-02-01', '2001-03-31')
+
+    # Long ranges go through the same reduction
+    long = memmap.summary(STATION, '1990-01-01', '2024-12-31')
+    data = record_fetcher.fetch_daily_data(STATION, '1990-01-01', '2024-12-31')
+    assert long == record_fetcher._calculate_summary(data['records'])
+
+
+def test_missing_station_and_range():
+    memmap, _ = build_stores()
+    fetcher = NOAADataFetcher(backend=memmap)
+    assert 'error' in fetcher.fetch_yearly_summary('USW00094728', 2015)
+    assert fetcher.fetch_yearly_summary(STATION, 1950)['records'] == []
+
+
+if __name__ == '__main__':
+    test_zero_copy_window()
+    test_matches_record_path()
+    test_missing_station_and_range()
+    print("[OK] Memmap station tests passed")
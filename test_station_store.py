@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test Station Store
+Idempotent upserts, deletes, radius lookup and frontend export
+"""
+
+import json
+import os
+import tempfile
+
+from station_matcher import StationMatcher
+from station_store import StationStore
+
+
+def load_frontend():
+    with open('noaa_stations_frontend.json', 'r') as f:
+        return json.load(f)
+
+
+def test_upsert_is_idempotent():
+    stations = load_frontend()
+    with StationStore(':memory:') as store:
+        store.upsert(stations)
+        store.upsert(stations)
+        assert store.count() == len({s['id'] for s in stations})
+
+        renamed = dict(stations[0], name='BC RENAMED')
+        store.upsert([renamed])
+        assert store.count() == len(stations)
+        assert store.get(stations[0]['id'])['name'] == 'BC RENAMED'
+
+
+def test_delete_and_export():
+    stations = load_frontend()[:200]
+    with StationStore(':memory:') as store:
+        store.upsert(stations)
+        assert store.delete([stations[0]['id'], 'NOT_A_STATION']) == 1
+        assert store.get(stations[0]['id']) is None
+        assert store.nearby(stations[0]['lat'], stations[0]['lng'], 0.1) == []
+
+        path = os.path.join(tempfile.mkdtemp(), 'frontend.json')
+        assert store.export_frontend(path) == 199
+        with open(path) as f:
+            exported = json.load(f)
+        assert exported == sorted(stations[1:], key=lambda s: s['id'])
+
+
+def test_nearby_matches_brute_force():
+    stations = load_frontend()
+    denver = (39.7392, -104.9903)
+    expected = sorted(
+        s['id'] for s in stations
+        if StationMatcher.haversine_distance(*denver, s['lat'], s['lng']) <= 40
+    )
+    with StationStore(':memory:') as store:
+        store.upsert(stations)
+        found = store.nearby(*denver, radius_miles=40)
+
+    assert sorted(s['id'] for s in found) == expected and expected
+    assert [s['distance_miles'] for s in found] == sorted(s['distance_miles'] for s in found)
+
+
+def test_nearby_across_antimeridian_and_poles():
+    points = [(65.0, 179.9), (65.0, -179.9), (65.1, 179.5), (65.0, -179.4), (64.0, 180.0),
+              (-16.5, 179.95), (-16.5, -179.95), (89.9, 0.0), (89.9, 180.0), (89.95, -90.0), (-89.9, 45.0)]
+    stations = [{'id': f'ZZ{i:09d}', 'name': f'EDGE {i}', 'lat': lat, 'lng': lng, 'elevation': 0.0,
+                 'country': 'ZZ'} for i, (lat, lng) in enumerate(points)]
+
+    with StationStore(':memory:') as store:
+        store.upsert(stations)
+        for lat, lng, radius in ((65.0, 179.95, 30), (65.0, -179.95, 30), (-16.5, 180.0, 5),
+                                 (89.9, 90.0, 25), (-89.95, -120.0, 25), (65.0, 179.99, 80)):
+            expected = sorted(
+                s['id'] for s in stations
+                if StationMatcher.haversine_distance(lat, lng, s['lat'], s['lng']) <= radius
+            )
+            found = sorted(s['id'] for s in store.nearby(lat, lng, radius))
+            assert found == expected and len(expected) >= 1, (lat, lng, found, expected)
+
+
+if __name__ == '__main__':
+    test_upsert_is_idempotent()
+    test_delete_and_export()
+    test_nearby_matches_brute_force()
+    test_nearby_across_antimeridian_and_poles()
+    print("[OK] Station store tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Station Tiles
+Tile indexing and radius search over the frontend database, and the
+tiles-backed StationMatcher against a brute-force nearest search
+"""
+
+import json
+import os
+import tempfile
+
+from station_matcher import StationMatcher
+from station_tiles import MANIFEST_FILE, TileReader, tile_index, write_tiles
+
+CITIES = [
+    (39.7392, -104.9903),    # Denver
+    (42.8864, -78.8784),     # Buffalo
+    (48.1351, 11.5820),      # Munich
+    (64.8378, -147.7164),    # Fairbanks
+    (-33.8688, 151.2093),    # Sydney: few stations, search must widen
+]
+
+
+def load_frontend():
+    with open('noaa_stations_frontend.json', 'r') as f:
+        return json.load(f)
+
+
+def brute_force(stations, lat, lng, count):
+    ranked = sorted(stations, key=lambda s: StationMatcher.haversine_distance(lat, lng, s['lat'], s['lng']))
+    return [s['id'] for s in ranked[:count]]
+
+
+def test_tile_index_edges():
+    assert tile_index(-90, -180, 5) == (0, 0)
+    assert tile_index(90, 179.99, 5) == (35, 71)     # the north pole row is clamped
+    assert tile_index(0, 180, 5) == (18, 0)          # 180E wraps to 180W
+    assert tile_index(39.7, -105.0, 5) == (25, 15)
+
+
+def test_write_and_search():
+    stations = load_frontend()
+    directory = tempfile.mkdtemp()
+    manifest = write_tiles(stations, directory)
+    assert manifest['station_count'] == len(stations)
+    assert sum(t['count'] for t in manifest['tiles'].values()) == len(stations)
+
+    reader = TileReader(directory)
+    assert sorted(s['id'] for s in reader.all_stations()) == sorted(s['id'] for s in stations)
+
+    # Candidates cover every station inside the radius
+    for lat, lng in CITIES:
+        candidates = {s['id'] for s in reader.candidates(lat, lng, 200)}
+        inside = {s['id'] for s in stations
+                  if StationMatcher.haversine_distance(lat, lng, s['lat'], s['lng']) <= 200}
+        assert inside <= candidates and len(candidates) < len(stations)
+
+
+
+def test_antimeridian_and_pole():
+    stations = [
+        {'id': 'EAST', 'name': 'E', 'lat': 65.0, 'lng': 179.9, 'elevation': 0.0, 'country': 'RU'},
+        {'id': 'WEST', 'name': 'W', 'lat': 65.0, 'lng': -179.9, 'elevation': 0.0, 'country': 'US'},
+        {'id': 'FAR', 'name': 'F', 'lat': 65.0, 'lng': 0.0, 'elevation': 0.0, 'country': 'NO'},
+        {'id': 'POLE', 'name': 'P', 'lat': 89.5, 'lng': 100.0, 'elevation': 0.0, 'country': 'XX'},
+    ]
+    directory = tempfile.mkdtemp()
+    write_tiles(stations, directory)
+    reader = TileReader(directory)
+
+    assert sorted(s['id'] for s in reader.candidates(65.0, 179.5, 100)) == ['EAST', 'WEST']
+    assert [s['id'] for s in reader.candidates(89.0, -80.0, 100)] == ['POLE']
+
+
+def test_version_check():
+    directory = tempfile.mkdtemp()
+    write_tiles(load_frontend()[:10], directory)
+    path = os.path.join(directory, MANIFEST_FILE)
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest['version'] = 99
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+    try:
+        TileReader(directory)
+        assert False, "unknown tile version should fail"
+    except ValueError as e:
+        assert '99' in str(e)
+
+
+def test_tiles_backed_matcher():
+    stations = load_frontend()
+    directory = tempfile.mkdtemp()
+    write_tiles(stations, directory)
+    matcher = StationMatcher(tiles_dir=directory)
+
+    for lat, lng in CITIES:
+        nearest = matcher.find_nearest_stations(lat, lng, count=5)
+        assert [s['id'] for s in nearest] == brute_force(stations, lat, lng, 5)
+        assert [s['distance_miles'] for s in nearest] == sorted(s['distance_miles'] for s in nearest)
+        assert matcher.find_best_station(lat, lng)['id'] == nearest[0]['id']
+
+    report = matcher.get_coverage_report(39.7392, -104.9903, radius_miles=25)
+    assert report['stations_found'] == sum(
+        1 for s in stations if StationMatcher.haversine_distance(39.7392, -104.9903, s['lat'], s['lng']) <= 25)
+
+    try:
+        matcher.find_nearest_stations(39.7392, -104.9903, quality_only=False)
+        assert False, "tiles cannot serve unfiltered stations"
+    except ValueError as e:
+        assert 'quality_only' in str(e)
+
+
+if __name__ == '__main__':
+    test_tile_index_edges()
+    test_write_and_search()
+    test_antimeridian_and_pole()
+    test_version_check()
+    test_tiles_backed_matcher()
+    print("[OK] Station tiles tests passed")
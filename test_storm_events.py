@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Snow Storm Event Extraction
+Checks the single-pass extractor against the original sort-based summary
+"""
+
+import json
+
+from storm_events import extract_snow_events
+
+
+def legacy_snow_summary(records):
+    """Original full-sort implementation of the snow summary, kept as reference"""
+    snow = [float(r['SNOW']) for r in records if 'SNOW' in r and r['SNOW'] is not None and r['SNOW'] != '']
+
+    snow_events = []
+    for r in records:
+        if 'SNOW' in r and r['SNOW'] and r['SNOW'] != '':
+            snow_amt = float(r['SNOW'])
+            if snow_amt > 0:
+                snow_events.append({'date': r['DATE'], 'amount': snow_amt})
+    snow_events.sort(key=lambda x: x['amount'], reverse=True)
+
+    return {
+        'total_snowfall': round(sum(snow), 1) if snow else 0,
+        'days_with_snow': len([s for s in snow if s > 0]),
+        'biggest_storms': snow_events[:10],
+        'snow_days_breakdown': {
+            'trace': len([s for s in snow if s > 0 and s < 0.1]),
+            'light (0.1-2")': len([s for s in snow if 0.1 <= s < 2]),
+            'moderate (2-6")': len([s for s in snow if 2 <= s < 6]),
+            'heavy (6-12")': len([s for s in snow if 6 <= s < 12]),
+            'extreme (12"+)': len([s for s in snow if s >= 12])
+        }
+    }
+
+
+def test_matches_legacy_summary():
+    """Real Scottsbluff station year must give identical results"""
+    with open('noaa_test.json', 'r') as f:
+        records = json.load(f)
+
+    legacy = legacy_snow_summary(records)
+    events = extract_snow_events(records, top_k=10)
+
+    assert round(events['total'], 1) == legacy['total_snowfall']
+    assert events['days_with_snow'] == legacy['days_with_snow']
+    assert events['biggest_days'] == legacy['biggest_storms']
+    assert events['breakdown'] == legacy['snow_days_breakdown']
+
+
+def test_ties_keep_date_order():
+    """Equal amounts keep chronological order, like a stable sort"""
+    records = [
+        {'DATE': '2024-01-01', 'SNOW': '2.0'},
+        {'DATE': '2024-01-05', 'SNOW': '2.0'},
+        {'DATE': '2024-01-09', 'SNOW': '3.0'},
+        {'DATE': '2024-01-12', 'SNOW': '2.0'},
+    ]
+    events = extract_snow_events(records, top_k=3)
+    assert [d['date'] for d in events['biggest_days']] == ['2024-01-09', '2024-01-01', '2024-01-05']
+
+
+def test_consecutive_days_merge_into_storms():
+    """Back-to-back snow days form one storm; gaps and missing values split storms"""
+    records = [
+        {'DATE': '2024-02-01', 'SNOW': '1.5'},
+        {'DATE': '2024-02-02', 'SNOW': '6.0'},
+        {'DATE': '2024-02-03', 'SNOW': '0.5'},
+        {'DATE': '2024-02-04', 'SNOW': '0.0'},
+        {'DATE': '2024-02-05', 'SNOW': '4.0'},
+        {'DATE': '2024-02-06', 'SNOW': ''},
+        {'DATE': '2024-02-07', 'SNOW': '1.0'},
+    ]
+    events = extract_snow_events(records)
+
+    assert events['storm_count'] == 3
+    biggest = events['biggest_storms'][0]
+    assert biggest['start_date'] == '2024-02-01'
+    assert biggest['end_date'] == '2024-02-03'
+    assert biggest['days'] == 3
+    assert biggest['total'] == 8.0
+    assert biggest['peak_date'] == '2024-02-02'
+    assert [s['total'] for s in events['biggest_storms']] == [8.0, 4.0, 1.0]
+
+
+if __name__ == '__main__':
+    test_matches_legacy_summary()
+    test_ties_keep_date_order()
+    test_consecutive_days_merge_into_storms()
+    print("[OK] Storm event extraction tests passed")
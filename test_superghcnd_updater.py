@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test superghcnd Diff Updater
+Applies insert/update/delete diffs to a memmap store and checks state,
+idempotency, journal recovery and summary-cache invalidation
+"""
+
+import io
+import json
+import os
+import tarfile
+import tempfile
+
+from noaa_data_fetcher import NOAADataFetcher
+from station_memmap import MemmapStore, ingest_dly_memmap
+from summary_cache import SummaryCache
+from superghcnd_updater import JOURNAL_FILE, SuperGhcndUpdater
+from test_dly_ingest import dly_line
+
+STATION = 'USC00050848'
+
+DLY = ''.join(
+    dly_line(STATION, 2024, month, element, {day: 10 * month for day in range(1, 29)})
+    for month in (1, 2, 3) for element in ('TMAX', 'SNOW')
+)
+
+# ID,YYYYMMDD,ELEMENT,VALUE,MFLAG,QFLAG,SFLAG,OBS-TIME
+DIFF_1 = {
+    'insert': [
+        f'{STATION},20240301,PRCP,254,,,7,0700',        # new element
+        'USW00094728,20240105,SNOW,51,,,W,',            # new station
+        f'{STATION},20240415,SNOW,25,,,7,0700',         # extends the history
+    ],
+    'update': [
+        f'{STATION},20240110,SNOW,300,,,7,0700',
+        f'{STATION},20240111,SNOW,301,,I,7,0700',       # failed QC -> missing
+        f'{STATION},20240215,WT01,1,,,7,',              # untracked element
+    ],
+    'delete': [f'{STATION},20240102,TMAX,10,,,7,0700'],
+}
+
+DIFF_2 = {
+    'insert': [],
+    'update': [f'{STATION},20240110,SNOW,200,,,7,0700'],
+    'delete': [],
+}
+
+
+def write_diff_dir(root, name, diff):
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    for kind, rows in diff.items():
+        with open(os.path.join(path, f'{kind}.csv'), 'w') as f:
+            f.write(''.join(row + '\n' for row in rows))
+
+
+def write_diff_tar(root, name, diff):
+    with tarfile.open(os.path.join(root, f'{name}.tar.gz'), 'w:gz') as tar:
+        for kind, rows in diff.items():
+            data = ''.join(row + '\n' for row in rows).encode('ascii')
+            info = tarfile.TarInfo(f'{name}/{kind}.csv')
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def setup():
+    tmp = tempfile.mkdtemp()
+    source = os.path.join(tmp, 'ghcnd_all')
+    os.makedirs(source)
+    with open(os.path.join(source, f'{STATION}.dly'), 'w') as f:
+        f.write(DLY)
+    root = os.path.join(tmp, 'station_memmap')
+    ingest_dly_memmap(source, root)
+
+    diffs = os.path.join(tmp, 'diffs')
+    os.makedirs(diffs)
+    write_diff_dir(diffs, 'superghcnd_diff_20240501_to_20240502', DIFF_1)
+    write_diff_tar(diffs, 'superghcnd_diff_20240502_to_20240503', DIFF_2)
+    return MemmapStore(root), diffs
+
+
+def test_apply_diffs():
+    store, diffs = setup()
+    cache = SummaryCache(':memory:')
+    fetcher = NOAADataFetcher(backend=store, summary_cache=cache)
+    for month in (1, 2, 3):
+        fetcher.fetch_monthly_summary(STATION, 2024, month)
+    assert cache.count() == 3
+
+    report = SuperGhcndUpdater(store, cache).update(diffs)
+    assert report['applied'] == ['superghcnd_diff_20240501_to_20240502', 'superghcnd_diff_20240502_to_20240503']
+    assert report['counts'] == {'insert': 3, 'update': 3, 'delete': 1}
+    assert report['stations'] == 2
+
+    # January (Jan 2-11) and March (Mar 1) are stale; February's range ends Mar 1 too
+    assert report['invalidated'] == 3 and cache.count() == 0
+
+    snow = store.window(STATION, 'SNOW', '2024-01-09', '2024-01-12').tolist()
+    assert snow == [10, 200, -9999, 10]           # second diff wins; QC failure dropped
+    assert store.window(STATION, 'TMAX', '2024-01-01', '2024-01-03').tolist() == [10, -9999, 10]
+    assert store.window(STATION, 'PRCP', '2024-03-01', '2024-03-01').tolist() == [254]
+    assert store.window(STATION, 'SNOW', '2024-04-15', '2024-04-15').tolist() == [25]
+    assert store.window('USW00094728', 'SNOW', '2024-01-05', '2024-01-05').tolist() == [51]
+    assert 'WT01' not in store.meta(STATION)['elements']
+
+    summary = fetcher.fetch_monthly_summary(STATION, 2024, 1)
+    assert summary['snowfall']['max_daily'] == round(200 / 25.4, 1)
+
+
+def test_idempotent_and_recovery():
+    store, diffs = setup()
+    updater = SuperGhcndUpdater(store)
+    updater.update(diffs)
+    before = store.window(STATION, 'SNOW', '2024-01-01', '2024-04-30').tolist()
+
+    again = updater.update(diffs)
+    assert again['applied'] == [] and updater.state()['last_applied'] == '20240503'
+    assert store.window(STATION, 'SNOW', '2024-01-01', '2024-04-30').tolist() == before
+
+    # A batch interrupted after its journal was written is rolled forward
+    write_diff_dir(diffs, 'superghcnd_diff_20240503_to_20240504',
+                   {'insert': [], 'update': [f'{STATION},20240120,SNOW,77,,,7,'], 'delete': []})
+    journal_path = os.path.join(store.root, JOURNAL_FILE)
+    original_commit = updater._commit
+    updater._commit = lambda journal: 0          # crash before any rename
+    updater.update(diffs)
+    assert os.path.exists(journal_path)
+    assert store.window(STATION, 'SNOW', '2024-01-20', '2024-01-20').tolist() == [10]
+
+    updater._commit = original_commit
+    assert updater.recover()
+    assert not os.path.exists(journal_path)
+    assert store.window(STATION, 'SNOW', '2024-01-20', '2024-01-20').tolist() == [77]
+    with open(os.path.join(store.root, 'superghcnd_state.json')) as f:
+        assert json.load(f)['last_applied'] == '20240504'
+
+
+if __name__ == '__main__':
+    test_apply_diffs()
+    test_idempotent_and_recovery()
+    print("[OK] superghcnd updater tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Weather-Window Engine
+Checks run-length windows against window lists worked out by hand
+"""
+
+import numpy as np
+
+from daily_series import records_to_series
+from weather_windows import calculate_weather_windows, run_lengths
+
+START, END = '2020-12-25', '2021-01-10'
+
+# TMIN 50F (10C) is workable for min_temp 0C, 20F (-6.7C) is not
+#   STATION_A  Dec 25-31 workable, Jan 1-2 workable, Jan 3 cold, Jan 4-10 workable
+#   STATION_B  every day workable except Jan 6, which has no TMIN
+COLD = {'STATION_A': ['2021-01-03'], 'STATION_B': []}
+MISSING = {'STATION_A': [], 'STATION_B': ['2021-01-06']}
+
+CRITERIA = {
+    'three_day': {'min_temp': 0, 'consecutive_days': 3},
+    'default': {'min_temp': 0}
+}
+
+
+def make_series(station_id):
+    records = []
+    for day in np.arange(np.datetime64(START), np.datetime64(END) + 1):
+        day = str(day)
+        if day in MISSING[station_id]:
+            continue
+        records.append({'DATE': day, 'TMIN': '20' if day in COLD[station_id] else '50'})
+    return records_to_series(records, START, END, ['TMIN'], station_id)
+
+
+def test_run_lengths():
+    mask = np.array([[1, 1, 0, 1, 0, 0, 1, 1, 1],
+                     [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     [1, 1, 1, 1, 1, 1, 1, 1, 1]], dtype=bool)
+    runs = run_lengths(mask)
+    assert list(zip(runs['row'], runs['start'], runs['length'])) == [
+        (0, 0, 2), (0, 3, 1), (0, 6, 3), (2, 0, 9)
+    ]
+
+
+def test_matches_hand_computed_windows():
+    result = calculate_weather_windows([make_series('STATION_A'), make_series('STATION_B')], CRITERIA)
+    assert result['templates'] == ['three_day', 'default']
+    assert list(result['years']) == [2020, 2021]
+    assert list(result['consecutive_days']) == [3, 2]
+
+    # Runs, split at New Year:
+    #   A: 2020 Dec 25-31 (7)  2021 Jan 1-2 (2), Jan 4-10 (7)
+    #   B: 2020 Dec 25-31 (7)  2021 Jan 1-5 (5), Jan 7-10 (4)
+    # Non-overlapping k-day windows per run are length // k
+    assert result['windows_by_year'][0].tolist() == [[7 // 3, 2 // 3 + 7 // 3],
+                                                     [7 // 3, 5 // 3 + 4 // 3]]
+    assert result['windows_by_year'][1].tolist() == [[7 // 2, 2 // 2 + 7 // 2],
+                                                     [7 // 2, 5 // 2 + 4 // 2]]
+    assert result['windows_per_year'][0].tolist() == [2.0, 2.0]
+    assert result['longest_by_year'][0].tolist() == [[7, 7], [7, 5]]
+    assert result['longest_window'].tolist() == [[7, 7], [7, 7]]
+
+
+def test_length_histogram():
+    result = calculate_weather_windows([make_series('STATION_A'), make_series('STATION_B')], CRITERIA,
+                                       max_length=5)
+    histogram = result['length_histogram']
+    assert histogram.shape == (2, 2, 12, 5)
+
+    # three_day, station A: Dec run of 7 and Jan run of 7 (both in the 5+ bin);
+    # the 2-day Jan 1-2 run is shorter than a window and is not counted
+    a = histogram[0, 0]
+    assert a[11, 4] == 1 and a[0, 4] == 1 and a.sum() == 2
+
+    # three_day, station B: Dec 7 (5+ bin), Jan 5 (5+ bin), Jan 4
+    b = histogram[0, 1]
+    assert b[11, 4] == 1 and b[0, 4] == 1 and b[0, 3] == 1 and b.sum() == 3
+
+    # 2-day windows also count station A's Jan 1-2 run
+    assert histogram[1, 0, 0, 1] == 1 and histogram[1, 0].sum() == 3
+
+
+if __name__ == '__main__':
+    test_run_lengths()
+    test_matches_hand_computed_windows()
+    test_length_histogram()
+    print("[OK] Weather-window engine tests passed")
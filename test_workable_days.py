@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test Vectorized Workable-Days Engine
+Compares the mask engine against a day-by-day port of the app.js rules
+"""
+
+import numpy as np
+
+from daily_series import records_to_series, to_metric
+from project_templates import KPI_CRITERIA, window_criteria
+from workable_days import calculate_workable_days
+
+
+def make_series(station_id, seed, start='2019-01-01', end='2021-12-31'):
+    """Synthetic standard-unit station history with some missing values"""
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    records = []
+    for i, d in enumerate(dates):
+        seasonal = 55 + 25 * np.sin(2 * np.pi * (i - 100) / 365)
+        high = seasonal + rng.normal(0, 8)
+        records.append({
+            'DATE': str(d),
+            'TMAX': '' if rng.random() < 0.02 else f"{high:.0f}",
+            'TMIN': f"{high - 15 - rng.random() * 10:.0f}",
+            'PRCP': f"{max(0.0, rng.normal(0, 0.3)):.2f}",
+            'SNOW': f"{max(0.0, rng.normal(-1, 1.5)):.1f}" if high < 40 else '0.0'
+        })
+    return records_to_series(records, start, end, ['TMAX', 'TMIN', 'PRCP', 'SNOW'], station_id)
+
+
+def reference_is_workable(tmax, tmin, prcp, snow, c):
+    """Scalar port of calculateWeatherWindows' day test plus the maxSnow check"""
+    if 'min_temp' in c and (np.isnan(tmin) or not tmin > c['min_temp']):
+        return False
+    if 'max_temp' in c and (np.isnan(tmax) or not tmax < c['max_temp']):
+        return False
+    if 'min_high' in c and (np.isnan(tmax) or not tmax >= c['min_high']):
+        return False
+    if 'max_high' in c and (np.isnan(tmax) or not tmax <= c['max_high']):
+        return False
+    if 'max_rain' in c:
+        if np.isnan(prcp):
+            return False
+        if not (prcp <= 1 if c['max_rain'] == 0 else prcp < c['max_rain']):
+            return False
+    if 'max_snow' in c and (0 if np.isnan(snow) else snow) > c['max_snow']:
+        return False
+    return True
+
+
+def test_matches_day_by_day_reference():
+    series = [make_series('STATION_A', 1), make_series('STATION_B', 2)]
+    criteria = dict(window_criteria(), **KPI_CRITERIA)
+    result = calculate_workable_days(series, criteria)
+
+    assert result['workable'].shape == (len(criteria), 2, 3, 12)
+    assert list(result['years']) == [2019, 2020, 2021]
+
+    for s, raw in enumerate(series):
+        metric = to_metric(raw)['values']
+        years = raw['dates'].astype('datetime64[Y]').astype(int) + 1970
+        for t, template_id in enumerate(result['templates']):
+            for y, year in enumerate(result['years']):
+                expected = sum(
+                    reference_is_workable(metric['TMAX'][i], metric['TMIN'][i], metric['PRCP'][i],
+                                          metric['SNOW'][i], criteria[template_id])
+                    for i in np.flatnonzero(years == year)
+                )
+                assert result['by_year'][t, s, y] == expected, (template_id, year)
+
+
+def test_calendar_and_data_days():
+    series = make_series('STATION_A', 3, start='2020-02-10', end='2020-03-31')
+    result = calculate_workable_days(series)
+
+    assert result['calendar_days'][0, 1] == 20  # Feb 10-29 (leap year)
+    assert result['calendar_days'][0, 2] == 31
+    assert result['calendar_days'][0, 0] == 0
+    assert result['data_days'][0, 0, 1] <= 20
+
+
+def test_snow_limit_is_optional():
+    """Without max_snow the criteria count days exactly as calculateWeatherWindows does"""
+    series = make_series('STATION_A', 4, start='2021-01-01', end='2021-02-28')
+    with_snow = window_criteria()['general-construction']
+    without_snow = {k: v for k, v in with_snow.items() if k != 'max_snow'}
+    result = calculate_workable_days(series, {'snow': with_snow, 'js': without_snow})
+
+    metric = to_metric(series)['values']
+    snowy = int(np.sum(np.nan_to_num(metric['SNOW']) > with_snow['max_snow']))
+    assert snowy > 0
+    assert result['by_year'][1, 0, 0] >= result['by_year'][0, 0, 0]
+    assert result['by_year'][1, 0, 0] == sum(
+        reference_is_workable(metric['TMAX'][i], metric['TMIN'][i], metric['PRCP'][i], np.nan, without_snow)
+        for i in range(len(series['dates']))
+    )
+
+
+if __name__ == '__main__':
+    test_matches_day_by_day_reference()
+    test_calendar_and_data_days()
+    test_snow_limit_is_optional()
+    print("[OK] Workable-days engine tests passed")
@@ -1,9 +1,16 @@
 """
 Snowfall Accuracy Verification
 Tests NOAA data against known major snowstorms
+
+No fixtures have been recorded yet, so under pytest
+test_recent_season_comparison is skipped (see ncei_fixtures) until they
+are recorded against the live service:
+    NCEI_FIXTURES=record python verify_snowfall_accuracy.py
+which needs network access and noaa_snow_stations.json. Commit the
+resulting fixtures/*.json.gz to run it in CI.
 """
 
-from noaa_data_fetcher import NOAADataFetcher
+from ncei_fixtures import FixtureSession
 from station_matcher import StationMatcher
 
 # Known major snowstorms for verification (using recent events with reliable data)
@@ -64,8 +71,10 @@ def verify_snowstorm_accuracy():
     print("Testing against known major snowstorms")
     print("=" * 80)
 
-    matcher = StationMatcher()
-    fetcher = NOAADataFetcher()
+    # Recorded responses replay offline (see ncei_fixtures)
+    session = FixtureSession('snowfall_accuracy')
+    matcher = session.lookups('matcher', StationMatcher)
+    fetcher = session.fetcher()
 
     results = []
 
@@ -187,6 +196,7 @@ def verify_snowstorm_accuracy():
 
     print("=" * 80)
 
+    session.finish(results)
     return results
 
 
@@ -205,9 +215,11 @@ def test_recent_season_comparison():
         {'name': 'Chicago, IL', 'lat': 41.8781, 'lng': -87.6298},
     ]
 
-    matcher = StationMatcher()
-    fetcher = NOAADataFetcher()
+    session = FixtureSession('season_comparison')
+    matcher = session.lookups('matcher', StationMatcher)
+    fetcher = session.fetcher()
 
+    seasons = []
     for city in cities:
         print(f"\n{city['name']}:")
         print("-" * 80)
@@ -226,8 +238,12 @@ def test_recent_season_comparison():
             print(f"Top Storm: {season_data['biggest_storms'][0]['date']} - "
                   f"{season_data['biggest_storms'][0]['amount']}\"")
 
+        seasons.append({'city': city['name'], 'station': station['id'], 'season': season_data})
+
     print("\n" + "=" * 80)
 
+    session.finish(seasons)
+
 
 if __name__ == '__main__':
     # Verify known snowstorms
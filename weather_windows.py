@@ -0,0 +1,126 @@
+"""
+Weather-Window Engine
+Run-length encodes workable-day masks to find consecutive good-weather
+windows for every template and station at once
+"""
+
+from typing import Dict, List, Union
+
+import numpy as np
+
+from daily_series import calendar_fields
+from project_templates import window_criteria
+from workable_days import STATION_CHUNK, prepare_series, evaluate_masks
+
+# calculateWeatherWindows falls back to 2-day windows when a template has none
+DEFAULT_CONSECUTIVE_DAYS = 2
+
+
+def run_lengths(mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Run-length encode the True runs of a 2-D boolean mask
+
+    Args:
+        mask: Boolean array shaped (rows, days)
+
+    Returns:
+        Dictionary of equal-length 'row', 'start' and 'length' arrays, one
+        entry per run, ordered by row then start
+    """
+    rows, days = mask.shape
+    padded = np.zeros((rows, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return {'row': start_rows, 'start': starts, 'length': ends - starts}
+
+
+def _year_breaks(years: np.ndarray) -> np.ndarray:
+    """Day indices where a new calendar year begins (runs are split there)"""
+    return np.flatnonzero(years[1:] != years[:-1]) + 1
+
+
+def calculate_weather_windows(series: Union[Dict, List[Dict]], criteria: Dict[str, Dict] = None,
+                              max_length: int = 31) -> Dict:
+    """
+    Find consecutive workable-day windows for many templates and stations
+
+    A run of L workable days holds L // k non-overlapping k-day windows,
+    which is how calculateWeatherWindows in app.js counts them. Runs are
+    split at calendar-year boundaries, as the frontend scans each year
+    separately.
+
+    Args:
+        series: Daily series, list of series, or stacked series
+        criteria: Threshold dicts keyed by template ID (defaults to every
+                  template's weather criteria, including consecutive_days)
+        max_length: Longest run length given its own histogram bin; longer
+                    runs share the last bin
+
+    Returns:
+        Dictionary with:
+          'windows_by_year'   int32 (templates, stations, years)
+          'windows_per_year'  float (templates, stations)
+          'longest_by_year'   int32 (templates, stations, years)
+          'longest_window'    int32 (templates, stations)
+          'length_histogram'  int32 (templates, stations, 12, max_length)
+                              runs of at least k days, by start month;
+                              bin i holds length i + 1
+    """
+    if criteria is None:
+        criteria = window_criteria()
+
+    stacked = prepare_series(series)
+    template_ids = list(criteria)
+    criteria_list = [criteria[t] for t in template_ids]
+    window_days = np.array([c.get('consecutive_days') or DEFAULT_CONSECUTIVE_DAYS for c in criteria_list])
+
+    cal = calendar_fields(stacked['dates'])
+    years = np.arange(cal['year'].min(), cal['year'].max() + 1)
+    breaks = _year_breaks(cal['year'])
+    # Position of each expanded column on the original day axis
+    expanded_day = np.insert(np.arange(len(stacked['dates'])), breaks, -1)
+
+    n_templates = len(template_ids)
+    n_stations = len(stacked['station_ids'])
+    n_years = len(years)
+
+    windows_by_year = np.zeros((n_templates, n_stations, n_years), dtype=np.int32)
+    longest_by_year = np.zeros((n_templates, n_stations, n_years), dtype=np.int32)
+    histogram = np.zeros((n_templates, n_stations, 12, max_length), dtype=np.int32)
+
+    for lo in range(0, n_stations, STATION_CHUNK):
+        hi = min(lo + STATION_CHUNK, n_stations)
+        block = {element: column[lo:hi] for element, column in stacked['values'].items()}
+        masks = evaluate_masks(block, criteria_list)
+        flat = masks.reshape(n_templates * (hi - lo), -1)
+
+        runs = run_lengths(np.insert(flat, breaks, False, axis=1))
+        start_day = expanded_day[runs['start']]
+        template = runs['row'] // (hi - lo)
+        station = lo + runs['row'] % (hi - lo)
+        year = cal['year'][start_day] - years[0]
+        month = cal['month'][start_day] - 1
+        length = runs['length']
+        k = window_days[template]
+
+        np.add.at(windows_by_year, (template, station, year), length // k)
+        np.maximum.at(longest_by_year, (template, station, year), length)
+
+        is_window = length >= k
+        np.add.at(histogram, (template[is_window], station[is_window], month[is_window],
+                              np.minimum(length[is_window], max_length) - 1), 1)
+
+    return {
+        'templates': template_ids,
+        'station_ids': stacked['station_ids'],
+        'years': years,
+        'consecutive_days': window_days,
+        'windows_by_year': windows_by_year,
+        'windows_per_year': windows_by_year.mean(axis=-1),
+        'longest_by_year': longest_by_year,
+        'longest_window': longest_by_year.max(axis=-1),
+        'length_histogram': histogram
+    }
@@ -0,0 +1,186 @@
+"""
+Vectorized Workable-Days Engine
+Evaluates many template criteria over many stations and years as boolean
+masks, mirroring the per-day rules in app.js plus an optional snow limit
+"""
+
+from typing import Dict, List, Union
+
+import numpy as np
+
+from daily_series import calendar_fields, stack_series, to_metric
+from project_templates import window_criteria
+
+# Daily maximum wind proxy: fastest 2-minute wind (km/h after to_metric)
+WIND_ELEMENT = 'WSF2'
+
+# Stations evaluated per block; bounds the (templates, stations, days) masks
+STATION_CHUNK = 256
+
+# Element each rule reads where a missing value fails the rule (snow and
+# wind limits pass on missing data, so they never make a day unusable)
+REQUIRED_ELEMENTS = {
+    'min_temp': 'TMIN',
+    'max_temp': 'TMAX',
+    'min_high': 'TMAX',
+    'max_high': 'TMAX',
+    'max_rain': 'PRCP'
+}
+
+
+def prepare_series(series: Union[Dict, List[Dict]]) -> Dict:
+    """Accept one series, a list of series or a stacked series; return metric stacked"""
+    if isinstance(series, list):
+        series = stack_series(series)
+    elif 'station_ids' not in series:
+        series = stack_series([series])
+    return to_metric(series)
+
+
+def required_elements(criteria: Dict) -> List[str]:
+    """Elements a day needs for criteria to judge it (see REQUIRED_ELEMENTS)"""
+    return sorted({element for key, element in REQUIRED_ELEMENTS.items() if key in criteria})
+
+
+def _criteria_column(criteria: List[Dict], key: str) -> np.ndarray:
+    """Per-template threshold as a (templates, 1, 1) array, NaN where unused"""
+    return np.array([c.get(key, np.nan) for c in criteria], dtype=np.float64)[:, None, None]
+
+
+def _limit_mask(data: np.ndarray, limits: np.ndarray, compare) -> np.ndarray:
+    """Apply compare(data, limit) per template; unused limits always pass"""
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isnan(limits), True, compare(data[None], limits))
+
+
+def evaluate_masks(values: Dict[str, np.ndarray], criteria: List[Dict]) -> np.ndarray:
+    """
+    Evaluate workable-day masks for several criteria at once
+
+    Temperature, rain and wind rules follow calculateWeatherWindows in app.js
+    (min_high / max_high are the calculateTemplateKPIs day rules):
+      min_temp   TMIN must be above the limit
+      max_temp   TMAX must be below the limit
+      min_high   TMAX must be at or above the limit
+      max_high   TMAX must be at or below the limit
+      max_rain   PRCP below the limit; 0 means trace only (<= 1mm)
+      max_wind   wind below the limit (missing wind passes)
+    Missing temperatures or precipitation fail any rule that needs them.
+
+    max_snow is an extra rule: calculateWeatherWindows never checks snow.
+    When a criteria dict has it, SNOW must be at or below the limit (missing
+    snow counts as none), so snowy days count for fewer templates than in
+    app.js. Drop max_snow from the criteria to reproduce the JS counts.
+
+    Args:
+        values: Metric element arrays shaped (stations, days)
+        criteria: One threshold dict per template
+
+    Returns:
+        Boolean array shaped (templates, stations, days)
+    """
+    shape = next(iter(values.values())).shape
+    missing = np.full(shape, np.nan)
+    tmin = values.get('TMIN', missing)
+    tmax = values.get('TMAX', missing)
+    prcp = values.get('PRCP', missing)
+    snow = values.get('SNOW', missing)
+    wind = values.get(WIND_ELEMENT, missing)
+
+    mask = _limit_mask(tmin, _criteria_column(criteria, 'min_temp'), np.greater)
+    mask &= _limit_mask(tmax, _criteria_column(criteria, 'max_temp'), np.less)
+    mask &= _limit_mask(tmax, _criteria_column(criteria, 'min_high'), np.greater_equal)
+    mask &= _limit_mask(tmax, _criteria_column(criteria, 'max_high'), np.less_equal)
+
+    max_rain = _criteria_column(criteria, 'max_rain')
+    with np.errstate(invalid='ignore'):
+        rain_ok = np.where(max_rain == 0, prcp[None] <= 1, prcp[None] < max_rain)
+    mask &= np.where(np.isnan(max_rain), True, rain_ok)
+
+    mask &= _limit_mask(np.nan_to_num(snow, nan=0.0), _criteria_column(criteria, 'max_snow'), np.less_equal)
+    mask &= _limit_mask(np.where(np.isnan(wind), -np.inf, wind), _criteria_column(criteria, 'max_wind'), np.less)
+
+    return mask
+
+
+def month_buckets(dates: np.ndarray) -> Dict:
+    """
+    Split a sorted date axis into contiguous (year, month) buckets
+
+    Returns:
+        Dictionary with 'years', bucket 'starts' into the day axis and the
+        flat year*12+month 'slots' each bucket fills
+    """
+    cal = calendar_fields(dates)
+    years = np.arange(cal['year'].min(), cal['year'].max() + 1)
+    flat = (cal['year'] - years[0]) * 12 + (cal['month'] - 1)
+    starts = np.flatnonzero(np.concatenate(([True], flat[1:] != flat[:-1])))
+    return {'years': years, 'starts': starts, 'slots': flat[starts]}
+
+
+def _bucket_sums(mask: np.ndarray, buckets: Dict) -> np.ndarray:
+    """Sum a (..., days) mask into a (..., years, 12) grid"""
+    sums = np.add.reduceat(mask.view(np.uint8), buckets['starts'], axis=-1, dtype=np.int32)
+    grid = np.zeros(mask.shape[:-1] + (len(buckets['years']) * 12,), dtype=np.int32)
+    grid[..., buckets['slots']] = sums
+    return grid.reshape(mask.shape[:-1] + (len(buckets['years']), 12))
+
+
+def calculate_workable_days(series: Union[Dict, List[Dict]], criteria: Dict[str, Dict] = None) -> Dict:
+    """
+    Count workable days by template, station, year and month
+
+    Args:
+        series: Daily series from NOAADataFetcher.fetch_daily_series, a list
+                of them, or a stack_series result (any units)
+        criteria: Threshold dicts keyed by template ID (defaults to every
+                  template's weather criteria)
+
+    Returns:
+        Dictionary with:
+          'workable'       int32 (templates, stations, years, 12)
+          'data_days'      int32 (stations, years, 12) days with TMAX, TMIN and PRCP
+          'calendar_days'  int32 (years, 12) days of each month inside the range
+          'by_year'        int32 (templates, stations, years)
+          'mean_per_year'  float (templates, stations) over years with data
+    """
+    if criteria is None:
+        criteria = window_criteria()
+
+    stacked = prepare_series(series)
+    template_ids = list(criteria)
+    criteria_list = [criteria[t] for t in template_ids]
+    values = stacked['values']
+    n_stations = len(stacked['station_ids'])
+    buckets = month_buckets(stacked['dates'])
+    n_years = len(buckets['years'])
+
+    workable = np.zeros((len(template_ids), n_stations, n_years, 12), dtype=np.int32)
+    data_days = np.zeros((n_stations, n_years, 12), dtype=np.int32)
+
+    for lo in range(0, n_stations, STATION_CHUNK):
+        hi = min(lo + STATION_CHUNK, n_stations)
+        block = {element: column[lo:hi] for element, column in values.items()}
+        workable[:, lo:hi] = _bucket_sums(evaluate_masks(block, criteria_list), buckets)
+
+        has_data = np.ones((hi - lo, len(stacked['dates'])), dtype=bool)
+        for element in ('TMAX', 'TMIN', 'PRCP'):
+            has_data &= ~np.isnan(block[element]) if element in block else False
+        data_days[lo:hi] = _bucket_sums(has_data, buckets)
+
+    calendar_days = _bucket_sums(np.ones((1, len(stacked['dates'])), dtype=bool), buckets)[0]
+    by_year = workable.sum(axis=-1)
+    years_with_data = (data_days.sum(axis=-1) > 0).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_per_year = np.where(years_with_data > 0, by_year.sum(axis=-1) / np.maximum(years_with_data, 1), np.nan)
+
+    return {
+        'templates': template_ids,
+        'station_ids': stacked['station_ids'],
+        'years': buckets['years'],
+        'workable': workable,
+        'data_days': data_days,
+        'calendar_days': calendar_days,
+        'by_year': by_year,
+        'mean_per_year': mean_per_year
+    }